@@ -3,12 +3,44 @@
 from __future__ import annotations
 
 import datetime as dt
+import functools
+import hashlib
+import json
 import math
+import threading
+from collections import OrderedDict
 from collections.abc import Mapping
 from dataclasses import dataclass
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+import numpy as np
+
+from projdash.engine.profiling import timed
+
 UTC = dt.UTC
+DEFAULT_CALENDAR_EXPANSION_ENTRIES = 512
+
+_EPOCH = dt.datetime(1970, 1, 1, tzinfo=UTC)
+_EPOCH_ORDINAL = _EPOCH.date().toordinal()
+_MICROSECOND = dt.timedelta(microseconds=1)
+_MICROSECONDS_PER_HOUR = 3_600_000_000
+_MICROSECONDS_PER_DAY = 24 * _MICROSECONDS_PER_HOUR
+
+_CALENDAR_EXPANSION_FIELDS = (
+    "calendar_id",
+    "timezone",
+    "weekly_windows",
+    "exceptions",
+    "active",
+)
+_RESOURCE_EXPANSION_FIELDS = (
+    "resource_id",
+    "role_ids",
+    "available_from_at",
+    "available_until_at",
+    "holidays",
+    "active",
+)
 
 
 @dataclass(frozen=True, slots=True)
@@ -61,6 +93,21 @@ class _CapacityInterval:
     local_week: str
 
 
+@dataclass(frozen=True, slots=True)
+class _IntervalArrays:
+    """Capacity intervals as parallel arrays, in expansion order.
+
+    Instants are UTC microseconds since the epoch and ``days`` index local
+    dates counted from ``first_ordinal``.
+    """
+
+    starts_us: np.ndarray
+    ends_us: np.ndarray
+    capacity_hours: np.ndarray
+    days: np.ndarray
+    first_ordinal: int
+
+
 def require_aware(value: dt.datetime) -> dt.datetime:
     """Validate that a datetime carries timezone information."""
     if value.tzinfo is None or value.utcoffset() is None:
@@ -168,6 +215,7 @@ def count_business_days(start: dt.datetime, end: dt.datetime) -> int:
     return count
 
 
+@timed("calendar_expansion")
 def expand_resource_calendar(
     *,
     calendar: Mapping[str, object],
@@ -239,47 +287,180 @@ def expand_resource_calendar(
     _validate_weekly_windows_do_not_overlap(weekly_windows)
     _validate_exceptions_do_not_conflict(exceptions)
 
-    intervals: list[_CapacityInterval] = []
-    for local_date in _iter_local_dates(clipped_starts_at, clipped_ends_at, timezone):
-        for window in weekly_windows:
-            if local_date.weekday() != window.weekday:
-                continue
-            interval = _expand_weekly_window(
-                window=window,
-                local_date=local_date,
-                timezone=timezone,
-                clipped_starts_at=clipped_starts_at,
-                clipped_ends_at=clipped_ends_at,
-                exceptions=exceptions,
-            )
-            intervals.extend(interval)
-    intervals = list(_apply_resource_holidays(tuple(intervals), holidays))
+    intervals = _expand_weekly_intervals(
+        weekly_windows=weekly_windows,
+        exceptions=exceptions,
+        timezone=timezone,
+        clipped_starts_at=clipped_starts_at,
+        clipped_ends_at=clipped_ends_at,
+    )
+    intervals = _mask_resource_holidays(intervals, holidays)
+    return _split_intervals_into_buckets(
+        intervals,
+        resource_id=str(resource["resource_id"]),
+        calendar_id=str(calendar["calendar_id"]),
+        role_ids=tuple(str(role_id) for role_id in resource.get("role_ids", ())),
+    )
 
-    buckets: list[CapacityBucket] = []
-    resource_id = str(resource["resource_id"])
-    calendar_id = str(calendar["calendar_id"])
-    role_ids = tuple(str(role_id) for role_id in resource.get("role_ids", ()))
-    for interval in intervals:
-        buckets.extend(
-            _split_interval_into_buckets(
-                interval=interval,
-                resource_id=resource_id,
-                calendar_id=calendar_id,
-                role_ids=role_ids,
+
+def stable_expansion_prefix(
+    horizon_starts_at: dt.datetime,
+    horizon_ends_at: dt.datetime,
+) -> tuple[str, dt.datetime]:
+    """Return where an expansion of the horizon stops matching a longer one.
+
+    Buckets whose ``local_date`` sorts before the returned date text are the
+    same in every expansion from ``horizon_starts_at`` that ends at or after
+    ``horizon_ends_at``. Expanding from the returned start yields every later
+    local date unclipped. Weekly windows never span local dates and UTC
+    offsets stay within a day, so two days of margin on each side suffice.
+    """
+    cutoff = (horizon_ends_at.astimezone(UTC) - dt.timedelta(days=2)).date()
+    tail_starts_at = dt.datetime.combine(cutoff - dt.timedelta(days=2), dt.time(), tzinfo=UTC)
+    if tail_starts_at <= horizon_starts_at:
+        return dt.date.min.isoformat(), horizon_starts_at
+    return cutoff.isoformat(), tail_starts_at
+
+
+class CalendarExpansionCache:
+    """LRU of ``expand_resource_calendar`` results shared across schedules.
+
+    Entries are keyed by a hash of the calendar and resource fields expansion
+    reads, the UTC horizon start and the granularity, and remember the
+    horizon end they were expanded to. A request for another end reuses the
+    entry up to ``stable_expansion_prefix`` and expands only the remaining
+    days; a longer result replaces the entry. ``hits``, ``extensions`` and
+    ``misses`` count lookups since the cache was created.
+    """
+
+    def __init__(self, max_entries: int | None = DEFAULT_CALENDAR_EXPANSION_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[
+            tuple[object, ...],
+            tuple[dt.datetime, tuple[CapacityBucket, ...]],
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.extensions = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "extensions": self.extensions,
+            "misses": self.misses,
+        }
+
+    def expand(
+        self,
+        *,
+        calendar: Mapping[str, object],
+        resource: Mapping[str, object],
+        horizon_starts_at: dt.datetime,
+        horizon_ends_at: dt.datetime,
+        planning_granularity: str = "hour",
+    ) -> tuple[CapacityBucket, ...]:
+        """Return ``expand_resource_calendar`` for these arguments, reusing entries."""
+        starts_at = require_aware(horizon_starts_at).astimezone(UTC)
+        ends_at = require_aware(horizon_ends_at).astimezone(UTC)
+        if ends_at <= starts_at:
+            return expand_resource_calendar(
+                calendar=calendar,
+                resource=resource,
+                horizon_starts_at=starts_at,
+                horizon_ends_at=ends_at,
+                planning_granularity=planning_granularity,
             )
+        key = (
+            _content_hash(calendar, _CALENDAR_EXPANSION_FIELDS),
+            _content_hash(resource, _RESOURCE_EXPANSION_FIELDS),
+            starts_at,
+            planning_granularity,
         )
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry[0] == ends_at:
+                    self.hits += 1
+                    return entry[1]
+                self.extensions += 1
+            else:
+                self.misses += 1
+
+        if entry is None:
+            buckets = expand_resource_calendar(
+                calendar=calendar,
+                resource=resource,
+                horizon_starts_at=starts_at,
+                horizon_ends_at=ends_at,
+                planning_granularity=planning_granularity,
+            )
+        else:
+            cached_ends_at, cached = entry
+            cutoff, tail_starts_at = stable_expansion_prefix(
+                starts_at,
+                min(cached_ends_at, ends_at),
+            )
+            tail = expand_resource_calendar(
+                calendar=calendar,
+                resource=resource,
+                horizon_starts_at=tail_starts_at,
+                horizon_ends_at=ends_at,
+                planning_granularity=planning_granularity,
+            )
+            buckets = tuple(
+                sorted(
+                    [
+                        *(bucket for bucket in cached if bucket.local_date < cutoff),
+                        *(bucket for bucket in tail if bucket.local_date >= cutoff),
+                    ],
+                    key=_capacity_bucket_sort_key,
+                )
+            )
+            if ends_at < cached_ends_at:
+                return buckets
 
-    return tuple(
-        sorted(
-            buckets,
-            key=lambda bucket: (
-                bucket.starts_at,
-                bucket.resource_id,
-                bucket.calendar_id,
-                bucket.ends_at,
-            ),
-        )
+        with self._lock:
+            self._entries[key] = (ends_at, buckets)
+            self._entries.move_to_end(key)
+            while self.max_entries is not None and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return buckets
+
+
+CALENDAR_EXPANSION_CACHE = CalendarExpansionCache()
+
+
+def _content_hash(value: Mapping[str, object], fields: tuple[str, ...]) -> str:
+    # Absent keys are left out rather than mapped to None: expansion defaults
+    # them, which is not the same as an explicit None.
+    payload = json.dumps(
+        {field: value[field] for field in fields if field in value},
+        sort_keys=True,
+        default=_content_hash_default,
     )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _content_hash_default(value: object) -> object:
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, dt.datetime | dt.date | dt.time):
+        return value.isoformat()
+    return str(value)
+
+
+def _capacity_bucket_sort_key(bucket: CapacityBucket) -> tuple[object, ...]:
+    return (bucket.starts_at, bucket.resource_id, bucket.calendar_id, bucket.ends_at)
 
 
 def _coerce_aware_datetime(value: object, field_name: str) -> dt.datetime:
@@ -445,15 +626,199 @@ def _validate_exceptions_do_not_conflict(
                 )
 
 
-def _iter_local_dates(
+def _local_date_range(
     starts_at: dt.datetime,
     ends_at: dt.datetime,
     timezone: ZoneInfo,
-) -> tuple[dt.date, ...]:
+) -> tuple[int, int]:
+    """Return the first ordinal and count of local dates a window can fall on."""
     first_date = starts_at.astimezone(timezone).date() - dt.timedelta(days=1)
     last_date = ends_at.astimezone(timezone).date() + dt.timedelta(days=1)
-    days = (last_date - first_date).days
-    return tuple(first_date + dt.timedelta(days=offset) for offset in range(days + 1))
+    return first_date.toordinal(), (last_date - first_date).days + 1
+
+
+@functools.lru_cache(maxsize=256)
+def _local_day_offsets(
+    timezone: ZoneInfo,
+    first_ordinal: int,
+    day_count: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return each local date's UTC offset in microseconds and whether it holds all day.
+
+    A date is regular when the offset is the same, for either fold, at its
+    own local midnight and the next one. No zone changes offset twice within
+    two days, so every local time on a regular date is unambiguous and maps
+    to UTC by subtracting the offset.
+    """
+    offsets = np.empty((day_count + 1, 2), dtype=np.int64)
+    for day in range(day_count + 1):
+        midnight = dt.datetime.combine(dt.date.fromordinal(first_ordinal + day), dt.time())
+        for fold in (0, 1):
+            offset = midnight.replace(tzinfo=timezone, fold=fold).utcoffset()
+            offsets[day, fold] = offset // _MICROSECOND
+    regular = (
+        (offsets[:-1, 0] == offsets[:-1, 1])
+        & (offsets[:-1, 1] == offsets[1:, 0])
+        & (offsets[1:, 0] == offsets[1:, 1])
+    )
+    day_offsets = offsets[:-1, 0].copy()
+    day_offsets.flags.writeable = False
+    regular.flags.writeable = False
+    return day_offsets, regular
+
+
+def _expand_weekly_intervals(
+    *,
+    weekly_windows: tuple[_WeeklyWindow, ...],
+    exceptions: tuple[_CalendarException, ...],
+    timezone: ZoneInfo,
+    clipped_starts_at: dt.datetime,
+    clipped_ends_at: dt.datetime,
+) -> _IntervalArrays:
+    """Expand weekly windows on every local date into clipped intervals.
+
+    Windows on regular dates are expanded together per window with array
+    arithmetic. Windows on dates with an offset change, and windows that
+    overlap an exception, go through ``_expand_weekly_window`` and
+    ``_apply_exceptions``. Intervals come back ordered by date, window and
+    segment, as the per-date expansion produced them.
+    """
+    first_ordinal, day_count = _local_date_range(clipped_starts_at, clipped_ends_at, timezone)
+    day_offsets_us, regular = _local_day_offsets(timezone, first_ordinal, day_count)
+    ordinals = np.arange(first_ordinal, first_ordinal + day_count, dtype=np.int64)
+    weekdays = (ordinals + 6) % 7
+    utc_midnights_us = (ordinals - _EPOCH_ORDINAL) * _MICROSECONDS_PER_DAY - day_offsets_us
+    clipped_starts_us = _epoch_microseconds(clipped_starts_at)
+    clipped_ends_us = _epoch_microseconds(clipped_ends_at)
+    exception_bounds = [
+        (_epoch_microseconds(exception.starts_at), _epoch_microseconds(exception.ends_at))
+        for exception in exceptions
+    ]
+
+    columns: list[tuple[np.ndarray, ...]] = []
+    rows: list[tuple[int, int, float, int, int, int]] = []
+    for window_index, window in enumerate(weekly_windows):
+        if window.capacity_hours <= 0:
+            continue
+        on_weekday = weekdays == window.weekday
+        for day in np.flatnonzero(on_weekday & ~regular).tolist():
+            intervals = _expand_weekly_window(
+                window=window,
+                local_date=dt.date.fromordinal(first_ordinal + day),
+                timezone=timezone,
+                clipped_starts_at=clipped_starts_at,
+                clipped_ends_at=clipped_ends_at,
+                exceptions=exceptions,
+            )
+            rows.extend(_interval_rows(intervals, day=day, position=window_index))
+
+        days = np.flatnonzero(on_weekday & regular)
+        starts_us = utc_midnights_us[days] + _time_microseconds(window.starts_at)
+        ends_us = utc_midnights_us[days] + _time_microseconds(window.ends_at)
+        interval_starts_us = np.maximum(starts_us, clipped_starts_us)
+        interval_ends_us = np.minimum(ends_us, clipped_ends_us)
+        inside = interval_ends_us > interval_starts_us
+        days = days[inside]
+        starts_us = starts_us[inside]
+        ends_us = ends_us[inside]
+        interval_starts_us = interval_starts_us[inside]
+        interval_ends_us = interval_ends_us[inside]
+
+        overlaps_exception = np.zeros(len(days), dtype=bool)
+        for exception_starts_us, exception_ends_us in exception_bounds:
+            overlaps_exception |= (interval_starts_us < exception_ends_us) & (
+                exception_starts_us < interval_ends_us
+            )
+        for index in np.flatnonzero(overlaps_exception).tolist():
+            day = int(days[index])
+            local_date = dt.date.fromordinal(first_ordinal + day)
+            intervals = _apply_exceptions(
+                starts_at=_utc_from_microseconds(int(starts_us[index])),
+                ends_at=_utc_from_microseconds(int(ends_us[index])),
+                capacity_hours=window.capacity_hours,
+                clipped_starts_at=_utc_from_microseconds(int(interval_starts_us[index])),
+                clipped_ends_at=_utc_from_microseconds(int(interval_ends_us[index])),
+                exceptions=exceptions,
+                local_date=local_date.isoformat(),
+                local_week=_local_week(local_date),
+            )
+            rows.extend(_interval_rows(intervals, day=day, position=window_index))
+
+        plain = ~overlaps_exception
+        capacity_hours = (
+            window.capacity_hours
+            * _elapsed_hours(interval_ends_us[plain] - interval_starts_us[plain])
+            / _elapsed_hours(ends_us[plain] - starts_us[plain])
+        )
+        positive = capacity_hours > 0
+        kept_days = days[plain][positive]
+        columns.append(
+            (
+                interval_starts_us[plain][positive],
+                interval_ends_us[plain][positive],
+                capacity_hours[positive],
+                kept_days,
+                np.full(len(kept_days), window_index, dtype=np.int64),
+                np.zeros(len(kept_days), dtype=np.int64),
+            )
+        )
+
+    starts_us, ends_us, capacity_hours, days, window_indexes, segments = _stack_interval_columns(
+        columns,
+        rows,
+    )
+    order = np.lexsort((segments, window_indexes, days))
+    return _IntervalArrays(
+        starts_us=starts_us[order],
+        ends_us=ends_us[order],
+        capacity_hours=capacity_hours[order],
+        days=days[order],
+        first_ordinal=first_ordinal,
+    )
+
+
+def _interval_rows(
+    intervals: tuple[_CapacityInterval, ...],
+    *,
+    day: int,
+    position: int,
+) -> list[tuple[int, int, float, int, int, int]]:
+    return [
+        (
+            _epoch_microseconds(interval.starts_at),
+            _epoch_microseconds(interval.ends_at),
+            interval.capacity_hours,
+            day,
+            position,
+            segment,
+        )
+        for segment, interval in enumerate(intervals)
+    ]
+
+
+def _stack_interval_columns(
+    columns: list[tuple[np.ndarray, ...]],
+    rows: list[tuple[int, int, float, int, int, int]],
+) -> tuple[np.ndarray, ...]:
+    """Concatenate array columns with rows from the per-interval fallbacks."""
+    if rows:
+        starts_us, ends_us, capacity_hours, *keys = zip(*rows, strict=True)
+        columns = [
+            *columns,
+            (
+                np.array(starts_us, dtype=np.int64),
+                np.array(ends_us, dtype=np.int64),
+                np.array(capacity_hours, dtype=np.float64),
+                *(np.array(key, dtype=np.int64) for key in keys),
+            ),
+        ]
+    dtypes = (np.int64, np.int64, np.float64, np.int64, np.int64, np.int64)
+    if not columns:
+        return tuple(np.empty(0, dtype=dtype) for dtype in dtypes)
+    return tuple(
+        np.concatenate([column[index] for column in columns]).astype(dtype, copy=False)
+        for index, dtype in enumerate(dtypes)
+    )
 
 
 def _expand_weekly_window(
@@ -490,8 +855,6 @@ def _expand_weekly_window(
     if capacity_hours <= 0:
         return ()
 
-    iso_year, iso_week, _ = local_date.isocalendar()
-    local_week = f"{iso_year}-W{iso_week:02d}"
     return _apply_exceptions(
         starts_at=starts_at,
         ends_at=ends_at,
@@ -500,7 +863,7 @@ def _expand_weekly_window(
         clipped_ends_at=interval_ends_at,
         exceptions=exceptions,
         local_date=local_date.isoformat(),
-        local_week=local_week,
+        local_week=_local_week(local_date),
     )
 
 
@@ -643,48 +1006,171 @@ def _apply_resource_holidays(
     return tuple(output)
 
 
-def _split_interval_into_buckets(
+def _mask_resource_holidays(
+    intervals: _IntervalArrays,
+    holidays: tuple[_ResourceHoliday, ...],
+) -> _IntervalArrays:
+    """Apply ``_apply_resource_holidays`` to interval arrays.
+
+    Intervals clear of every holiday are rescaled in place; only those that
+    overlap one are split by ``_apply_resource_holidays``.
+    """
+    if not holidays:
+        return intervals
+
+    starts_us = intervals.starts_us
+    ends_us = intervals.ends_us
+    overlaps_holiday = np.zeros(len(starts_us), dtype=bool)
+    for holiday in holidays:
+        overlaps_holiday |= (starts_us < _epoch_microseconds(holiday.ends_at)) & (
+            _epoch_microseconds(holiday.starts_at) < ends_us
+        )
+
+    rows: list[tuple[int, int, float, int, int, int]] = []
+    for position in np.flatnonzero(overlaps_holiday).tolist():
+        day = int(intervals.days[position])
+        local_date = dt.date.fromordinal(intervals.first_ordinal + day)
+        interval = _CapacityInterval(
+            starts_at=_utc_from_microseconds(int(starts_us[position])),
+            ends_at=_utc_from_microseconds(int(ends_us[position])),
+            capacity_hours=float(intervals.capacity_hours[position]),
+            local_date=local_date.isoformat(),
+            local_week=_local_week(local_date),
+        )
+        segments = _apply_resource_holidays((interval,), holidays)
+        rows.extend(_interval_rows(segments, day=day, position=position))
+
+    plain = np.flatnonzero(~overlaps_holiday)
+    elapsed_hours = _elapsed_hours(ends_us[plain] - starts_us[plain])
+    capacity_hours = intervals.capacity_hours[plain] * elapsed_hours / elapsed_hours
+    positive = capacity_hours > 0
+    plain = plain[positive]
+    columns = [
+        (
+            starts_us[plain],
+            ends_us[plain],
+            capacity_hours[positive],
+            intervals.days[plain],
+            plain.astype(np.int64),
+            np.zeros(len(plain), dtype=np.int64),
+        )
+    ]
+    starts_us, ends_us, capacity_hours, days, positions, segments = _stack_interval_columns(
+        columns,
+        rows,
+    )
+    order = np.lexsort((segments, positions))
+    return _IntervalArrays(
+        starts_us=starts_us[order],
+        ends_us=ends_us[order],
+        capacity_hours=capacity_hours[order],
+        days=days[order],
+        first_ordinal=intervals.first_ordinal,
+    )
+
+
+def _split_intervals_into_buckets(
+    intervals: _IntervalArrays,
     *,
-    interval: _CapacityInterval,
     resource_id: str,
     calendar_id: str,
     role_ids: tuple[str, ...],
 ) -> tuple[CapacityBucket, ...]:
-    interval_elapsed_hours = _hours_between(interval.starts_at, interval.ends_at)
-    if interval_elapsed_hours <= 0:
-        return ()
+    """Split intervals at UTC hour boundaries into sorted capacity buckets."""
+    starts_us = intervals.starts_us
+    ends_us = intervals.ends_us
+    first_boundaries_us = (starts_us // _MICROSECONDS_PER_HOUR + 1) * _MICROSECONDS_PER_HOUR
+    bucket_counts = 1 + np.maximum(
+        0,
+        -((first_boundaries_us - ends_us) // _MICROSECONDS_PER_HOUR),
+    )
+    interval_index = np.repeat(np.arange(len(starts_us)), bucket_counts)
+    bucket_index = np.arange(len(interval_index)) - np.repeat(
+        np.cumsum(bucket_counts) - bucket_counts,
+        bucket_counts,
+    )
+    first_boundaries_us = first_boundaries_us[interval_index]
+    bucket_starts_us = np.where(
+        bucket_index == 0,
+        starts_us[interval_index],
+        first_boundaries_us + (bucket_index - 1) * _MICROSECONDS_PER_HOUR,
+    )
+    bucket_ends_us = np.minimum(
+        first_boundaries_us + bucket_index * _MICROSECONDS_PER_HOUR,
+        ends_us[interval_index],
+    )
+    available_hours = _elapsed_hours(bucket_ends_us - bucket_starts_us)
+    capacity_hours = (
+        intervals.capacity_hours[interval_index]
+        * available_hours
+        / _elapsed_hours(ends_us - starts_us)[interval_index]
+    )
 
-    buckets: list[CapacityBucket] = []
-    starts_at = interval.starts_at
-    while starts_at < interval.ends_at:
-        ends_at = min(_next_hour_boundary(starts_at), interval.ends_at)
-        available_hours = _hours_between(starts_at, ends_at)
-        capacity_hours = (
-            interval.capacity_hours * available_hours / interval_elapsed_hours
+    order = np.lexsort((bucket_ends_us, bucket_starts_us))
+    bucket_starts_us = bucket_starts_us[order]
+    bucket_ends_us = bucket_ends_us[order]
+    instants_us, instant_index = np.unique(
+        np.concatenate((bucket_starts_us, bucket_ends_us)),
+        return_inverse=True,
+    )
+    instants = [
+        value.replace(tzinfo=UTC) for value in instants_us.astype("datetime64[us]").tolist()
+    ]
+    days = intervals.days[interval_index][order]
+    labels = {
+        day: _local_labels(dt.date.fromordinal(intervals.first_ordinal + day))
+        for day in np.unique(days).tolist()
+    }
+    return tuple(
+        CapacityBucket(
+            resource_id=resource_id,
+            calendar_id=calendar_id,
+            starts_at=instants[start_index],
+            ends_at=instants[end_index],
+            capacity_hours=capacity,
+            available_hours=available,
+            allocated_hours=0,
+            remaining_hours=capacity,
+            role_ids=role_ids,
+            local_date=labels[day][0],
+            local_week=labels[day][1],
         )
-        buckets.append(
-            CapacityBucket(
-                resource_id=resource_id,
-                calendar_id=calendar_id,
-                starts_at=starts_at,
-                ends_at=ends_at,
-                capacity_hours=capacity_hours,
-                available_hours=available_hours,
-                allocated_hours=0,
-                remaining_hours=capacity_hours,
-                role_ids=role_ids,
-                local_date=interval.local_date,
-                local_week=interval.local_week,
-            )
+        for start_index, end_index, capacity, available, day in zip(
+            instant_index[: len(order)].tolist(),
+            instant_index[len(order) :].tolist(),
+            capacity_hours[order].tolist(),
+            available_hours[order].tolist(),
+            days.tolist(),
+            strict=True,
         )
-        starts_at = ends_at
-    return tuple(buckets)
+    )
+
+
+def _local_labels(local_date: dt.date) -> tuple[str, str]:
+    return local_date.isoformat(), _local_week(local_date)
+
+
+def _local_week(local_date: dt.date) -> str:
+    iso_year, iso_week, _ = local_date.isocalendar()
+    return f"{iso_year}-W{iso_week:02d}"
+
+
+def _epoch_microseconds(value: dt.datetime) -> int:
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _utc_from_microseconds(value: int) -> dt.datetime:
+    return _EPOCH + dt.timedelta(microseconds=value)
+
+
+def _time_microseconds(value: dt.time) -> int:
+    seconds = (value.hour * 60 + value.minute) * 60 + value.second
+    return seconds * 1_000_000 + value.microsecond
 
 
-def _next_hour_boundary(value: dt.datetime) -> dt.datetime:
-    if value.minute == 0 and value.second == 0 and value.microsecond == 0:
-        return value + dt.timedelta(hours=1)
-    return (value.replace(minute=0, second=0, microsecond=0) + dt.timedelta(hours=1))
+def _elapsed_hours(microseconds: np.ndarray) -> np.ndarray:
+    # Same rounding as ``timedelta.total_seconds() / 3600``.
+    return microseconds / 1_000_000 / 3600
 
 
 def _local_time_to_utc(
@@ -0,0 +1,84 @@
+"""Named timing spans collected per query."""
+
+from __future__ import annotations
+
+import functools
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+_ACTIVE_RECORDER: ContextVar[SpanRecorder | None] = ContextVar(
+    "projdash_span_recorder",
+    default=None,
+)
+
+
+class SpanRecorder:
+    """Wall-clock seconds and call counts per span name for one query.
+
+    Spans are inclusive, so a span nested in another is counted in both. A
+    span re-entered under the same name (recursion, or a helper timed at
+    several levels) is only timed at its outermost level.
+    """
+
+    __slots__ = ("_open", "spans")
+
+    def __init__(self) -> None:
+        self.spans: dict[str, list[float]] = {}
+        self._open: set[str] = set()
+
+    def as_dict(self) -> dict[str, dict[str, float]]:
+        """Return ``{name: {"count": calls, "seconds": total}}``."""
+        return {
+            name: {"count": int(count), "seconds": seconds}
+            for name, (count, seconds) in self.spans.items()
+        }
+
+
+@contextmanager
+def recording(recorder: SpanRecorder) -> Iterator[SpanRecorder]:
+    """Collect spans opened in this context into ``recorder``."""
+    token = _ACTIVE_RECORDER.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _ACTIVE_RECORDER.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block under ``name`` when a recorder is active."""
+    recorder = _ACTIVE_RECORDER.get()
+    if recorder is None or name in recorder._open:
+        yield
+        return
+    recorder._open.add(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        recorder._open.discard(name)
+        totals = recorder.spans.setdefault(name, [0, 0.0])
+        totals[0] += 1
+        totals[1] += elapsed
+
+
+def timed(name: str) -> Callable[[_F], _F]:
+    """Decorate a function so each call is timed as span ``name``."""
+
+    def decorate(function: _F) -> _F:
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _ACTIVE_RECORDER.get() is None:
+                return function(*args, **kwargs)
+            with span(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
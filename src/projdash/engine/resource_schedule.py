@@ -7,23 +7,29 @@ import hashlib
 import json
 import math
 from collections import defaultdict
-from collections.abc import Mapping
-from dataclasses import dataclass
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, replace
 from decimal import Decimal
 from typing import Any
 from zoneinfo import ZoneInfo
 
+import numpy as np
+
 from projdash.engine.calendar import (
+    CALENDAR_EXPANSION_CACHE,
     add_business_days,
     count_business_days,
-    expand_resource_calendar,
     next_business_day,
     require_aware,
+    stable_expansion_prefix,
     subtract_business_days,
 )
+from projdash.engine.profiling import span, timed
 
 UTC = dt.UTC
 EPSILON = 0.0001
+_EPOCH = dt.datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = dt.timedelta(microseconds=1)
 
 
 @dataclass(frozen=True, slots=True)
@@ -52,6 +58,7 @@ class _LedgerBucket:
     local_date: str
     local_week: str
     window_id: str | None
+    position: int = -1
 
 
 @dataclass(slots=True)
@@ -171,54 +178,62 @@ def compute_resource_schedule(input_data: Mapping[str, object]) -> dict[str, obj
         fixed_allocation_slices,
     )
     _apply_capacity_holds_to_buckets(expanded_buckets, capacity_holds)
+    capacity_ledger = _CapacityLedger(expanded_buckets)
 
-    previous_state = _initial_iteration_state(
-        processes=processes,
-        cpm_by_id=cpm_by_id,
-        requirements_by_process=requirements_by_process,
-    )
-    final_iteration: dict[str, object] | None = None
-    final_comparison: dict[str, object] | None = None
-
-    for iteration in range(1, max_iterations + 1):
-        current = _run_allocation_iteration(
-            project_id=project_id,
-            project_start_at=project_start_at,
+    # Capacity search widens the horizon until recurring capacity covers every
+    # requirement. Parsed inputs, CPM and the ledger built so far are reused;
+    # only buckets for the newly added window are expanded.
+    while True:
+        previous_state = _initial_iteration_state(
             processes=processes,
-            dependencies=dependencies,
-            topo_order=topo_order,
             cpm_by_id=cpm_by_id,
             requirements_by_process=requirements_by_process,
-            fixed_role_completions=fixed_role_completions,
-            active_role_ids=active_role_ids,
-            resources=resources,
-            resource_by_id=resource_by_id,
-            expanded_buckets=expanded_buckets,
-            blocked_process_ids=active_blocked_process_ids,
-            blocked_policy=blocked_policy,
-            horizon_ends_at=horizon_ends_at,
-            iteration=iteration,
-        )
-        comparison = compare_resource_schedule_iterations(
-            previous_state,
-            current,
-            tolerance_hours=tolerance_hours,
         )
-        final_iteration = current
-        final_comparison = comparison
-        if bool(comparison["converged"]):
-            break
-        previous_state = current
+        final_iteration: dict[str, object] | None = None
+        final_comparison: dict[str, object] | None = None
 
-    assert final_iteration is not None
-    assert final_comparison is not None
+        with span("greedy_iterations"):
+            for iteration in range(1, max_iterations + 1):
+                if final_iteration is None:
+                    current = _run_allocation_iteration(
+                        project_id=project_id,
+                        project_start_at=project_start_at,
+                        processes=processes,
+                        dependencies=dependencies,
+                        topo_order=topo_order,
+                        cpm_by_id=cpm_by_id,
+                        requirements_by_process=requirements_by_process,
+                        fixed_role_completions=fixed_role_completions,
+                        active_role_ids=active_role_ids,
+                        resources=resources,
+                        resource_by_id=resource_by_id,
+                        capacity_ledger=capacity_ledger,
+                        blocked_process_ids=active_blocked_process_ids,
+                        blocked_policy=blocked_policy,
+                        horizon_ends_at=horizon_ends_at,
+                        iteration=iteration,
+                    )
+                else:
+                    current = _replay_allocation_iteration(final_iteration, iteration)
+                comparison = compare_resource_schedule_iterations(
+                    previous_state,
+                    current,
+                    tolerance_hours=tolerance_hours,
+                )
+                final_iteration = current
+                final_comparison = comparison
+                if bool(comparison["converged"]):
+                    break
+                previous_state = current
 
-    converged = bool(final_comparison["converged"])
-    iteration_count = int(final_iteration["iteration_count"])
-    unallocated = list(final_iteration["unallocated_requirements"])
-    if unallocated:
-        _raise_for_permanent_capacity_failures(unallocated)
-    if _requires_capacity_search(unallocated):
+        assert final_iteration is not None
+        assert final_comparison is not None
+
+        unallocated = list(final_iteration["unallocated_requirements"])
+        if unallocated:
+            _raise_for_permanent_capacity_failures(unallocated)
+        if not _requires_capacity_search(unallocated):
+            break
         next_horizon_ends_at = _next_capacity_search_end(
             horizon_starts_at,
             horizon_ends_at,
@@ -228,13 +243,25 @@ def compute_resource_schedule(input_data: Mapping[str, object]) -> dict[str, obj
                 "resource schedule did not finish after expanding recurring "
                 "calendar capacity over the internal safety limit"
             )
-        extended_input = dict(input_data)
-        extended_options = dict(options)
-        extended_options["horizon_ends_at"] = next_horizon_ends_at
-        extended_options["_capacity_search_attempt"] = capacity_search_attempt + 1
-        extended_input["options"] = extended_options
-        return compute_resource_schedule(extended_input)
+        expanded_buckets = _extend_capacity_buckets(
+            expanded_buckets,
+            resources=resources,
+            calendars=calendars,
+            horizon_starts_at=horizon_starts_at,
+            previous_ends_at=horizon_ends_at,
+            horizon_ends_at=next_horizon_ends_at,
+            planning_granularity=planning_granularity,
+            fixed_allocation_slices=fixed_allocation_slices,
+            capacity_holds=capacity_holds,
+        )
+        capacity_ledger = _CapacityLedger(expanded_buckets)
+        horizon_ends_at = next_horizon_ends_at
+        capacity_search_attempt += 1
+        options["horizon_ends_at"] = horizon_ends_at
+        options["_capacity_search_attempt"] = capacity_search_attempt
 
+    converged = bool(final_comparison["converged"])
+    iteration_count = int(final_iteration["iteration_count"])
     warnings: list[dict[str, object]] = []
     if not converged:
         warnings.append(
@@ -617,13 +644,13 @@ def _run_allocation_iteration(
     active_role_ids: set[str],
     resources: list[Mapping[str, object]],
     resource_by_id: dict[str, Mapping[str, object]],
-    expanded_buckets: tuple[_LedgerBucket, ...],
+    capacity_ledger: _CapacityLedger,
     blocked_process_ids: set[str],
     blocked_policy: str,
     horizon_ends_at: dt.datetime,
     iteration: int,
 ) -> dict[str, object]:
-    ledger = _fresh_ledger(expanded_buckets)
+    ledger = capacity_ledger.fresh()
     daily_allocated: dict[tuple[str, str, str, str], float] = defaultdict(float)
     bucket_focus: dict[tuple[str, dt.datetime, dt.datetime], str] = {}
     session_focus: dict[tuple[str, str, str], tuple[str, str]] = {}
@@ -647,14 +674,12 @@ def _run_allocation_iteration(
         requirement_states=requirement_states,
         active_role_ids=active_role_ids,
         resources=resources,
-        expanded_buckets=expanded_buckets,
+        buckets=ledger.buckets,
     )
 
-    bucket_intervals = sorted({(bucket.starts_at, bucket.ends_at) for bucket in ledger.values()})
-    if not bucket_intervals:
-        bucket_intervals = [(project_start_at, horizon_ends_at)]
+    bucket_intervals = ledger.intervals or ((project_start_at, horizon_ends_at, ()),)
 
-    for _starts_at, bucket_ends_at in bucket_intervals:
+    for _starts_at, bucket_ends_at, interval_buckets in bucket_intervals:
         _settle_ready_processes(
             project_id=project_id,
             until_at=bucket_ends_at,
@@ -678,11 +703,7 @@ def _run_allocation_iteration(
         ]
         resources_used_by_requirement = defaultdict(set)
         for bucket in sorted(
-            (
-                item
-                for item in ledger.values()
-                if item.starts_at == _starts_at and item.ends_at == bucket_ends_at
-            ),
+            interval_buckets,
             key=lambda item: (
                 _bucket_resource_preference_rank(
                     bucket=item,
@@ -700,7 +721,7 @@ def _run_allocation_iteration(
                 *_bucket_resource_sort_key(item, resource_by_id),
             ),
         ):
-            if bucket.remaining_hours <= EPSILON:
+            if ledger.remaining_hours(bucket) <= EPSILON:
                 continue
             candidates = _ready_split_candidates_for_bucket(
                 bucket=bucket,
@@ -724,12 +745,13 @@ def _run_allocation_iteration(
             )
             assignments = _water_fill_requirement_candidates(
                 candidates,
-                bucket.remaining_hours,
+                ledger.remaining_hours(bucket),
             )
             for candidate, amount in assignments:
                 if amount <= EPSILON:
                     continue
                 _consume_bucket(
+                    ledger,
                     candidate.bucket,
                     amount,
                     daily_allocated,
@@ -767,7 +789,7 @@ def _run_allocation_iteration(
                     allocation,
                     amount,
                 )
-            if bucket.remaining_hours > EPSILON and _allocate_contiguous_ready_requirements(
+            if ledger.remaining_hours(bucket) > EPSILON and _allocate_contiguous_ready_requirements(
                 project_id=project_id,
                 bucket=bucket,
                 active_role_ids=active_role_ids,
@@ -863,15 +885,39 @@ def _run_allocation_iteration(
     }
 
 
+def _replay_allocation_iteration(
+    previous: Mapping[str, object],
+    iteration: int,
+) -> dict[str, object]:
+    """Return ``previous`` as the result of allocation iteration ``iteration``.
+
+    ``_run_allocation_iteration`` reads nothing from earlier iterations: the
+    ledger, requirement states and process rows all start from the same
+    inputs. Every iteration after the first therefore diverges from its
+    predecessor nowhere, and only the iteration number on slices changes.
+    """
+    return {
+        "processes": [dict(row) for row in _sequence(previous["processes"])],
+        "allocation_slices": [
+            {**allocation, "iteration": iteration}
+            for allocation in _sequence(previous["allocation_slices"])
+        ],
+        "unallocated_requirements": [
+            dict(item) for item in _sequence(previous["unallocated_requirements"])
+        ],
+        "iteration_count": iteration,
+    }
+
+
 def _initialize_requirement_eligibility(
     *,
     requirement_states: dict[tuple[str, str], _RequirementState],
     active_role_ids: set[str],
     resources: list[Mapping[str, object]],
-    expanded_buckets: tuple[_LedgerBucket, ...],
+    buckets: tuple[_LedgerBucket, ...],
 ) -> None:
     buckets_by_resource = defaultdict(list)
-    for bucket in expanded_buckets:
+    for bucket in buckets:
         if bucket.capacity_hours > EPSILON:
             buckets_by_resource[bucket.resource_id].append(bucket)
 
@@ -1004,7 +1050,7 @@ def _ready_split_candidates_for_bucket(
     closed_process_ids: set[str],
     project_start_at: dt.datetime,
     processes_by_id: dict[str, Mapping[str, object]],
-    ledger: dict[tuple[str, dt.datetime, dt.datetime], _LedgerBucket],
+    ledger: _CapacityLedger,
     resources_used_by_requirement: dict[
         tuple[str, str, dt.datetime, dt.datetime],
         set[str],
@@ -1070,6 +1116,7 @@ def _ready_split_candidates_for_bucket(
             headroom = _candidate_headroom(
                 requirement=requirement,
                 bucket=bucket,
+                ledger=ledger,
                 daily_allocated=daily_allocated,
                 remaining=remaining,
                 ready_at=ready_at,
@@ -1110,10 +1157,8 @@ def _ready_split_candidates_for_bucket(
                 role_availability_by_key[availability_key] = (
                     _role_remaining_capacity_hours(
                         role_id=role_id,
-                        process_id=process_id,
                         resources=resources,
                         ledger=ledger,
-                        bucket_focus=bucket_focus,
                         session_focus=session_focus,
                         requirement_key=requirement_key,
                         requirement_states=requirement_states,
@@ -1275,7 +1320,7 @@ def _allocate_contiguous_ready_requirements(
     active_role_ids: set[str],
     resources: list[Mapping[str, object]],
     resource_by_id: dict[str, Mapping[str, object]],
-    ledger: dict[tuple[str, dt.datetime, dt.datetime], _LedgerBucket],
+    ledger: _CapacityLedger,
     daily_allocated: dict[tuple[str, str, str, str], float],
     dependencies: dict[str, tuple[str, ...]],
     process_rows: dict[str, dict[str, object]],
@@ -1397,7 +1442,7 @@ def _finalize_open_processes(
     requirement_states: dict[tuple[str, str], _RequirementState],
     project_start_at: dt.datetime,
     processes_by_id: dict[str, Mapping[str, object]],
-    ledger: dict[tuple[str, dt.datetime, dt.datetime], _LedgerBucket],
+    ledger: _CapacityLedger,
     horizon_ends_at: dt.datetime,
     unallocated: list[dict[str, object]],
 ) -> None:
@@ -1502,7 +1547,7 @@ def _allocate_requirement(
     active_role_ids: set[str],
     resources: list[Mapping[str, object]],
     resource_by_id: dict[str, Mapping[str, object]],
-    ledger: dict[tuple[str, dt.datetime, dt.datetime], _LedgerBucket],
+    ledger: _CapacityLedger,
     daily_allocated: dict[tuple[str, str, str, str], float],
     horizon_ends_at: dt.datetime,
     iteration: int,
@@ -1524,7 +1569,7 @@ def _allocate_requirement(
     eligible_ids = {str(resource["resource_id"]) for resource in eligible}
     buckets = [
         bucket
-        for bucket in sorted(ledger.values(), key=_bucket_sort_key)
+        for bucket in ledger.buckets
         if bucket.resource_id in eligible_ids
         and bucket.ends_at > ready_at
         and bucket.starts_at < horizon_ends_at
@@ -1576,7 +1621,7 @@ def _allocate_split(
     ready_at: dt.datetime,
     eligible: list[Mapping[str, object]],
     resource_by_id: dict[str, Mapping[str, object]],
-    ledger: dict[tuple[str, dt.datetime, dt.datetime], _LedgerBucket],
+    ledger: _CapacityLedger,
     daily_allocated: dict[tuple[str, str, str, str], float],
     iteration: int,
 ) -> list[dict[str, object]]:
@@ -1585,29 +1630,22 @@ def _allocate_split(
     slices: list[dict[str, object]] = []
     eligible_ids = {str(resource["resource_id"]) for resource in eligible}
 
-    bucket_times = sorted(
-        {
-            (bucket.starts_at, bucket.ends_at)
-            for bucket in ledger.values()
-            if bucket.resource_id in eligible_ids and bucket.ends_at > ready_at
-        }
-    )
-    for starts_at, ends_at in bucket_times:
+    for _starts_at, ends_at, interval_buckets in ledger.intervals:
         if remaining <= EPSILON:
             break
+        if ends_at <= ready_at:
+            continue
         candidates = []
-        for bucket in ledger.values():
+        for bucket in interval_buckets:
             if (
-                bucket.starts_at != starts_at
-                or bucket.ends_at != ends_at
-                or bucket.resource_id not in eligible_ids
-                or bucket.remaining_hours <= EPSILON
-                or bucket.ends_at <= ready_at
+                bucket.resource_id not in eligible_ids
+                or ledger.remaining_hours(bucket) <= EPSILON
             ):
                 continue
             headroom = _candidate_headroom(
                 requirement=requirement,
                 bucket=bucket,
+                ledger=ledger,
                 daily_allocated=daily_allocated,
                 remaining=remaining,
                 ready_at=ready_at,
@@ -1659,7 +1697,7 @@ def _allocate_split(
         for bucket, amount in assignments:
             if amount <= EPSILON:
                 continue
-            _consume_bucket(bucket, amount, daily_allocated, requirement)
+            _consume_bucket(ledger, bucket, amount, daily_allocated, requirement)
             remaining -= amount
             slices.append(
                 _allocation_row(
@@ -1682,7 +1720,7 @@ def _allocate_contiguous(
     ready_at: dt.datetime,
     eligible: list[Mapping[str, object]],
     resource_by_id: dict[str, Mapping[str, object]],
-    ledger: dict[tuple[str, dt.datetime, dt.datetime], _LedgerBucket],
+    ledger: _CapacityLedger,
     daily_allocated: dict[tuple[str, str, str, str], float],
     bucket_focus: dict[tuple[str, dt.datetime, dt.datetime], str],
     iteration: int,
@@ -1707,15 +1745,13 @@ def _allocate_contiguous(
         resource_id = str(resource["resource_id"])
         resource_working_buckets = [
             bucket
-            for bucket in sorted(ledger.values(), key=_bucket_sort_key)
-            if bucket.resource_id == resource_id
-            and bucket.ends_at > ready_at
-            and bucket.capacity_hours > EPSILON
+            for bucket in ledger.resource_buckets(resource_id)
+            if bucket.ends_at > ready_at and bucket.capacity_hours > EPSILON
         ]
         buckets = [
             bucket
             for bucket in resource_working_buckets
-            if bucket.remaining_hours > EPSILON
+            if ledger.remaining_hours(bucket) > EPSILON
             and bucket_focus.get(_bucket_focus_key(bucket), process_id) == process_id
             and _session_focus_allows(
                 bucket,
@@ -1739,6 +1775,7 @@ def _allocate_contiguous(
                 headroom = _candidate_headroom(
                     requirement=requirement,
                     bucket=bucket,
+                    ledger=ledger,
                     daily_allocated=daily_allocated,
                     remaining=effort - total,
                     ready_at=ready_at,
@@ -1753,6 +1790,7 @@ def _allocate_contiguous(
                     slices = []
                     for selected_bucket, selected_amount in sequence:
                         _consume_bucket(
+                            ledger,
                             selected_bucket,
                             selected_amount,
                             daily_allocated,
@@ -1823,6 +1861,7 @@ def _candidate_headroom(
     *,
     requirement: Mapping[str, object],
     bucket: _LedgerBucket,
+    ledger: _CapacityLedger,
     daily_allocated: dict[tuple[str, str, str, str], float],
     remaining: float,
     ready_at: dt.datetime,
@@ -1835,7 +1874,7 @@ def _candidate_headroom(
     available_after_ready = _bucket_capacity_after(bucket, ready_at)
     headroom = min(
         1.0,
-        bucket.remaining_hours,
+        ledger.remaining_hours(bucket),
         available_after_ready,
         daily_residual,
         remaining,
@@ -1849,23 +1888,19 @@ def _block_headroom(
     *,
     requirement: Mapping[str, object],
     bucket: _LedgerBucket,
-    ledger: dict[tuple[str, dt.datetime, dt.datetime], _LedgerBucket],
+    ledger: _CapacityLedger,
     daily_allocated: dict[tuple[str, str, str, str], float],
     remaining: float,
     ready_at: dt.datetime,
 ) -> float:
     total = 0.0
-    for candidate in sorted(ledger.values(), key=_bucket_sort_key):
-        if (
-            candidate.resource_id != bucket.resource_id
-            or candidate.local_date != bucket.local_date
-            or candidate.window_id != bucket.window_id
-            or candidate.starts_at < bucket.starts_at
-        ):
+    for candidate in ledger.block_buckets(bucket):
+        if candidate.starts_at < bucket.starts_at:
             continue
         total += _candidate_headroom(
             requirement=requirement,
             bucket=candidate,
+            ledger=ledger,
             daily_allocated=daily_allocated,
             remaining=max(0.0, remaining - total),
             ready_at=ready_at,
@@ -1876,12 +1911,13 @@ def _block_headroom(
 
 
 def _consume_bucket(
+    ledger: _CapacityLedger,
     bucket: _LedgerBucket,
     amount: float,
     daily_allocated: dict[tuple[str, str, str, str], float],
     requirement: Mapping[str, object],
 ) -> None:
-    bucket.remaining_hours = 0.0
+    ledger.remaining[bucket.position] = 0.0
     key = _daily_allocation_key(requirement, bucket.resource_id, bucket.local_date)
     daily_allocated[key] += amount
 
@@ -2122,6 +2158,7 @@ def _topological_order(
     return tuple(output)
 
 
+@timed("cpm")
 def _compute_cpm(
     processes: list[Mapping[str, object]],
     dependencies: dict[str, tuple[str, ...]],
@@ -2474,7 +2511,7 @@ def _expand_capacity_buckets(
             if calendar is None or not bool(calendar.get("active", True)):
                 continue
             timezone = ZoneInfo(str(calendar.get("timezone", "UTC")))
-            for bucket in expand_resource_calendar(
+            for bucket in CALENDAR_EXPANSION_CACHE.expand(
                 calendar=calendar,
                 resource=resource,
                 horizon_starts_at=segment_starts_at,
@@ -2498,6 +2535,41 @@ def _expand_capacity_buckets(
     return tuple(sorted(output, key=_bucket_sort_key))
 
 
+def _extend_capacity_buckets(
+    buckets: tuple[_LedgerBucket, ...],
+    *,
+    resources: list[Mapping[str, object]],
+    calendars: list[Mapping[str, object]],
+    horizon_starts_at: dt.datetime,
+    previous_ends_at: dt.datetime,
+    horizon_ends_at: dt.datetime,
+    planning_granularity: str,
+    fixed_allocation_slices: list[dict[str, object]],
+    capacity_holds: list[dict[str, object]],
+) -> tuple[_LedgerBucket, ...]:
+    """Return ``buckets`` expanded from ``previous_ends_at`` to ``horizon_ends_at``.
+
+    Windows near the old end may have been clipped by it, so the local dates
+    from ``stable_expansion_prefix`` on are expanded again.
+    """
+    cutoff_text, tail_starts_at = stable_expansion_prefix(horizon_starts_at, previous_ends_at)
+    tail = tuple(
+        bucket
+        for bucket in _expand_capacity_buckets(
+            resources=resources,
+            calendars=calendars,
+            horizon_starts_at=tail_starts_at,
+            horizon_ends_at=horizon_ends_at,
+            planning_granularity=planning_granularity,
+        )
+        if bucket.local_date >= cutoff_text
+    )
+    _apply_fixed_allocation_slices_to_buckets(tail, fixed_allocation_slices)
+    _apply_capacity_holds_to_buckets(tail, capacity_holds)
+    kept = [bucket for bucket in buckets if bucket.local_date < cutoff_text]
+    return tuple(sorted([*kept, *tail], key=_bucket_sort_key))
+
+
 def _resource_calendar_segments(
     resource: Mapping[str, object],
     calendar_by_id: dict[str, Mapping[str, object]],
@@ -2548,24 +2620,147 @@ def _resource_calendar_segments(
     ]
 
 
-def _fresh_ledger(
-    buckets: tuple[_LedgerBucket, ...],
-) -> dict[tuple[str, dt.datetime, dt.datetime], _LedgerBucket]:
-    return {
-        (bucket.resource_id, bucket.starts_at, bucket.ends_at): _LedgerBucket(
-            resource_id=bucket.resource_id,
-            calendar_id=bucket.calendar_id,
-            starts_at=bucket.starts_at,
-            ends_at=bucket.ends_at,
-            capacity_hours=bucket.capacity_hours,
-            remaining_hours=bucket.remaining_hours,
-            role_ids=bucket.role_ids,
-            local_date=bucket.local_date,
-            local_week=bucket.local_week,
-            window_id=bucket.window_id,
+class _CapacityLedger:
+    """Capacity buckets in time order with remaining hours held in an array.
+
+    ``buckets`` are sorted like ``_bucket_sort_key`` and each bucket's
+    ``position`` indexes the ``starts_us``, ``ends_us``, ``hours``,
+    ``capacity`` and ``remaining`` arrays. Buckets are shared by every
+    iteration; ``fresh`` copies only ``remaining``. Read remaining capacity
+    through the ledger, never from ``_LedgerBucket.remaining_hours``, which
+    keeps the value the ledger started from.
+    """
+
+    __slots__ = (
+        "_block_buckets",
+        "_by_key",
+        "_resource_buckets",
+        "_role_masks",
+        "_session_ids",
+        "buckets",
+        "capacity",
+        "ends_us",
+        "hours",
+        "intervals",
+        "remaining",
+        "sessions",
+        "starts_us",
+    )
+
+    def __init__(self, buckets: Iterable[_LedgerBucket]) -> None:
+        self.buckets = tuple(
+            replace(bucket, position=position)
+            for position, bucket in enumerate(sorted(buckets, key=_bucket_sort_key))
+        )
+        self._by_key = {_bucket_focus_key(bucket): bucket for bucket in self.buckets}
+        self.starts_us = np.array(
+            [_epoch_microseconds(bucket.starts_at) for bucket in self.buckets],
+            dtype=np.int64,
+        )
+        self.ends_us = np.array(
+            [_epoch_microseconds(bucket.ends_at) for bucket in self.buckets],
+            dtype=np.int64,
+        )
+        self.hours = np.array(
+            [_hours_between(bucket.starts_at, bucket.ends_at) for bucket in self.buckets],
+            dtype=np.float64,
+        )
+        self.capacity = np.array(
+            [bucket.capacity_hours for bucket in self.buckets],
+            dtype=np.float64,
+        )
+        self.remaining = np.array(
+            [bucket.remaining_hours for bucket in self.buckets],
+            dtype=np.float64,
         )
-        for bucket in buckets
-    }
+
+        intervals: list[tuple[dt.datetime, dt.datetime, tuple[_LedgerBucket, ...]]] = []
+        resource_buckets: dict[str, list[_LedgerBucket]] = defaultdict(list)
+        block_buckets: dict[tuple[str, str, str | None], list[_LedgerBucket]] = (
+            defaultdict(list)
+        )
+        self._session_ids: dict[tuple[str, str, str], int] = {}
+        sessions = []
+        for bucket in self.buckets:
+            if intervals and intervals[-1][:2] == (bucket.starts_at, bucket.ends_at):
+                intervals[-1] = (*intervals[-1][:2], (*intervals[-1][2], bucket))
+            else:
+                intervals.append((bucket.starts_at, bucket.ends_at, (bucket,)))
+            resource_buckets[bucket.resource_id].append(bucket)
+            block_buckets[_bucket_block_key(bucket)].append(bucket)
+            sessions.append(
+                self._session_ids.setdefault(
+                    _bucket_session_focus_key(bucket),
+                    len(self._session_ids),
+                )
+            )
+        self.intervals = tuple(intervals)
+        self._resource_buckets = {
+            resource_id: tuple(items) for resource_id, items in resource_buckets.items()
+        }
+        self._block_buckets = {key: tuple(items) for key, items in block_buckets.items()}
+        self.sessions = np.array(sessions, dtype=np.int64)
+        self._role_masks: dict[tuple[str, frozenset[str]], np.ndarray] = {}
+
+    def __getitem__(self, key: tuple[str, dt.datetime, dt.datetime]) -> _LedgerBucket:
+        return self._by_key[key]
+
+    def fresh(self) -> _CapacityLedger:
+        """Return a ledger sharing these buckets with its own remaining hours."""
+        ledger = object.__new__(_CapacityLedger)
+        for name in _CapacityLedger.__slots__:
+            setattr(ledger, name, getattr(self, name))
+        ledger.remaining = self.remaining.copy()
+        return ledger
+
+    def remaining_hours(self, bucket: _LedgerBucket) -> float:
+        return float(self.remaining[bucket.position])
+
+    def resource_buckets(self, resource_id: str) -> tuple[_LedgerBucket, ...]:
+        return self._resource_buckets.get(resource_id, ())
+
+    def block_buckets(self, bucket: _LedgerBucket) -> tuple[_LedgerBucket, ...]:
+        """Return buckets of the same resource, local date and calendar window."""
+        return self._block_buckets[_bucket_block_key(bucket)]
+
+    def session_id(self, key: tuple[str, str, str]) -> int | None:
+        return self._session_ids.get(key)
+
+    def role_mask(self, role_id: str, resource_ids: frozenset[str]) -> np.ndarray:
+        """Return which buckets belong to ``resource_ids`` and offer ``role_id``."""
+        mask = self._role_masks.get((role_id, resource_ids))
+        if mask is None:
+            mask = np.array(
+                [
+                    bucket.resource_id in resource_ids and role_id in bucket.role_ids
+                    for bucket in self.buckets
+                ],
+                dtype=bool,
+            )
+            self._role_masks[(role_id, resource_ids)] = mask
+        return mask
+
+    def capacity_from(self, positions: np.ndarray, starts_at: dt.datetime) -> np.ndarray:
+        """Vectorized ``_bucket_capacity_between(bucket, starts_at, bucket.ends_at)``.
+
+        ``positions`` must only hold buckets that end after ``starts_at``.
+        """
+        overlap_starts_us = np.maximum(self.starts_us[positions], _epoch_microseconds(starts_at))
+        overlap_hours = (self.ends_us[positions] - overlap_starts_us) / 1_000_000 / 3600
+        hours = self.hours[positions]
+        return np.where(
+            hours > 0,
+            self.capacity[positions] * overlap_hours / np.where(hours > 0, hours, 1.0),
+            0.0,
+        )
+
+
+def _epoch_microseconds(value: dt.datetime) -> int:
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _bucket_block_key(bucket: _LedgerBucket) -> tuple[str, str, str | None]:
+    return bucket.resource_id, bucket.local_date, bucket.window_id
 
 
 def _eligible_resources(
@@ -2617,21 +2812,21 @@ def _window_id_for_bucket(
 
 def _first_resource_bucket_key(
     resource: Mapping[str, object],
-    ledger: dict[tuple[str, dt.datetime, dt.datetime], _LedgerBucket],
+    ledger: _CapacityLedger,
     ready_at: dt.datetime,
 ) -> tuple[object, ...]:
     resource_id = str(resource["resource_id"])
-    buckets = [
-        bucket
-        for bucket in ledger.values()
-        if bucket.resource_id == resource_id
-        and bucket.ends_at > ready_at
-        and bucket.remaining_hours > EPSILON
-    ]
-    first = min(
-        (max(bucket.starts_at, ready_at) for bucket in buckets),
-        default=dt.datetime.max.replace(tzinfo=UTC),
-    )
+    first = dt.datetime.max.replace(tzinfo=UTC)
+    buckets = ledger.resource_buckets(resource_id)
+    if buckets:
+        positions = np.fromiter((bucket.position for bucket in buckets), dtype=np.int64)
+        open_positions = np.flatnonzero(
+            (ledger.ends_us[positions] > _epoch_microseconds(ready_at))
+            & (ledger.remaining[positions] > EPSILON)
+        )
+        if open_positions.size:
+            # Resource buckets are in start order, so the first open one starts earliest.
+            first = max(buckets[int(open_positions[0])].starts_at, ready_at)
     return (first, _resource_cost(resource), resource_id)
 
 
@@ -2650,43 +2845,41 @@ def _resource_sort_key(
 def _role_remaining_capacity_hours(
     *,
     role_id: str,
-    process_id: str,
     resources: list[Mapping[str, object]],
-    ledger: dict[tuple[str, dt.datetime, dt.datetime], _LedgerBucket],
-    bucket_focus: dict[tuple[str, dt.datetime, dt.datetime], str],
+    ledger: _CapacityLedger,
     session_focus: dict[tuple[str, str, str], tuple[str, str]],
     requirement_key: tuple[str, str],
     requirement_states: dict[tuple[str, str], _RequirementState],
     starts_at: dt.datetime,
 ) -> float:
     """Measure remaining schedulable capacity for a role from a point in time."""
-    eligible_resource_ids = {
+    eligible_resource_ids = frozenset(
         str(resource["resource_id"])
         for resource in resources
         if bool(resource.get("active", True))
         and role_id in {str(value) for value in resource.get("role_ids", ())}
-    }
-    total = 0.0
-    for bucket in ledger.values():
-        if (
-            bucket.resource_id not in eligible_resource_ids
-            or role_id not in bucket.role_ids
-            or bucket.ends_at <= starts_at
-        ):
-            continue
-        focused_process_id = bucket_focus.get(_bucket_focus_key(bucket))
-        if focused_process_id is not None and focused_process_id != process_id:
-            continue
-        if _session_focus_blocks(
-            bucket,
-            requirement_key,
-            requirement_states,
-            session_focus,
-        ):
-            continue
-        capacity = _bucket_capacity_between(bucket, starts_at, bucket.ends_at)
-        total += min(bucket.remaining_hours, capacity)
-    return round(total, 6)
+    )
+    mask = ledger.role_mask(role_id, eligible_resource_ids) & (
+        ledger.ends_us > _epoch_microseconds(starts_at)
+    )
+    # Buckets focused on a process were consumed when the focus was set, so
+    # they add no remaining capacity and need no mask.
+    blocked_sessions = [
+        session_id
+        for key, focused_key in session_focus.items()
+        if focused_key != requirement_key
+        and (focused_state := requirement_states.get(focused_key)) is not None
+        and not _requirement_state_finished(focused_state)
+        and (session_id := ledger.session_id(key)) is not None
+    ]
+    if blocked_sessions:
+        mask &= ~np.isin(ledger.sessions, blocked_sessions)
+    positions = np.flatnonzero(mask)
+    if not positions.size:
+        return 0.0
+    available = np.minimum(ledger.remaining[positions], ledger.capacity_from(positions, starts_at))
+    # cumsum adds in ledger order like the scalar loop, so totals match exactly.
+    return round(float(np.cumsum(available)[-1]), 6)
 
 
 def _resource_cost(resource: Mapping[str, object]) -> Decimal:
@@ -2957,7 +3150,7 @@ def _unallocated_row(
     project_id: str,
     requirement: Mapping[str, object],
     state: _RequirementState,
-    ledger: dict[tuple[str, dt.datetime, dt.datetime], _LedgerBucket],
+    ledger: _CapacityLedger,
     horizon_ends_at: dt.datetime,
 ) -> dict[str, object]:
     remaining = max(0.0, float(requirement["effort_hours"]) - state.allocated_hours)
@@ -2989,7 +3182,7 @@ def _incomplete_reason(
     requirement: Mapping[str, object],
     state: _RequirementState,
     *,
-    ledger: dict[tuple[str, dt.datetime, dt.datetime], _LedgerBucket],
+    ledger: _CapacityLedger,
     horizon_ends_at: dt.datetime,
 ) -> str:
     existing = requirement.get("_state")
@@ -3084,7 +3277,7 @@ def _requirement_diagnostics(
     *,
     requirement: Mapping[str, object],
     state: _RequirementState,
-    ledger: dict[tuple[str, dt.datetime, dt.datetime], _LedgerBucket],
+    ledger: _CapacityLedger,
     horizon_ends_at: dt.datetime,
 ) -> dict[str, object]:
     ready_at = state.ready_at
@@ -3098,7 +3291,7 @@ def _requirement_diagnostics(
     resources_with_remaining: set[str] = set()
 
     if ready_at is not None:
-        for bucket in sorted(ledger.values(), key=_bucket_sort_key):
+        for bucket in ledger.buckets:
             if bucket.resource_id not in eligible_resource_ids:
                 continue
             if role_id not in bucket.role_ids:
@@ -3110,7 +3303,7 @@ def _requirement_diagnostics(
             capacity = _bucket_capacity_between(bucket, starts_at, ends_at)
             if capacity <= EPSILON:
                 continue
-            remaining = min(bucket.remaining_hours, capacity)
+            remaining = min(ledger.remaining_hours(bucket), capacity)
             candidate_capacity += capacity
             remaining_capacity += remaining
             if first_candidate_start is None or starts_at < first_candidate_start:
@@ -12,6 +12,7 @@ from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
 
 from projdash.engine import resource_schedule as greedy
+from projdash.engine.profiling import timed
 from rcpsp_mathprog_package.rcpsp_commitment_mcts import (
     CommitmentMCTSOptions,
     CommitmentMCTSPlanner,
@@ -668,6 +669,7 @@ def _schedule_finish(schedule: Mapping[str, object]) -> dt.datetime | None:
     return max(finishes, default=None)
 
 
+@timed("sensitivity")
 def _attach_resource_sensitivity(
     *,
     schedule: dict[str, object],
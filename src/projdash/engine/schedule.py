@@ -14,6 +14,7 @@ from projdash.engine.calendar import (
     next_business_day,
     subtract_business_days,
 )
+from projdash.engine.profiling import timed
 
 
 class ComputedScheduleStatus(str, Enum):
@@ -115,6 +116,7 @@ class ScheduleProjection:
         }
 
 
+@timed("cpm")
 def compute_schedule(
     project: ProjectScheduleInput,
     now: dt.datetime,
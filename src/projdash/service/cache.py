@@ -0,0 +1,232 @@
+"""Bounded caches for service projections."""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from enum import Enum
+from typing import Any
+
+DEFAULT_PROJECTION_CACHE_ENTRIES = 128
+DEFAULT_PROJECTION_CACHE_BYTES = 128 * 1024 * 1024
+
+
+class ProjectionCache:
+    """LRU cache bounded by entry count and approximate size in bytes.
+
+    ``max_entries`` or ``max_bytes`` of ``None`` disables that limit. Sizes are
+    estimated once on insert with ``sizer``. A value larger than ``max_bytes``
+    on its own is returned to the caller but not kept. ``hits``, ``misses``,
+    ``evictions`` and ``invalidations`` count lookups and removals since the
+    cache was created; ``clear`` does not reset them.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int | None = DEFAULT_PROJECTION_CACHE_ENTRIES,
+        max_bytes: int | None = DEFAULT_PROJECTION_CACHE_BYTES,
+        sizer: Callable[[Any], int] | None = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizer = sizer or approximate_size
+        self._entries: OrderedDict[tuple[object, ...], tuple[Any, int]] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def get(self, key: tuple[object, ...]) -> Any | None:
+        """Return the cached value for ``key``, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def keys(self) -> list[tuple[object, ...]]:
+        """Return cached keys, least recently used first."""
+        return list(self._entries)
+
+    def peek(self, key: tuple[object, ...]) -> Any | None:
+        """Return the cached value for ``key`` without counting or reordering it."""
+        entry = self._entries.get(key)
+        return None if entry is None else entry[0]
+
+    def put(self, key: tuple[object, ...], value: Any) -> None:
+        """Cache ``value`` and evict least recently used entries over the limits."""
+        size = self._sizer(value) if self.max_bytes is not None else 0
+        self._discard(key)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._entries[key] = (value, size)
+        self.bytes += size
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.bytes > self.max_bytes)
+        ):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def discard_where(self, predicate: Callable[[tuple[object, ...]], bool]) -> int:
+        """Drop every entry whose key matches ``predicate``; return how many."""
+        keys = [key for key in self._entries if predicate(key)]
+        for key in keys:
+            self._discard(key)
+        self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _discard(self, key: tuple[object, ...]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+
+class ProjectionFlight:
+    """One in-progress projection computation that other callers wait on."""
+
+    __slots__ = ("done", "error", "value")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+    def result(self) -> Any:
+        """Wait for the computation and return its value or raise its error."""
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def approximate_size(value: Any) -> int:
+    """Return a rough deep size of ``value`` in bytes.
+
+    Containers, dataclass-like objects and pydantic models are walked; shared
+    objects are counted once.
+    """
+    seen: set[int] = set()
+    pending = [value]
+    total = 0
+    while pending:
+        item = pending.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, str | bytes | int | float | type | Enum) or item is None:
+            continue
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, list | tuple | set | frozenset):
+            pending.extend(item)
+        elif hasattr(item, "__dict__"):
+            pending.append(vars(item))
+        else:
+            slots = getattr(type(item), "__slots__", ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            pending.extend(getattr(item, slot) for slot in slots if hasattr(item, slot))
+    return total
+
+
+def _read_only(self, *args: Any, **kwargs: Any) -> None:
+    raise TypeError(f"{type(self).__name__} is a read-only cached value; copy it first")
+
+
+class FrozenDict(dict):
+    """Read-only ``dict`` shared by projection cache hits.
+
+    It still compares, serializes and iterates like a ``dict``. ``copy`` and
+    ``copy.deepcopy`` return plain mutable containers, so callers that need to
+    change a cached value copy it explicitly.
+    """
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> dict[Any, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[Any, Any]:
+        return thaw(self)
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def copy(self) -> dict[Any, Any]:
+        return dict(self)
+
+
+class FrozenList(list):
+    """Read-only ``list`` counterpart of ``FrozenDict``."""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __copy__(self) -> list[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> list[Any]:
+        return thaw(self)
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+    def copy(self) -> list[Any]:
+        return list(self)
+
+
+def freeze(value: Any) -> Any:
+    """Return ``value`` with every nested dict and list made read-only.
+
+    Tuples become ``FrozenList`` too, so a frozen value holds the same
+    containers a stored payload loads back as.
+    """
+    if isinstance(value, FrozenDict | FrozenList):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list | tuple):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Return a mutable deep copy of a value built by ``freeze``."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
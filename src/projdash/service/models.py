@@ -192,6 +192,7 @@ class ServiceConfig(StrictModel):
         RequiredRolesTransitionMode.ALLOW_LEGACY
     )
     max_resource_schedule_iterations: PositiveInt = 20
+    cache_now_granularity: dt.timedelta | None = Field(default=None, gt=dt.timedelta(0))
 
 
 class ProcessIdentityMixin(BaseModel):
@@ -0,0 +1,303 @@
+"""Versioned binary codec for SQLite entity payloads.
+
+Payloads are a version byte followed by a msgpack subset: nil, booleans,
+64-bit integers, doubles, UTF-8 strings, arrays and string-keyed maps, plus
+extension types for datetimes, dates and decimals so those load back as
+native values. The layout is fixed here rather than borrowed from an
+interpreter-specific format, so databases stay readable across Python
+versions. Maps keep the key order they were encoded with.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import struct
+from collections.abc import Callable
+from decimal import Decimal
+from typing import Any
+
+PAYLOAD_CODEC_VERSION = 1
+
+_HEADER = bytes([PAYLOAD_CODEC_VERSION])
+_NIL = 0xC0
+_FALSE = 0xC2
+_TRUE = 0xC3
+_EXT8 = 0xC7
+_FLOAT64 = 0xCB
+_INT64 = 0xD3
+_FIXEXT4 = 0xD6
+_FIXEXT16 = 0xD8
+_STR8 = 0xD9
+_STR16 = 0xDA
+_STR32 = 0xDB
+_ARRAY32 = 0xDD
+_MAP32 = 0xDF
+_DATETIME_EXT = 1
+_DECIMAL_EXT = 2
+_DATE_EXT = 3
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+# A naive datetime stores this in place of its UTC offset.
+_NAIVE_OFFSET = _INT64_MIN
+
+_INT64_STRUCT = struct.Struct(">q")
+_FLOAT64_STRUCT = struct.Struct(">d")
+_UINT16_STRUCT = struct.Struct(">H")
+_UINT32_STRUCT = struct.Struct(">I")
+_DATE_STRUCT = struct.Struct(">i")
+_DATETIME_STRUCT = struct.Struct(">qq")
+_EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.UTC)
+_NAIVE_EPOCH = dt.datetime(1970, 1, 1)
+_MICROSECOND = dt.timedelta(microseconds=1)
+
+
+class PayloadCodecError(ValueError):
+    """Raised when a payload was written by an unknown codec version."""
+
+
+def encode_payload(
+    value: Any,
+    *,
+    sort_keys: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> bytes:
+    """Encode ``value`` with the current codec version.
+
+    ``sort_keys`` writes map entries in key order. ``default`` is called with
+    values the format has no type for and returns a replacement to encode,
+    like the ``json.dumps`` argument. Without it those values raise
+    ``TypeError``; integers outside the signed 64-bit range raise
+    ``ValueError``.
+    """
+    out = bytearray(_HEADER)
+    _Writer(out, sort_keys, default).write(value)
+    return bytes(out)
+
+
+def decode_payload(payload: bytes) -> Any:
+    """Decode a payload written by ``encode_payload``."""
+    if payload[:1] != _HEADER:
+        raise PayloadCodecError(payload[0] if payload else None)
+    value, position = _read(payload, 1)
+    if position != len(payload):
+        raise ValueError("Trailing bytes after encoded payload.")
+    return value
+
+
+class _Writer:
+    def __init__(
+        self,
+        out: bytearray,
+        sort_keys: bool,
+        default: Callable[[Any], Any] | None,
+    ) -> None:
+        self.out = out
+        self.sort_keys = sort_keys
+        self.default = default
+
+    def write(self, value: Any) -> None:
+        # Exact built-in types take the first branches; subclasses such as
+        # str enums and the extension types fall through to ``write_other``.
+        out = self.out
+        kind = type(value)
+        if kind is str:
+            data = value.encode("utf-8", "surrogatepass")
+            if len(data) < 0x20:
+                out.append(0xA0 | len(data))
+                out += data
+            else:
+                _write_str_data(data, out)
+        elif value is None:
+            out.append(_NIL)
+        elif kind is dict:
+            size = len(value)
+            if size < 0x10:
+                out.append(0x80 | size)
+            else:
+                out.append(_MAP32)
+                out += _UINT32_STRUCT.pack(size)
+            items = sorted(value.items(), key=_item_key) if self.sort_keys else value.items()
+            for key, item in items:
+                if type(key) is not str:
+                    raise TypeError(
+                        f"Payload map keys must be strings, not {type(key).__name__}."
+                    )
+                data = key.encode("utf-8", "surrogatepass")
+                if len(data) < 0x20:
+                    out.append(0xA0 | len(data))
+                    out += data
+                else:
+                    _write_str_data(data, out)
+                self.write(item)
+        elif kind is list:
+            size = len(value)
+            if size < 0x10:
+                out.append(0x90 | size)
+            else:
+                out.append(_ARRAY32)
+                out += _UINT32_STRUCT.pack(size)
+            for item in value:
+                self.write(item)
+        elif kind is int and 0 <= value < 0x80:
+            out.append(value)
+        else:
+            self.write_other(value)
+
+    def write_other(self, value: Any) -> None:
+        out = self.out
+        if value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, str):
+            _write_str_data(value.encode("utf-8", "surrogatepass"), out)
+        elif isinstance(value, int):
+            if 0 <= value < 0x80:
+                out.append(value)
+            elif -32 <= value < 0:
+                out.append(value & 0xFF)
+            elif _INT64_MIN <= value <= _INT64_MAX:
+                out.append(_INT64)
+                out += _INT64_STRUCT.pack(value)
+            else:
+                raise ValueError(f"Integer out of the 64-bit payload range: {value}.")
+        elif isinstance(value, float):
+            out.append(_FLOAT64)
+            out += _FLOAT64_STRUCT.pack(value)
+        elif isinstance(value, dt.datetime):
+            offset = value.utcoffset()
+            if offset is None:
+                micros = (value - _NAIVE_EPOCH) // _MICROSECOND
+                offset_micros = _NAIVE_OFFSET
+            else:
+                micros = (value - _EPOCH) // _MICROSECOND
+                offset_micros = offset // _MICROSECOND
+            out += bytes((_FIXEXT16, _DATETIME_EXT))
+            out += _DATETIME_STRUCT.pack(micros, offset_micros)
+        elif isinstance(value, dt.date):
+            out += bytes((_FIXEXT4, _DATE_EXT))
+            out += _DATE_STRUCT.pack(value.toordinal())
+        elif isinstance(value, Decimal):
+            text = str(value).encode("ascii")
+            out += bytes((_EXT8, len(text), _DECIMAL_EXT))
+            out += text
+        elif isinstance(value, dict | list):
+            # Subclasses of the container types encode like their base.
+            self.write(dict(value) if isinstance(value, dict) else list(value))
+        elif self.default is not None:
+            self.write(self.default(value))
+        else:
+            raise TypeError(f"Unsupported payload value type: {type(value).__name__}.")
+
+
+def _write_str_data(data: bytes, out: bytearray) -> None:
+    size = len(data)
+    if size < 0x20:
+        out.append(0xA0 | size)
+    elif size < 0x100:
+        out += bytes((_STR8, size))
+    elif size < 0x10000:
+        out.append(_STR16)
+        out += _UINT16_STRUCT.pack(size)
+    else:
+        out.append(_STR32)
+        out += _UINT32_STRUCT.pack(size)
+    out += data
+
+
+def _item_key(item: tuple[str, Any]) -> str:
+    return item[0]
+
+
+def _read(data: bytes, position: int) -> tuple[Any, int]:
+    # Branches are ordered by how often entity payloads use each type; map
+    # entries read short string keys and common scalar values inline.
+    tag = data[position]
+    position += 1
+    if tag < 0x80:
+        return tag, position
+    if tag < 0x90:
+        return _read_map(data, position, tag & 0x0F)
+    if tag < 0xA0:
+        return _read_array(data, position, tag & 0x0F)
+    if tag < 0xC0:
+        end = position + (tag & 0x1F)
+        return data[position:end].decode("utf-8", "surrogatepass"), end
+    if tag >= 0xE0:
+        return tag - 0x100, position
+    if tag == _NIL:
+        return None, position
+    if tag == _TRUE:
+        return True, position
+    if tag == _FALSE:
+        return False, position
+    if tag == _STR8:
+        end = position + 1 + data[position]
+        return data[position + 1 : end].decode("utf-8", "surrogatepass"), end
+    if tag == _FIXEXT16 and data[position] == _DATETIME_EXT:
+        micros, offset_micros = _DATETIME_STRUCT.unpack_from(data, position + 1)
+        position += 17
+        if offset_micros == _NAIVE_OFFSET:
+            return _NAIVE_EPOCH + dt.timedelta(microseconds=micros), position
+        tzinfo = (
+            dt.UTC
+            if offset_micros == 0
+            else dt.timezone(dt.timedelta(microseconds=offset_micros))
+        )
+        local = _NAIVE_EPOCH + dt.timedelta(microseconds=micros + offset_micros)
+        return local.replace(tzinfo=tzinfo), position
+    if tag == _INT64:
+        return _INT64_STRUCT.unpack_from(data, position)[0], position + 8
+    if tag == _FLOAT64:
+        return _FLOAT64_STRUCT.unpack_from(data, position)[0], position + 8
+    if tag == _STR16:
+        end = position + 2 + _UINT16_STRUCT.unpack_from(data, position)[0]
+        return data[position + 2 : end].decode("utf-8", "surrogatepass"), end
+    if tag == _STR32:
+        end = position + 4 + _UINT32_STRUCT.unpack_from(data, position)[0]
+        return data[position + 4 : end].decode("utf-8", "surrogatepass"), end
+    if tag == _ARRAY32:
+        return _read_array(data, position + 4, _UINT32_STRUCT.unpack_from(data, position)[0])
+    if tag == _MAP32:
+        return _read_map(data, position + 4, _UINT32_STRUCT.unpack_from(data, position)[0])
+    if tag == _FIXEXT4 and data[position] == _DATE_EXT:
+        ordinal = _DATE_STRUCT.unpack_from(data, position + 1)[0]
+        return dt.date.fromordinal(ordinal), position + 5
+    if tag == _EXT8 and data[position + 1] == _DECIMAL_EXT:
+        end = position + 2 + data[position]
+        return Decimal(data[position + 2 : end].decode("ascii")), end
+    raise ValueError(f"Unknown payload type tag 0x{tag:02x} at byte {position - 1}.")
+
+
+def _read_map(data: bytes, position: int, size: int) -> tuple[dict[str, Any], int]:
+    result: dict[str, Any] = {}
+    for _ in range(size):
+        tag = data[position]
+        if 0xA0 <= tag < 0xC0:
+            end = position + 1 + (tag & 0x1F)
+            key = data[position + 1 : end].decode("utf-8", "surrogatepass")
+            position = end
+        else:
+            key, position = _read(data, position)
+        tag = data[position]
+        if 0xA0 <= tag < 0xC0:
+            end = position + 1 + (tag & 0x1F)
+            result[key] = data[position + 1 : end].decode("utf-8", "surrogatepass")
+            position = end
+        elif tag < 0x80:
+            result[key] = tag
+            position += 1
+        elif tag == _NIL:
+            result[key] = None
+            position += 1
+        else:
+            result[key], position = _read(data, position)
+    return result, position
+
+
+def _read_array(data: bytes, position: int, size: int) -> tuple[list[Any], int]:
+    result: list[Any] = []
+    for _ in range(size):
+        item, position = _read(data, position)
+        result.append(item)
+    return result, position
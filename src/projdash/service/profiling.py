@@ -0,0 +1,148 @@
+"""Per-query timing profiles and the sinks that receive them."""
+
+from __future__ import annotations
+
+import cProfile
+import datetime as dt
+import logging
+import threading
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Protocol
+
+DEFAULT_PROFILE_RING_SIZE = 256
+
+_code_profiler_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class QueryProfile:
+    """Timings for one query, handed to every configured sink."""
+
+    query_id: uuid.UUID
+    action: str
+    project_id: str | None
+    started_at: dt.datetime
+    total_seconds: float
+    ok: bool
+    spans: dict[str, dict[str, float]] = field(default_factory=dict)
+    code_profile: cProfile.Profile | None = None
+
+
+class QueryProfileSink(Protocol):
+    """Receives a ``QueryProfile`` after each profiled query.
+
+    A sink whose ``code_profile`` attribute is true asks the service to run
+    ``cProfile`` around queries; the profile is attached to ``QueryProfile``.
+    """
+
+    def record(self, profile: QueryProfile) -> None: ...
+
+
+class LoggingProfileSink:
+    """Log queries that took at least ``min_seconds`` with their spans."""
+
+    code_profile = False
+
+    def __init__(
+        self,
+        *,
+        logger: logging.Logger | None = None,
+        level: int = logging.INFO,
+        min_seconds: float = 0.0,
+    ) -> None:
+        self.logger = logger or logging.getLogger("projdash.service.profiling")
+        self.level = level
+        self.min_seconds = min_seconds
+
+    def record(self, profile: QueryProfile) -> None:
+        if profile.total_seconds < self.min_seconds:
+            return
+        spans = ", ".join(
+            f"{name}={timing['seconds']:.4f}s/{timing['count']}"
+            for name, timing in sorted(
+                profile.spans.items(),
+                key=lambda item: item[1]["seconds"],
+                reverse=True,
+            )
+        )
+        self.logger.log(
+            self.level,
+            "query %s %s project=%s took %.4fs%s",
+            profile.action,
+            profile.query_id,
+            profile.project_id,
+            profile.total_seconds,
+            f" ({spans})" if spans else "",
+        )
+
+
+class RingBufferProfileSink:
+    """Keep the most recent ``max_profiles`` query profiles in memory."""
+
+    code_profile = False
+
+    def __init__(self, max_profiles: int = DEFAULT_PROFILE_RING_SIZE) -> None:
+        self._profiles: deque[QueryProfile] = deque(maxlen=max_profiles)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def record(self, profile: QueryProfile) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+
+    def profiles(self) -> list[QueryProfile]:
+        """Return retained profiles, oldest first."""
+        with self._lock:
+            return list(self._profiles)
+
+    def slowest(self, count: int = 10) -> list[QueryProfile]:
+        """Return up to ``count`` retained profiles, slowest first."""
+        profiles = sorted(self.profiles(), key=lambda item: item.total_seconds, reverse=True)
+        return profiles[:count]
+
+
+class CProfileDumpSink:
+    """Write a ``cProfile`` stats file for each query slower than ``min_seconds``.
+
+    Files are named ``<action>-<query_id>.prof`` in ``directory`` and load
+    with ``pstats.Stats``. Only one query is code-profiled at a time; queries
+    that overlap it are timed with spans only.
+    """
+
+    code_profile = True
+
+    def __init__(self, directory: str | Path, *, min_seconds: float = 1.0) -> None:
+        self.directory = Path(directory)
+        self.min_seconds = min_seconds
+
+    def record(self, profile: QueryProfile) -> None:
+        if profile.code_profile is None or profile.total_seconds < self.min_seconds:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile.code_profile.dump_stats(
+            self.directory / f"{profile.action}-{profile.query_id}.prof"
+        )
+
+
+def start_code_profile() -> cProfile.Profile | None:
+    """Start a ``cProfile`` run, or return None if another query holds it."""
+    if not _code_profiler_lock.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another profiler (a debugger or coverage tool) is already active.
+        _code_profiler_lock.release()
+        return None
+    return profiler
+
+
+def stop_code_profile(profiler: cProfile.Profile) -> None:
+    profiler.disable()
+    _code_profiler_lock.release()
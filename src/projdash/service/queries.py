@@ -294,6 +294,7 @@ class QueryProcessGraph(QueryModel, ResourceOptionsMixin):
     scope: Scope | None = None
     include_resource_fields: bool = False
     include_allocation_slices: bool = False
+    allow_stale: bool = False
 
     @model_validator(mode="after")
     def _validate_resource_options(self) -> QueryProcessGraph:
@@ -357,6 +358,7 @@ class QueryResourceSchedule(QueryModel, ResourceOptionsMixin):
     now: AwareDatetime
     scope: Scope | None = None
     include_allocation_slices: bool = False
+    allow_stale: bool = False
 
 
 class QueryAgentContext(QueryModel, ResourceOptionsMixin):
@@ -369,6 +371,7 @@ class QueryAgentContext(QueryModel, ResourceOptionsMixin):
     scope: Scope | None = None
     terminal_process_symbols: list[str] | None = None
     snapshot_limit: PositiveInt = 5
+    allow_stale: bool = False
 
     @field_validator("terminal_process_symbols")
     @classmethod
@@ -498,6 +501,7 @@ class QueryEnvelope(StrictModel):
 
     query_id: uuid.UUID = Field(default_factory=uuid.uuid4)
     query: Query
+    include_timings: bool = False
 
 
 __all__ = [
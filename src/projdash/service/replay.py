@@ -0,0 +1,106 @@
+"""Command replay cache used for command idempotency."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any
+
+from projdash.service.results import CommandErrorResult, CommandResult
+
+ReplayRecords = dict[str, CommandResult | CommandErrorResult]
+
+DEFAULT_REPLAY_CACHE_COMMANDS = 4096
+
+
+class CommandReplayCache:
+    """Bounded in-memory view over a repository's command replay log.
+
+    Lookups hit an LRU of recently seen command ids and fall back to the
+    repository's ``load_command_replay(command_id)`` point lookup. New results
+    are appended one row at a time through ``record_command_replay``.
+    Repositories that only offer the legacy bulk ``load_command_replay_cache``
+    are loaded once up front. Entries are only evicted when a point lookup can
+    bring them back. Overlays made with ``staged`` read through to this cache
+    and never persist; their results stay in ``pending`` until merged back.
+    """
+
+    def __init__(
+        self,
+        repository: Any = None,
+        *,
+        max_commands: int = DEFAULT_REPLAY_CACHE_COMMANDS,
+    ) -> None:
+        self.max_commands = max_commands
+        self._entries: OrderedDict[object, ReplayRecords] = OrderedDict()
+        self.pending: list[tuple[object, str, CommandResult | CommandErrorResult]] = []
+        self._parent: CommandReplayCache | None = None
+        self._loader = getattr(repository, "load_command_replay", None)
+        self._recorder = getattr(repository, "record_command_replay", None)
+        if not callable(self._loader):
+            self._loader = None
+            bulk_loader = getattr(repository, "load_command_replay_cache", None)
+            if callable(bulk_loader):
+                self._entries.update(bulk_loader())
+        if not callable(self._recorder):
+            self._recorder = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, command_id: object) -> ReplayRecords | None:
+        """Return replay records for a command id, or None if it never ran."""
+        records = self._entries.get(command_id)
+        if records is not None:
+            self._entries.move_to_end(command_id)
+            return records
+        if self._parent is not None:
+            return self._parent.get(command_id)
+        if self._loader is None:
+            return None
+        records = self._loader(command_id)
+        if not records:
+            return None
+        self._remember(command_id, dict(records))
+        return self._entries[command_id]
+
+    def record(
+        self,
+        command_id: object,
+        payload_hash: str,
+        result: CommandResult | CommandErrorResult,
+    ) -> None:
+        """Remember and persist one replay result."""
+        records = self._entries.get(command_id)
+        if records is None:
+            inherited = self._parent.get(command_id) if self._parent is not None else None
+            self._remember(command_id, {**(inherited or {}), payload_hash: result})
+        else:
+            records[payload_hash] = result
+            self._entries.move_to_end(command_id)
+        if self._parent is not None:
+            self.pending.append((command_id, payload_hash, result))
+        elif self._recorder is not None:
+            self._recorder(command_id, payload_hash, result)
+
+    def staged(self) -> CommandReplayCache:
+        """Return a non-persisting overlay that falls through to this cache.
+
+        Setup is constant time: the overlay only holds results recorded while
+        staging, and every other lookup is answered by this cache.
+        """
+        overlay = CommandReplayCache(max_commands=self.max_commands)
+        overlay._parent = self
+        return overlay
+
+    def merge(self, other: CommandReplayCache) -> None:
+        """Record results that ``other`` accumulated without persisting."""
+        for command_id, payload_hash, result in other.pending:
+            self.record(command_id, payload_hash, result)
+
+    def _remember(self, command_id: object, records: ReplayRecords) -> None:
+        self._entries[command_id] = records
+        self._entries.move_to_end(command_id)
+        if self._loader is None or self._parent is not None:
+            return
+        while len(self._entries) > self.max_commands:
+            self._entries.popitem(last=False)
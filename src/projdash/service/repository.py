@@ -6,12 +6,23 @@ import copy
 import datetime as dt
 import hashlib
 import math
-from collections import defaultdict
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from collections.abc import (
+    ItemsView,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Sequence,
+    ValuesView,
+)
 from typing import Any, Protocol
 
 import networkx as nx
 
-from projdash.engine.calendar import expand_resource_calendar
+from projdash.engine.calendar import CALENDAR_EXPANSION_CACHE
 from projdash.engine.schedule import ProcessScheduleInput, ProjectScheduleInput
 from projdash.service.errors import ServiceValidationError, ValidationIssue
 from projdash.service.identifiers import new_id, symbolify
@@ -135,6 +146,497 @@ class RecordDict(dict):
         return copy.deepcopy(dict(self))
 
 
+REPOSITORY_STATE_FIELDS = (
+    "projects",
+    "processes",
+    "process_ids_by_project",
+    "revisions_by_process",
+    "blockers",
+    "blocker_ids_by_project",
+    "role_requirements",
+    "process_role_pins",
+    "process_role_pin_ids_by_project",
+    "roles",
+    "role_ids_by_project",
+    "resources",
+    "resource_ids_by_project",
+    "calendars",
+    "calendar_ids_by_project",
+    "retired_processes",
+    "process_aliases",
+    "process_alias_sources",
+    "dependency_edge_ids",
+    "schedule_snapshots",
+    "milestones",
+    "milestone_ids_by_project",
+    "slack_project_configs",
+    "slack_resource_mappings",
+    "slack_collection_cursors",
+    "slack_encrypted_tokens",
+    "slack_runs",
+    "slack_run_ids_by_project",
+    "slack_outbox",
+    "slack_outbox_ids_by_project",
+    "slack_outbox_dedupe",
+    "pm_communication_evidence",
+    "pm_communication_evidence_ids_by_project",
+    "process_evidence_line_items",
+    "process_evidence_line_item_ids_by_project",
+    "resource_evidence_line_items",
+    "resource_evidence_line_item_ids_by_project",
+)
+_PROJECT_KEYED_STATE_FIELDS = frozenset(
+    {
+        "projects",
+        "process_aliases",
+        "process_alias_sources",
+        "slack_project_configs",
+        "slack_encrypted_tokens",
+        *(name for name in REPOSITORY_STATE_FIELDS if name.endswith("_ids_by_project")),
+    }
+)
+_PROJECT_TUPLE_KEYED_STATE_FIELDS = frozenset(
+    {
+        "dependency_edge_ids",
+        "slack_resource_mappings",
+        "slack_collection_cursors",
+        "slack_outbox_dedupe",
+    }
+)
+_RECORD_STATE_KINDS = {
+    "projects": "project",
+    "processes": "process",
+    "blockers": "blocker",
+    "role_requirements": "role_requirement",
+    "process_role_pins": "process_role_pin",
+    "roles": "role",
+    "resources": "resource",
+    "calendars": "calendar",
+    "retired_processes": "retired_process",
+    "dependency_edge_ids": "dependency_edge",
+    "milestones": "milestone",
+    "slack_project_configs": "slack_project_config",
+    "slack_resource_mappings": "slack_resource_mapping",
+    "slack_collection_cursors": "slack_collection_cursor",
+    "slack_encrypted_tokens": "slack_encrypted_token",
+    "slack_runs": "slack_run",
+    "slack_outbox": "slack_outbox",
+    "slack_outbox_dedupe": "slack_outbox_dedupe",
+    "pm_communication_evidence": "pm_communication_evidence",
+    "process_evidence_line_items": "process_evidence_line_item",
+    "resource_evidence_line_items": "resource_evidence_line_item",
+}
+_ID_LIST_STATE_KINDS = {
+    "process_ids_by_project": "process",
+    "blocker_ids_by_project": "blocker",
+    "process_role_pin_ids_by_project": "process_role_pin",
+    "role_ids_by_project": "role",
+    "resource_ids_by_project": "resource",
+    "calendar_ids_by_project": "calendar",
+    "milestone_ids_by_project": "milestone",
+    "slack_run_ids_by_project": "slack_run",
+    "slack_outbox_ids_by_project": "slack_outbox",
+    "pm_communication_evidence_ids_by_project": "pm_communication_evidence",
+    "process_evidence_line_item_ids_by_project": "process_evidence_line_item",
+    "resource_evidence_line_item_ids_by_project": "resource_evidence_line_item",
+}
+# State read by ``get_project_schedule_input`` and process completedness, by
+# how a change maps to process ids: keyed by process id, records carrying a
+# ``process_id``, or per-project process id lists.
+_SCHEDULE_INPUT_PROCESS_KEYED_STATE_FIELDS = frozenset(
+    {"processes", "revisions_by_process", "retired_processes"}
+)
+_SCHEDULE_INPUT_PROCESS_RECORD_STATE_FIELDS = frozenset({"blockers", "process_role_pins"})
+_SCHEDULE_INPUT_INDEPENDENT_STATE_FIELDS = frozenset(REPOSITORY_STATE_FIELDS) - {
+    *_SCHEDULE_INPUT_PROCESS_KEYED_STATE_FIELDS,
+    *_SCHEDULE_INPUT_PROCESS_RECORD_STATE_FIELDS,
+    "process_ids_by_project",
+}
+_MISSING = object()
+
+
+def _peek_mapping(mapping: Mapping[Any, Any], key: Any, default: Any = _MISSING) -> Any:
+    if isinstance(mapping, _StagedMapping):
+        return mapping._peek(key, default)
+    return mapping.get(key, default)
+
+
+def _requirement_ids(revisions: Iterable[ProcessRevisionRecord]) -> set[str]:
+    return {
+        requirement.requirement_id
+        for revision in revisions
+        for requirement in revision.role_requirements
+        if requirement.requirement_id is not None
+    }
+
+
+def writable_item(mapping: Mapping[Any, Any], key: Any) -> Any:
+    """Return ``mapping[key]`` for in-place edits, copying it out of a staged base."""
+    if isinstance(mapping, _StagedMapping):
+        return mapping.writable(key)
+    return mapping[key]
+
+
+def _staged_copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return copy.deepcopy(value)
+    if isinstance(value, list | set):
+        return copy.copy(value)
+    return value
+
+
+class _StagedMapping(MutableMapping):
+    """Copy-on-write overlay over a committed repository mapping.
+
+    Reads, including item access, fall through to the base mapping and return
+    its values uncopied. Mutable values (dict records and id lists) are copied
+    into the overlay the first time they are fetched with ``writable``, so
+    in-place edits must go through ``writable`` (or ``writable_item`` for code
+    that also runs against plain mappings) and never reach the base.
+    """
+
+    def __init__(self, base: Mapping[Any, Any]) -> None:
+        self._base = base
+        self._changes: dict[Any, Any] = {}
+        self._hidden: set[Any] = set()
+        self.default_factory = getattr(base, "default_factory", None)
+
+    def _peek(self, key: Any, default: Any = _MISSING) -> Any:
+        if key in self._changes:
+            return self._changes[key]
+        if key in self._hidden:
+            return default
+        return _peek_mapping(self._base, key, default)
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self._peek(key)
+        if value is not _MISSING:
+            return value
+        if self.default_factory is None:
+            raise KeyError(key)
+        value = self._changes[key] = self.default_factory()
+        return value
+
+    def writable(self, key: Any) -> Any:
+        """Return the value for ``key`` copied into the overlay for in-place edits."""
+        value = self._peek(key)
+        if value is _MISSING:
+            return self[key]
+        if key not in self._changes or value is _peek_mapping(self._base, key):
+            value = self._changes[key] = _staged_copy(value)
+        return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        if key not in self:
+            return default
+        return self[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._changes[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._changes.pop(key, None)
+        if key in self._base:
+            self._hidden.add(key)
+
+    def pop(self, key: Any, default: Any = _MISSING) -> Any:
+        if key in self._changes:
+            value = self._changes[key]
+        else:
+            value = self._peek(key)
+            if value is _MISSING:
+                if default is _MISSING:
+                    raise KeyError(key)
+                return default
+            value = _staged_copy(value)
+        del self[key]
+        return value
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key in self:
+            return self.writable(key)
+        self[key] = default
+        return default
+
+    def __contains__(self, key: object) -> bool:
+        return self._peek(key) is not _MISSING
+
+    def __iter__(self) -> Iterator[Any]:
+        for key in self._base:
+            if key not in self._hidden:
+                yield key
+        for key in list(self._changes):
+            if key not in self._base or key in self._hidden:
+                yield key
+
+    def __len__(self) -> int:
+        added = sum(
+            1
+            for key in self._changes
+            if key not in self._base or key in self._hidden
+        )
+        return len(self._base) - len(self._hidden) + added
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    def items(self) -> ItemsView:
+        return _StagedItemsView(self)
+
+    def values(self) -> ValuesView:
+        return _StagedValuesView(self)
+
+    def changed_items(self) -> Iterator[tuple[Any, Any, Any]]:
+        """Yield ``(key, staged_value, base_value)`` for overlay entries."""
+        for key in self._hidden:
+            if key not in self._changes:
+                yield key, _MISSING, _peek_mapping(self._base, key)
+        for key, value in self._changes.items():
+            base_value = (
+                _MISSING if key in self._hidden else _peek_mapping(self._base, key)
+            )
+            yield key, value, base_value
+
+    def commit(self) -> MutableMapping[Any, Any]:
+        """Return the base mapping with the overlay applied, as a new mapping.
+
+        The base is never modified, since readers may be iterating it; it is
+        returned unchanged when the overlay holds no real change. The overlay
+        is reset to a pass-through view over the returned mapping.
+        """
+        hidden = [key for key in self._hidden if key in self._base]
+        changed = [
+            (key, value)
+            for key, value in self._changes.items()
+            if key in self._hidden or not _same_value(value, _peek_mapping(self._base, key))
+        ]
+        committed = self._base
+        if hidden or changed:
+            committed = copy.copy(self._base)
+            for key in hidden:
+                del committed[key]
+            for key, value in changed:
+                committed[key] = value
+        self._base = committed
+        self._changes = {}
+        self._hidden = set()
+        return committed
+
+    def rebase(self, target: MutableMapping[Any, Any]) -> MutableMapping[Any, Any]:
+        """Return ``target`` with entries changed relative to the base applied.
+
+        Used when the base was replaced by a newer copy of the same state after
+        staging; entries only read through the overlay are left untouched.
+        ``target`` is copied before the first write and never modified.
+        """
+        rebased = target
+        for key, value, base_value in list(self.changed_items()):
+            if _same_value(value, base_value):
+                continue
+            if rebased is target:
+                rebased = copy.copy(target)
+            if value is _MISSING:
+                rebased.pop(key, None)
+            else:
+                rebased[key] = value
+        return rebased
+
+
+class _StagedItemsView(ItemsView):
+    def __iter__(self) -> Iterator[tuple[Any, Any]]:
+        for key in self._mapping:
+            yield key, self._mapping._peek(key)
+
+
+class _StagedValuesView(ValuesView):
+    def __iter__(self) -> Iterator[Any]:
+        for key in self._mapping:
+            yield self._mapping._peek(key)
+
+
+class _StagedList(MutableSequence):
+    """Copy-on-write overlay over a committed repository list."""
+
+    def __init__(self, base: MutableSequence[Any]) -> None:
+        self._base = base
+        self._origin: list[Any] = []
+        self._items: list[Any] | None = None
+
+    def _read(self) -> MutableSequence[Any]:
+        return self._base if self._items is None else self._items
+
+    def _write(self) -> list[Any]:
+        if self._items is None:
+            self._origin = list(self._base)
+            self._items = list(self._origin)
+        return self._items
+
+    def __getitem__(self, index):
+        return self._read()[index]
+
+    def __setitem__(self, index, value) -> None:
+        self._write()[index] = value
+
+    def __delitem__(self, index) -> None:
+        del self._write()[index]
+
+    def __len__(self) -> int:
+        return len(self._read())
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._read())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._read())!r})"
+
+    def insert(self, index: int, value: Any) -> None:
+        self._write().insert(index, value)
+
+    def sort(self, *, key=None, reverse: bool = False) -> None:
+        self._write().sort(key=key, reverse=reverse)
+
+    def changed_items(self) -> tuple[list[Any], list[Any]]:
+        """Return ``(added, removed)`` items compared with the base list.
+
+        The comparison is against the base as it was when the overlay was first
+        written, so items the base gained or lost since are not reported.
+        """
+        if self._items is None:
+            return [], []
+        origin_ids = {id(item) for item in self._origin}
+        staged_ids = {id(item) for item in self._items}
+        return (
+            [item for item in self._items if id(item) not in origin_ids],
+            [item for item in self._origin if id(item) not in staged_ids],
+        )
+
+    def commit(self) -> MutableSequence[Any]:
+        """Return the base list with the overlay applied, as a new list.
+
+        Like ``_StagedMapping.commit`` the base is never modified and is
+        returned unchanged when the overlay was never written.
+        """
+        if self._items is None:
+            return self._base
+        if len(self._base) == len(self._origin) and all(
+            current is original
+            for current, original in zip(self._base, self._origin, strict=True)
+        ):
+            committed = self._items
+        else:
+            committed = self.rebase(self._base)
+        self._base = committed
+        self._origin = []
+        self._items = None
+        return committed
+
+    def rebase(self, target: MutableSequence[Any]) -> MutableSequence[Any]:
+        """Return ``target`` with items added or removed relative to the base applied.
+
+        ``target`` is copied when anything changed and never modified.
+        """
+        added, removed = self.changed_items()
+        if not added and not removed:
+            return target
+        return [item for item in target if item not in removed] + added
+
+
+def _same_value(left: Any, right: Any) -> bool:
+    return left is right or left == right
+
+
+def _shifted_items(old: list[Any], new: list[Any]) -> list[Any]:
+    shifted: list[Any] = []
+    for index in range(max(len(old), len(new))):
+        old_item = old[index] if index < len(old) else _MISSING
+        new_item = new[index] if index < len(new) else _MISSING
+        if _same_value(old_item, new_item):
+            continue
+        shifted.extend(item for item in (old_item, new_item) if item is not _MISSING)
+    return shifted
+
+
+def _dirty_state_entry_keys(
+    field_name: str,
+    key: Any,
+    value: Any,
+    base_value: Any,
+) -> set[tuple[str, Any]]:
+    kind = _RECORD_STATE_KINDS.get(field_name)
+    if field_name == "processes":
+        # Retirement rows carry the owning process's project id.
+        return {(kind, key), ("retired_process", key)}
+    if kind is not None:
+        return {(kind, key)}
+    if field_name in {"process_aliases", "process_alias_sources"}:
+        old_aliases = {} if base_value is _MISSING else base_value
+        new_aliases = {} if value is _MISSING else value
+        return {
+            ("process_alias", (key, alias))
+            for alias in {*old_aliases, *new_aliases}
+            if not _same_value(
+                old_aliases.get(alias, _MISSING),
+                new_aliases.get(alias, _MISSING),
+            )
+        }
+    old_items = [] if base_value is _MISSING else list(base_value)
+    new_items = [] if value is _MISSING else list(value)
+    if field_name == "revisions_by_process":
+        return {
+            ("revision", (key, revision.revision_id))
+            for revision in _shifted_items(old_items, new_items)
+        }
+    return {
+        (_ID_LIST_STATE_KINDS[field_name], entity_id)
+        for entity_id in _shifted_items(old_items, new_items)
+    }
+
+
+def _schedule_snapshot_sort_key(snapshot: ScheduleSnapshotRecord) -> tuple[Any, ...]:
+    return (
+        snapshot.project_id,
+        snapshot.committed_at,
+        tuple(snapshot.terminal_process_symbols),
+        snapshot.snapshot_id,
+    )
+
+
+def _timeline_prefix(
+    timeline: tuple[list[dt.datetime], list[Any]] | None,
+    as_of: dt.datetime,
+) -> list[Any]:
+    """Return the items of a ``(keys, items)`` timeline whose key is at or before ``as_of``."""
+    if timeline is None:
+        return []
+    keys, items = timeline
+    return items[: bisect_right(keys, as_of)]
+
+
+def _timeline_signature(items: Sequence[Any]) -> tuple[int, int, int]:
+    """Return a cheap fingerprint of a repository list for as_of timeline caches.
+
+    Repository writers append, replace the last item or assign a new list, and
+    records are replaced rather than mutated, so the list identity, length and
+    last item identity change whenever a timeline built from it goes stale.
+    """
+    return (id(items), len(items), id(items[-1]) if items else 0)
+
+
+def _delete_keys(mapping: MutableMapping[Any, Any], keys: list[Any]) -> None:
+    for key in keys:
+        mapping.pop(key, None)
+
+
+def _stage_container(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return _StagedMapping(value)
+    if isinstance(value, MutableSequence):
+        return _StagedList(value)
+    return copy.deepcopy(value)
+
+
 def _scope_get(scope: Any, field_name: str, default: Any = None) -> Any:
     if isinstance(scope, dict):
         return scope.get(field_name, default)
@@ -599,8 +1101,13 @@ class ProjectRepository(Protocol):
         self,
         project_id: str,
         as_of: dt.datetime,
+        *,
+        reuse: Mapping[str, ProcessScheduleInput] | None = None,
     ) -> ProjectScheduleInput:
-        """Return the scheduling read model for a project."""
+        """Return the scheduling read model for a project.
+
+        Active processes found in ``reuse`` are taken from it as they are.
+        """
 
     def record_schedule_snapshot(
         self,
@@ -679,6 +1186,25 @@ class InMemoryProjectRepository:
             str,
             list[str],
         ] = defaultdict(list)
+        self._reset_as_of_timelines()
+
+    def _reset_as_of_timelines(self) -> None:
+        """Drop cached as_of timelines; they are rebuilt on the next lookup.
+
+        Revision timelines are keyed by process id and snapshot timelines by
+        ``(project_id, terminal_process_symbols)``. Each entry keeps the list it
+        was built from and its ``_timeline_signature``, so lookups rebuild it
+        only after that list changed.
+        """
+        self._revision_timelines: dict[
+            str,
+            tuple[Sequence[Any], tuple[int, int, int], list[dt.datetime], list[Any]],
+        ] = {}
+        self._snapshot_timelines: tuple[
+            Sequence[Any],
+            tuple[int, int, int],
+            dict[tuple[str, tuple[str, ...]], tuple[list[dt.datetime], list[Any]]],
+        ] | None = None
 
     def create_project(
         self,
@@ -743,16 +1269,16 @@ class InMemoryProjectRepository:
         blocker_ids = list(self.blocker_ids_by_project.get(project_id, []))
         milestone_ids = list(self.milestone_ids_by_project.get(project_id, []))
 
+        requirement_ids: set[str] = set()
         for process_id in process_ids:
             self.processes.pop(process_id, None)
             for pin_id in list(self.process_role_pin_ids_by_project.get(project_id, [])):
                 pin = self.process_role_pins.get(pin_id)
                 if pin is not None and pin.process_id == process_id:
                     self.process_role_pins.pop(pin_id, None)
-            for revision in self.revisions_by_process.pop(process_id, []):
-                for requirement in revision.role_requirements:
-                    if requirement.requirement_id is not None:
-                        self.role_requirements.pop(requirement.requirement_id, None)
+            requirement_ids.update(
+                _requirement_ids(self.revisions_by_process.pop(process_id, []))
+            )
             self.retired_processes.pop(process_id, None)
         for role_id in role_ids:
             self.roles.pop(role_id, None)
@@ -775,39 +1301,29 @@ class InMemoryProjectRepository:
         self.process_aliases.pop(project_id, None)
         self.process_alias_sources.pop(project_id, None)
         self.process_role_pin_ids_by_project.pop(project_id, None)
-        self.dependency_edge_ids = {
-            key: edge_id
-            for key, edge_id in self.dependency_edge_ids.items()
-            if key[0] != project_id
-        }
-        self.role_requirements = {
-            requirement.requirement_id: requirement
-            for revisions in self.revisions_by_process.values()
-            for revision in revisions
-            for requirement in revision.role_requirements
-            if requirement.requirement_id is not None
-        }
+        _delete_keys(
+            self.dependency_edge_ids,
+            [key for key in self.dependency_edge_ids if key[0] == project_id],
+        )
+        self._reindex_role_requirements(project_id, requirement_ids)
         self.slack_project_configs.pop(project_id, None)
         self.slack_encrypted_tokens.pop(project_id, None)
-        self.slack_resource_mappings = {
-            key: mapping
-            for key, mapping in self.slack_resource_mappings.items()
-            if key[0] != project_id
-        }
-        self.slack_collection_cursors = {
-            key: cursor
-            for key, cursor in self.slack_collection_cursors.items()
-            if key[0] != project_id
-        }
+        _delete_keys(
+            self.slack_resource_mappings,
+            [key for key in self.slack_resource_mappings if key[0] == project_id],
+        )
+        _delete_keys(
+            self.slack_collection_cursors,
+            [key for key in self.slack_collection_cursors if key[0] == project_id],
+        )
         for outbox_id in self.slack_outbox_ids_by_project.pop(project_id, []):
             self.slack_outbox.pop(outbox_id, None)
         for run_id in self.slack_run_ids_by_project.pop(project_id, []):
             self.slack_runs.pop(run_id, None)
-        self.slack_outbox_dedupe = {
-            key: outbox_id
-            for key, outbox_id in self.slack_outbox_dedupe.items()
-            if key[0] != project_id
-        }
+        _delete_keys(
+            self.slack_outbox_dedupe,
+            [key for key in self.slack_outbox_dedupe if key[0] == project_id],
+        )
         for evidence_id in self.pm_communication_evidence_ids_by_project.pop(
             project_id,
             [],
@@ -855,7 +1371,7 @@ class InMemoryProjectRepository:
             "name": name,
             "active": True,
         }
-        self.role_ids_by_project[project_id].append(resolved_role_id)
+        writable_item(self.role_ids_by_project, project_id).append(resolved_role_id)
         return resolved_role_id
 
     def rename_role(
@@ -864,7 +1380,7 @@ class InMemoryProjectRepository:
         role_id: str,
         name: str,
     ) -> str:
-        role = self._get_role(project_id, role_id)
+        self._get_role(project_id, role_id)
         for existing_id in self.role_ids_by_project[project_id]:
             existing = self.roles[existing_id]
             if (
@@ -877,7 +1393,7 @@ class InMemoryProjectRepository:
                     message="Active role names must be unique within a project.",
                     field_path="name",
                 )
-        role["name"] = name
+        writable_item(self.roles, role_id)["name"] = name
         return role_id
 
     def get_project(self, project_id: str) -> ProjectRecord:
@@ -922,7 +1438,7 @@ class InMemoryProjectRepository:
                 process_type=process_type,
             )
             self.processes[process.process_id] = process
-            self.process_ids_by_project[project_id].append(process.process_id)
+            writable_item(self.process_ids_by_project, project_id).append(process.process_id)
         elif process_id in self.processes:
             process = self._get_process(project_id, process_id)
             if process.process_type != process_type:
@@ -936,7 +1452,7 @@ class InMemoryProjectRepository:
                 process_type=process_type,
             )
             self.processes[process.process_id] = process
-            self.process_ids_by_project[project_id].append(process.process_id)
+            writable_item(self.process_ids_by_project, project_id).append(process.process_id)
 
         role_requirements = self._role_requirements_or_default(
             project_id,
@@ -972,7 +1488,7 @@ class InMemoryProjectRepository:
             assumption_note=assumption_note,
         )
         self._validate_acyclic_after_revision(project_id, revision)
-        self.revisions_by_process[process.process_id].append(revision)
+        writable_item(self.revisions_by_process, process.process_id).append(revision)
         for requirement in role_requirements:
             if requirement.requirement_id is not None:
                 self.role_requirements[requirement.requirement_id] = requirement
@@ -1109,14 +1625,14 @@ class InMemoryProjectRepository:
             self.revisions_by_process[candidate_id] = cleaned_revisions
 
         deleted_symbols: set[str] = set()
+        deleted_requirement_ids: set[str] = set()
         for candidate_id in process_ids_to_delete:
             process = self.processes.pop(candidate_id, None)
             if process is not None:
                 deleted_symbols.add(process.symbol)
-            for revision in self.revisions_by_process.pop(candidate_id, []):
-                for requirement in revision.role_requirements:
-                    if requirement.requirement_id is not None:
-                        self.role_requirements.pop(requirement.requirement_id, None)
+            deleted_requirement_ids.update(
+                _requirement_ids(self.revisions_by_process.pop(candidate_id, []))
+            )
             self.retired_processes.pop(candidate_id, None)
 
         self.process_ids_by_project[project_id] = [
@@ -1125,12 +1641,19 @@ class InMemoryProjectRepository:
             if candidate_id not in process_id_set
         ]
 
-        deleted_aliases: set[str] = set()
-        aliases = self.process_aliases.get(project_id, {})
-        alias_sources = self.process_alias_sources.get(project_id, {})
-        for alias, target_id in list(aliases.items()):
-            if target_id in process_id_set:
-                deleted_aliases.add(alias)
+        deleted_aliases = {
+            alias
+            for alias, target_id in self.process_aliases.get(project_id, {}).items()
+            if target_id in process_id_set
+        }
+        if deleted_aliases:
+            aliases = writable_item(self.process_aliases, project_id)
+            alias_sources = (
+                writable_item(self.process_alias_sources, project_id)
+                if project_id in self.process_alias_sources
+                else {}
+            )
+            for alias in deleted_aliases:
                 aliases.pop(alias, None)
                 alias_sources.pop(alias, None)
 
@@ -1142,12 +1665,15 @@ class InMemoryProjectRepository:
             if blocker_id not in blocker_id_set
         ]
 
-        self.dependency_edge_ids = {
-            key: edge_id
-            for key, edge_id in self.dependency_edge_ids.items()
-            if key[0] != project_id
-            or (key[1] not in process_id_set and key[2] not in process_id_set)
-        }
+        _delete_keys(
+            self.dependency_edge_ids,
+            [
+                key
+                for key in self.dependency_edge_ids
+                if key[0] == project_id
+                and (key[1] in process_id_set or key[2] in process_id_set)
+            ],
+        )
 
         pin_ids_to_delete = [
             pin_id
@@ -1203,13 +1729,7 @@ class InMemoryProjectRepository:
                     update={"process_symbols": process_symbols, "updated_at": edit_at}
                 )
 
-        self.role_requirements = {
-            requirement.requirement_id: requirement
-            for revisions in self.revisions_by_process.values()
-            for revision in revisions
-            for requirement in revision.role_requirements
-            if requirement.requirement_id is not None
-        }
+        self._reindex_role_requirements(project_id, deleted_requirement_ids)
 
         return {
             "process_id": process_id,
@@ -1289,7 +1809,7 @@ class InMemoryProjectRepository:
         if existing is None and pin.pin_id not in self.process_role_pin_ids_by_project[
             pin.project_id
         ]:
-            self.process_role_pin_ids_by_project[pin.project_id].append(pin.pin_id)
+            writable_item(self.process_role_pin_ids_by_project, pin.project_id).append(pin.pin_id)
         created_at = existing.created_at if existing is not None else pin.created_at
         normalized = pin.model_copy(update={"created_at": created_at})
         self.process_role_pins[normalized.pin_id] = normalized
@@ -1315,7 +1835,7 @@ class InMemoryProjectRepository:
             )
         self.process_role_pins.pop(pin_id, None)
         if pin_id in self.process_role_pin_ids_by_project.get(project_id, []):
-            self.process_role_pin_ids_by_project[project_id].remove(pin_id)
+            writable_item(self.process_role_pin_ids_by_project, project_id).remove(pin_id)
         self._sync_process_lifecycle_after_pin_delete(project_id, pin.process_id, pin)
 
     def list_process_role_pins(
@@ -1382,7 +1902,7 @@ class InMemoryProjectRepository:
                     current_project_id,
                     [],
                 ):
-                    self.process_role_pin_ids_by_project[current_project_id].remove(
+                    writable_item(self.process_role_pin_ids_by_project, current_project_id).remove(
                         pin_id,
                     )
                 self._sync_process_lifecycle_after_pin_delete(
@@ -1434,7 +1954,7 @@ class InMemoryProjectRepository:
     def upsert_milestone(self, milestone: MilestoneRecord) -> MilestoneRecord:
         self.get_project(milestone.project_id)
         if milestone.milestone_id not in self.milestones:
-            self.milestone_ids_by_project[milestone.project_id].append(
+            writable_item(self.milestone_ids_by_project, milestone.project_id).append(
                 milestone.milestone_id,
             )
         else:
@@ -1571,7 +2091,7 @@ class InMemoryProjectRepository:
             "active": active,
         }
         if resolved_calendar_id not in self.calendar_ids_by_project[project_id]:
-            self.calendar_ids_by_project[project_id].append(resolved_calendar_id)
+            writable_item(self.calendar_ids_by_project, project_id).append(resolved_calendar_id)
         return resolved_calendar_id
 
     def set_calendar_active(
@@ -1581,14 +2101,14 @@ class InMemoryProjectRepository:
         active: bool,
         force: bool = False,
     ) -> None:
-        calendar = self._get_calendar(project_id, calendar_id)
+        self._get_calendar(project_id, calendar_id)
         if not active and not force and self._calendar_in_use(project_id, calendar_id):
             raise ServiceValidationError(
                 code="calendar_in_use",
                 message="Calendar is used by active resources.",
                 entity_id=calendar_id,
             )
-        calendar["active"] = active
+        writable_item(self.calendars, calendar_id)["active"] = active
 
     def add_calendar_exception(
         self,
@@ -1630,7 +2150,7 @@ class InMemoryProjectRepository:
                     message="Overlapping calendar exceptions must have the same capacity.",
                     entity_id=calendar_id,
                 )
-        calendar["exceptions"].append(new_exception)
+        writable_item(self.calendars, calendar_id)["exceptions"].append(new_exception)
         return resolved_exception_id
 
     def remove_calendar_exception(
@@ -1640,7 +2160,7 @@ class InMemoryProjectRepository:
         exception_id: str,
     ) -> str:
         calendar = self._get_calendar(project_id, calendar_id)
-        calendar["exceptions"] = [
+        writable_item(self.calendars, calendar_id)["exceptions"] = [
             exception
             for exception in calendar["exceptions"]
             if exception["exception_id"] != exception_id
@@ -1734,7 +2254,7 @@ class InMemoryProjectRepository:
             "active": active,
         })
         if resolved_resource_id not in self.resource_ids_by_project[project_id]:
-            self.resource_ids_by_project[project_id].append(resolved_resource_id)
+            writable_item(self.resource_ids_by_project, project_id).append(resolved_resource_id)
         return resolved_resource_id
 
     def set_resource_active(
@@ -1743,8 +2263,8 @@ class InMemoryProjectRepository:
         resource_id: str,
         active: bool,
     ) -> None:
-        resource = self._get_resource(project_id, resource_id)
-        resource["active"] = active
+        self._get_resource(project_id, resource_id)
+        writable_item(self.resources, resource_id)["active"] = active
 
     def set_resource_roles(
         self,
@@ -1759,7 +2279,7 @@ class InMemoryProjectRepository:
             calendar_id=resource["calendar_id"],
             active=resource["active"],
         )
-        resource["role_ids"] = list(role_ids)
+        writable_item(self.resources, resource_id)["role_ids"] = list(role_ids)
 
     def set_resource_calendar(
         self,
@@ -1774,7 +2294,7 @@ class InMemoryProjectRepository:
             calendar_id=calendar_id,
             active=resource["active"],
         )
-        resource["calendar_id"] = calendar_id
+        writable_item(self.resources, resource_id)["calendar_id"] = calendar_id
 
     def upsert_slack_project_config(
         self,
@@ -1798,14 +2318,14 @@ class InMemoryProjectRepository:
         self,
         mapping: SlackResourceMappingRecord,
     ) -> SlackResourceMappingRecord:
-        resource = self._get_resource(mapping.project_id, mapping.resource_id)
+        self._get_resource(mapping.project_id, mapping.resource_id)
         if not mapping.active:
             mapping = mapping.model_copy(
                 update={"slack_user_id": None, "display_name": None},
             )
-            resource["resource_type"] = "external"
+            writable_item(self.resources, mapping.resource_id)["resource_type"] = "external"
         elif mapping.slack_user_id:
-            resource["resource_type"] = "internal"
+            writable_item(self.resources, mapping.resource_id)["resource_type"] = "internal"
         self.slack_resource_mappings[(mapping.project_id, mapping.resource_id)] = (
             mapping
         )
@@ -1899,7 +2419,7 @@ class InMemoryProjectRepository:
                 entity_id=run.run_id,
             )
         self.slack_runs[run.run_id] = run
-        self.slack_run_ids_by_project[run.project_id].append(run.run_id)
+        writable_item(self.slack_run_ids_by_project, run.project_id).append(run.run_id)
         return run
 
     def finish_slack_run(
@@ -2021,17 +2541,21 @@ class InMemoryProjectRepository:
         project_id: str,
         process_id: str,
         as_of: dt.datetime,
+        *,
+        pins: list[ProcessRolePinRecord] | None = None,
     ) -> dt.datetime | None:
         revision = self._latest_revision_as_of(process_id, as_of)
         if revision is None or not revision.role_requirements:
             return None
+        if pins is None:
+            pins = self.list_process_role_pins(
+                project_id,
+                as_of=as_of,
+                process_id=process_id,
+                include_done=True,
+            )
         verified_by_requirement: dict[str, dt.datetime] = {}
-        for pin in self.list_process_role_pins(
-            project_id,
-            as_of=as_of,
-            process_id=process_id,
-            include_done=True,
-        ):
+        for pin in pins:
             if (
                 pin.status != "pinned_finished"
                 or pin.verified_done_at is None
@@ -2104,7 +2628,7 @@ class InMemoryProjectRepository:
                 pm_evidence_claims=message.pm_evidence_claims,
             )
             self.slack_outbox[outbox_id] = record
-            self.slack_outbox_ids_by_project[project_id].append(outbox_id)
+            writable_item(self.slack_outbox_ids_by_project, project_id).append(outbox_id)
             self.slack_outbox_dedupe[dedupe_key] = outbox_id
             created_ids.append(outbox_id)
         return {
@@ -2246,9 +2770,10 @@ class InMemoryProjectRepository:
             and evidence.evidence_id
             not in self.pm_communication_evidence_ids_by_project[evidence.project_id]
         ):
-            self.pm_communication_evidence_ids_by_project[evidence.project_id].append(
-                evidence.evidence_id,
-            )
+            writable_item(
+                self.pm_communication_evidence_ids_by_project,
+                evidence.project_id,
+            ).append(evidence.evidence_id)
         self.pm_communication_evidence[evidence.evidence_id] = evidence
         return evidence
 
@@ -2290,7 +2815,7 @@ class InMemoryProjectRepository:
             record.evidence_line_id
             not in self.process_evidence_line_item_ids_by_project[record.project_id]
         ):
-            self.process_evidence_line_item_ids_by_project[record.project_id].append(
+            writable_item(self.process_evidence_line_item_ids_by_project, record.project_id).append(
                 record.evidence_line_id,
             )
         self.process_evidence_line_items[record.evidence_line_id] = record
@@ -2326,9 +2851,20 @@ class InMemoryProjectRepository:
         self,
         *,
         line_items: set[str] | frozenset[str],
+        project_id: str | None = None,
     ) -> dict[str, Any]:
+        if project_id is None:
+            rows = list(self.process_evidence_line_items.items())
+        else:
+            rows = [
+                (evidence_line_id, self.process_evidence_line_items[evidence_line_id])
+                for evidence_line_id in list(
+                    self.process_evidence_line_item_ids_by_project.get(project_id, [])
+                )
+                if evidence_line_id in self.process_evidence_line_items
+            ]
         deleted_ids = []
-        for evidence_line_id, row in list(self.process_evidence_line_items.items()):
+        for evidence_line_id, row in rows:
             if row.line_item not in line_items:
                 continue
             deleted_ids.append(evidence_line_id)
@@ -2358,9 +2894,10 @@ class InMemoryProjectRepository:
             record.evidence_line_id
             not in self.resource_evidence_line_item_ids_by_project[record.project_id]
         ):
-            self.resource_evidence_line_item_ids_by_project[record.project_id].append(
-                record.evidence_line_id,
-            )
+            writable_item(
+                self.resource_evidence_line_item_ids_by_project,
+                record.project_id,
+            ).append(record.evidence_line_id)
         self.resource_evidence_line_items[record.evidence_line_id] = record
         return record
 
@@ -2393,14 +2930,14 @@ class InMemoryProjectRepository:
         role_id: str,
         force: bool = False,
     ) -> None:
-        role = self._get_role(project_id, role_id)
+        self._get_role(project_id, role_id)
         if not force and self._role_in_use(project_id, role_id):
             raise ServiceValidationError(
                 code="role_in_use",
                 message="Role is used by active resources or current revisions.",
                 entity_id=role_id,
             )
-        role["active"] = False
+        writable_item(self.roles, role_id)["active"] = False
 
     def add_blocker(
         self,
@@ -2454,7 +2991,7 @@ class InMemoryProjectRepository:
         )
         self.blockers[blocker.blocker_id] = blocker
         if blocker.blocker_id not in self.blocker_ids_by_project[project_id]:
-            self.blocker_ids_by_project[project_id].append(blocker.blocker_id)
+            writable_item(self.blocker_ids_by_project, project_id).append(blocker.blocker_id)
         return blocker
 
     def resolve_blocker(
@@ -2579,32 +3116,43 @@ class InMemoryProjectRepository:
         self,
         project_id: str,
         as_of: dt.datetime,
+        *,
+        reuse: Mapping[str, ProcessScheduleInput] | None = None,
     ) -> ProjectScheduleInput:
         project = self.get_project(project_id)
         processes = []
-        blockers_as_of = self.list_blockers_as_of(project_id, as_of)
+        blocking_counts: Counter[str] | None = None
+        pin_timelines: dict[str, tuple[list[dt.datetime], list[ProcessRolePinRecord]]] | None = None
         for process_id in self.process_ids_by_project[project_id]:
             if not self._is_process_active_as_of(process_id, as_of):
                 continue
+            if reuse is not None and process_id in reuse:
+                processes.append(reuse[process_id])
+                continue
             process = self.processes[process_id]
             revision = self._latest_revision_as_of(process_id, as_of)
             if revision is None:
                 continue
-            unresolved_blockers = [
-                blocker
-                for blocker in blockers_as_of
-                if blocker.process_id == process_id
-                and self._enum_value(blocker.severity) == "blocking"
-            ]
+            if blocking_counts is None:
+                blocking_counts = Counter(
+                    blocker.process_id
+                    for blocker in self.list_blockers_as_of(project_id, as_of)
+                    if self._enum_value(blocker.severity) == "blocking"
+                )
+            if pin_timelines is None:
+                pin_timelines = self._process_pin_timelines(project_id)
+            pins = _timeline_prefix(pin_timelines.get(process_id), as_of)
             pinned_started_at = self._process_pin_started_at(
                 project_id,
                 process_id,
                 as_of,
+                pins=pins,
             )
             pinned_finished_at = self._process_pin_finished_at_as_of(
                 project_id,
                 process_id,
                 as_of,
+                pins=pins,
             )
             processes.append(
                 ProcessScheduleInput(
@@ -2628,7 +3176,7 @@ class InMemoryProjectRepository:
                     delay_after_dependencies_business_days=(
                         revision.delay_after_dependencies_business_days
                     ),
-                    unresolved_blocker_count=len(unresolved_blockers),
+                    unresolved_blocker_count=blocking_counts[process_id],
                 )
             )
 
@@ -2700,14 +3248,7 @@ class InMemoryProjectRepository:
             if existing.snapshot_id == snapshot.snapshot_id:
                 return existing
         self.schedule_snapshots.append(snapshot)
-        self.schedule_snapshots.sort(
-            key=lambda item: (
-                item.project_id,
-                item.committed_at,
-                tuple(item.terminal_process_symbols),
-                item.snapshot_id,
-            )
-        )
+        self.schedule_snapshots.sort(key=_schedule_snapshot_sort_key)
         return snapshot
 
     def schedule_snapshots_as_of(
@@ -2718,16 +3259,31 @@ class InMemoryProjectRepository:
     ) -> list[ScheduleSnapshotRecord]:
         self.get_project(project_id)
         terminal_filter = tuple(sorted(terminal_process_symbols or []))
-        rows = []
-        for snapshot in self.schedule_snapshots:
-            if snapshot.project_id != project_id:
-                continue
-            if snapshot.committed_at > as_of:
-                continue
-            if tuple(snapshot.terminal_process_symbols) != terminal_filter:
-                continue
-            rows.append(snapshot)
-        return rows
+        timelines = self._schedule_snapshot_timelines()
+        return _timeline_prefix(timelines.get((project_id, terminal_filter)), as_of)
+
+    def _schedule_snapshot_timelines(
+        self,
+    ) -> dict[tuple[str, tuple[str, ...]], tuple[list[dt.datetime], list[ScheduleSnapshotRecord]]]:
+        """Return snapshots grouped by project and terminal filter, keyed by ``committed_at``."""
+        snapshots = self.schedule_snapshots
+        signature = _timeline_signature(snapshots)
+        cached = self._snapshot_timelines
+        if cached is not None and cached[0] is snapshots and cached[1] == signature:
+            return cached[2]
+        grouped: dict[tuple[str, tuple[str, ...]], list[ScheduleSnapshotRecord]] = defaultdict(
+            list
+        )
+        for snapshot in sorted(snapshots, key=_schedule_snapshot_sort_key):
+            grouped[(snapshot.project_id, tuple(snapshot.terminal_process_symbols))].append(
+                snapshot
+            )
+        timelines = {
+            key: ([snapshot.committed_at for snapshot in rows], rows)
+            for key, rows in grouped.items()
+        }
+        self._snapshot_timelines = (snapshots, signature, timelines)
+        return timelines
 
     def process_ids_for_scope(
         self,
@@ -2970,7 +3526,7 @@ class InMemoryProjectRepository:
             revision = self.revisions_by_process[child_id][-1].model_copy(
                 update={"dependencies": list(dict.fromkeys(deps))}
             )
-            self.revisions_by_process[child_id][-1] = revision
+            writable_item(self.revisions_by_process, child_id)[-1] = revision
             for predecessor_id in deps:
                 edge_id = self._dependency_edge_id(
                     project_id,
@@ -2986,7 +3542,7 @@ class InMemoryProjectRepository:
                 dep for dep in revision.dependencies if dep not in selected_process_ids
             ]
             dependencies_for_successor.extend(child_ids[symbol] for symbol in leaf_symbols)
-            self.revisions_by_process[successor_id].append(
+            writable_item(self.revisions_by_process, successor_id).append(
                 revision.model_copy(
                     update={
                         "revision_id": new_id(),
@@ -3028,18 +3584,18 @@ class InMemoryProjectRepository:
             alias_process_id = child_ids[target_symbol]
             for process_id in ordered_process_ids:
                 retired_process = self.processes[process_id]
-                self.process_aliases[project_id][retired_process.symbol] = (
+                writable_item(self.process_aliases, project_id)[retired_process.symbol] = (
                     alias_process_id
                 )
-                self.process_alias_sources[project_id][retired_process.symbol] = (
+                writable_item(self.process_alias_sources, project_id)[retired_process.symbol] = (
                     "retirement"
                 )
                 for alias, target_id in list(self.process_aliases[project_id].items()):
                     if target_id == process_id and (
                         self.process_alias_sources[project_id].get(alias) == "rename"
                     ):
-                        self.process_aliases[project_id][alias] = alias_process_id
-                        self.process_alias_sources[project_id][alias] = "retirement"
+                        writable_item(self.process_aliases, project_id)[alias] = alias_process_id
+                        writable_item(self.process_alias_sources, project_id)[alias] = "retirement"
         blocker_cleanup = self.delete_orphaned_blocker_processes(
             project_id=project_id,
             edit_at=edit_at,
@@ -3215,7 +3771,7 @@ class InMemoryProjectRepository:
                 dep for dep in revision.dependencies if dep not in selected_process_ids
             ]
             dependencies.append(replacement.process_id)
-            self.revisions_by_process[successor_id].append(
+            writable_item(self.revisions_by_process, successor_id).append(
                 revision.model_copy(
                     update={
                         "revision_id": new_id(),
@@ -3313,56 +3869,181 @@ class InMemoryProjectRepository:
         )
 
     def clone(self) -> InMemoryProjectRepository:
-        return copy.deepcopy(self)
+        """Return a copy-on-write staged repository over this state.
+
+        The staged repository shares committed records with this repository and
+        copies only the containers entries it touches, so staging cost scales
+        with the size of the change instead of the size of the store.
+        """
+        staged = copy.copy(self)
+        for field_name in REPOSITORY_STATE_FIELDS:
+            setattr(staged, field_name, _stage_container(getattr(self, field_name)))
+        staged._staged_base = self
+        staged._reset_as_of_timelines()
+        return staged
 
     def replace_with(self, other: ProjectRepository) -> None:
         if not isinstance(other, InMemoryProjectRepository):
             raise TypeError("InMemoryProjectRepository can only replace with the same type")
-        other._validate_process_role_definition_invariants()
-        other._validate_no_orphaned_blocker_processes()
-        self.projects = other.projects
-        self.processes = other.processes
-        self.process_ids_by_project = other.process_ids_by_project
-        self.revisions_by_process = other.revisions_by_process
-        self.blockers = other.blockers
-        self.blocker_ids_by_project = other.blocker_ids_by_project
-        self.process_role_pins = other.process_role_pins
-        self.process_role_pin_ids_by_project = other.process_role_pin_ids_by_project
-        self.roles = other.roles
-        self.role_ids_by_project = other.role_ids_by_project
-        self.role_requirements = other.role_requirements
-        self.resources = other.resources
-        self.resource_ids_by_project = other.resource_ids_by_project
-        self.calendars = other.calendars
-        self.calendar_ids_by_project = other.calendar_ids_by_project
-        self.retired_processes = other.retired_processes
-        self.process_aliases = other.process_aliases
-        self.process_alias_sources = other.process_alias_sources
-        self.dependency_edge_ids = other.dependency_edge_ids
-        self.schedule_snapshots = other.schedule_snapshots
-        self.milestones = other.milestones
-        self.milestone_ids_by_project = other.milestone_ids_by_project
-        self.slack_project_configs = other.slack_project_configs
-        self.slack_resource_mappings = other.slack_resource_mappings
-        self.slack_collection_cursors = other.slack_collection_cursors
-        self.slack_encrypted_tokens = other.slack_encrypted_tokens
-        self.slack_runs = other.slack_runs
-        self.slack_run_ids_by_project = other.slack_run_ids_by_project
-        self.slack_outbox = other.slack_outbox
-        self.slack_outbox_ids_by_project = other.slack_outbox_ids_by_project
-        self.slack_outbox_dedupe = other.slack_outbox_dedupe
-        self.pm_communication_evidence = other.pm_communication_evidence
-        self.pm_communication_evidence_ids_by_project = (
-            other.pm_communication_evidence_ids_by_project
-        )
-        self.process_evidence_line_items = other.process_evidence_line_items
-        self.process_evidence_line_item_ids_by_project = (
-            other.process_evidence_line_item_ids_by_project
-        )
-        self.resource_evidence_line_items = other.resource_evidence_line_items
-        self.resource_evidence_line_item_ids_by_project = (
-            other.resource_evidence_line_item_ids_by_project
-        )
+        project_ids = other._staged_project_ids()
+        other._validate_process_role_definition_invariants(project_ids)
+        other._validate_no_orphaned_blocker_processes(project_ids)
+        staged_over_self = getattr(other, "_staged_base", None) is self
+        for field_name in REPOSITORY_STATE_FIELDS:
+            current = getattr(self, field_name)
+            value = getattr(other, field_name)
+            if staged_over_self and isinstance(value, _StagedMapping | _StagedList):
+                # The container may have been republished since staging, for
+                # example by lazy loading; the overlay's changes then go on top.
+                value = value.commit() if value._base is current else value.rebase(current)
+            self._publish_container(field_name, current, value)
+
+    def rebase_staged(self, other: InMemoryProjectRepository) -> None:
+        """Apply a staged repository's changes onto this state.
+
+        ``other`` must be a copy-on-write stage over an earlier copy of this
+        state whose touched entries have not changed since; only those entries
+        are written, so concurrent changes to other projects are preserved.
+        """
+        if other.dirty_entity_keys() is None:
+            raise TypeError("rebase_staged requires a copy-on-write staged repository")
+        for field_name in REPOSITORY_STATE_FIELDS:
+            current = getattr(self, field_name)
+            self._publish_container(
+                field_name,
+                current,
+                getattr(other, field_name).rebase(current),
+            )
+
+    def _publish_container(self, field_name: str, current: Any, value: Any) -> None:
+        """Swap a committed state container in place of ``current``.
+
+        Queries do not take the command lock, so committed containers are
+        never modified in place: a reader walking ``current`` keeps seeing it
+        whole while later readers get ``value``.
+        """
+        if value is current:
+            return
+        if field_name == "schedule_snapshots":
+            value = sorted(value, key=_schedule_snapshot_sort_key)
+        setattr(self, field_name, value)
+
+    def dirty_entity_keys(self) -> set[tuple[str, Any]] | None:
+        """Return ``(kind, key)`` pairs for entities changed by this staged repository.
+
+        Keys are natural repository keys: ids for record kinds, tuples for
+        composite kinds such as dependency edges and process aliases, and
+        ``(process_id, revision_id)`` for revisions. Entities whose position in a
+        per-project id list or revision history moved are dirty as well. Returns
+        None when the repository is not a copy-on-write stage or a state
+        container was replaced wholesale, so callers must diff the full state.
+        """
+        if getattr(self, "_staged_base", None) is None:
+            return None
+        dirty: set[tuple[str, Any]] = set()
+        for field_name in REPOSITORY_STATE_FIELDS:
+            container = getattr(self, field_name)
+            if not isinstance(container, _StagedMapping | _StagedList):
+                return None
+            if field_name == "schedule_snapshots":
+                added, removed = container.changed_items()
+                dirty.update(
+                    ("schedule_snapshot", snapshot.snapshot_id)
+                    for snapshot in [*added, *removed]
+                )
+                continue
+            for key, value, base_value in container.changed_items():
+                if _same_value(value, base_value):
+                    continue
+                dirty.update(_dirty_state_entry_keys(field_name, key, value, base_value))
+        return dirty
+
+    def _staged_project_ids(self) -> set[str] | None:
+        """Return project ids touched by a staged repository, or None if unknown."""
+        base = getattr(self, "_staged_base", None)
+        if base is None:
+            return None
+        project_ids: set[str] = set()
+        for field_name in REPOSITORY_STATE_FIELDS:
+            container = getattr(self, field_name)
+            if not isinstance(container, _StagedMapping | _StagedList):
+                return None
+            if field_name == "schedule_snapshots":
+                added, removed = container.changed_items()
+                project_ids.update(snapshot.project_id for snapshot in [*added, *removed])
+                continue
+            for key, value, base_value in container.changed_items():
+                if _same_value(value, base_value):
+                    continue
+                project_ids.update(
+                    self._state_entry_project_ids(field_name, key, value, base_value)
+                )
+        return project_ids
+
+    def _staged_process_ids(self) -> set[str] | None:
+        """Return process ids whose schedule inputs a stage may have changed.
+
+        Covers the process, its revisions, retirement, blockers and role pins;
+        dependents are not included. Returns None if unknown.
+        """
+        if getattr(self, "_staged_base", None) is None:
+            return None
+        process_ids: set[str] = set()
+        for field_name in REPOSITORY_STATE_FIELDS:
+            if field_name in _SCHEDULE_INPUT_INDEPENDENT_STATE_FIELDS:
+                continue
+            container = getattr(self, field_name)
+            if not isinstance(container, _StagedMapping | _StagedList):
+                return None
+            for key, value, base_value in container.changed_items():
+                if _same_value(value, base_value):
+                    continue
+                if field_name in _SCHEDULE_INPUT_PROCESS_KEYED_STATE_FIELDS:
+                    process_ids.add(key)
+                elif field_name in _SCHEDULE_INPUT_PROCESS_RECORD_STATE_FIELDS:
+                    process_ids.update(
+                        record.process_id
+                        for record in (value, base_value)
+                        if record is not _MISSING
+                    )
+                else:
+                    process_ids.update(
+                        _shifted_items(
+                            [] if base_value is _MISSING else list(base_value),
+                            [] if value is _MISSING else list(value),
+                        )
+                    )
+        return process_ids
+
+    def _state_entry_project_ids(
+        self,
+        field_name: str,
+        key: Any,
+        value: Any,
+        base_value: Any,
+    ) -> set[str]:
+        if field_name in _PROJECT_KEYED_STATE_FIELDS:
+            return {key}
+        if field_name in _PROJECT_TUPLE_KEYED_STATE_FIELDS:
+            return {key[0]}
+        if field_name == "role_requirements":
+            return set()
+        if field_name in {"revisions_by_process", "retired_processes"}:
+            project_ids: set[str] = set()
+            if field_name == "revisions_by_process":
+                for revisions in (value, base_value):
+                    if revisions is not _MISSING:
+                        project_ids.update(revision.project_id for revision in revisions)
+            for processes in (self.processes, self._staged_base.processes):
+                process = _peek_mapping(processes, key, None)
+                if process is not None:
+                    project_ids.add(process.project_id)
+            return project_ids
+        return {
+            str(_scope_get(record, "project_id"))
+            for record in (value, base_value)
+            if record is not _MISSING and _scope_get(record, "project_id") is not None
+        }
 
     def ensure_default_process_roles_for_missing_requirements(
         self,
@@ -3377,6 +4058,7 @@ class InMemoryProjectRepository:
         selected_role_ids: dict[str, str] = {}
         for current_project_id in project_ids:
             self.get_project(current_project_id)
+            requirement_ids: set[str] = set()
             for process_id in list(self.process_ids_by_project.get(current_project_id, [])):
                 revisions = list(self.revisions_by_process.get(process_id, []))
                 if not revisions:
@@ -3406,10 +4088,10 @@ class InMemoryProjectRepository:
                 if changed:
                     self.revisions_by_process[process_id] = repaired_revisions
                     updated_process_ids.append(process_id)
+                    requirement_ids.update(_requirement_ids(repaired_revisions))
                     if role_id is not None:
                         selected_role_ids[process_id] = role_id
-        if updated_process_ids:
-            self._rebuild_role_requirement_index()
+            self._reindex_role_requirements(current_project_id, requirement_ids)
         return {
             "updated_process_ids": updated_process_ids,
             "updated_process_count": len(updated_process_ids),
@@ -3430,6 +4112,7 @@ class InMemoryProjectRepository:
         selected_role_ids: dict[str, str] = {}
         for current_project_id in project_ids:
             self.get_project(current_project_id)
+            requirement_ids: set[str] = set()
             for process_id in list(self.process_ids_by_project.get(current_project_id, [])):
                 revisions = list(self.revisions_by_process.get(process_id, []))
                 if not revisions:
@@ -3459,8 +4142,9 @@ class InMemoryProjectRepository:
                     continue
                 self.revisions_by_process[process_id] = repaired_revisions
                 updated_process_ids.append(process_id)
-        if updated_process_ids:
-            self._rebuild_role_requirement_index()
+                requirement_ids.update(_requirement_ids(revisions))
+                requirement_ids.update(_requirement_ids(repaired_revisions))
+            self._reindex_role_requirements(current_project_id, requirement_ids)
         return {
             "updated_process_ids": updated_process_ids,
             "updated_process_count": len(updated_process_ids),
@@ -3795,7 +4479,7 @@ class InMemoryProjectRepository:
                 "local_date": bucket.local_date,
                 "local_week": bucket.local_week,
             }
-            for bucket in expand_resource_calendar(
+            for bucket in CALENDAR_EXPANSION_CACHE.expand(
                 calendar=calendar,
                 resource=resource,
                 horizon_starts_at=starts_at,
@@ -4025,8 +4709,8 @@ class InMemoryProjectRepository:
             alias,
             owning_process_id=process_id,
         )
-        self.process_aliases[project_id][alias] = process_id
-        self.process_alias_sources[project_id][alias] = source
+        writable_item(self.process_aliases, project_id)[alias] = process_id
+        writable_item(self.process_alias_sources, project_id)[alias] = source
 
     def _validate_active_role_requirements(
         self,
@@ -4073,7 +4757,7 @@ class InMemoryProjectRepository:
         )
         role = self.roles.get(role_id)
         if role is not None:
-            role["active"] = True
+            writable_item(self.roles, role_id)["active"] = True
         else:
             self.roles[role_id] = {
                 "role_id": role_id,
@@ -4082,7 +4766,7 @@ class InMemoryProjectRepository:
                 "active": True,
             }
             if role_id not in self.role_ids_by_project[project_id]:
-                self.role_ids_by_project[project_id].append(role_id)
+                writable_item(self.role_ids_by_project, project_id).append(role_id)
         self._ensure_default_missing_process_resource(
             project_id,
             project.start_at,
@@ -4232,7 +4916,7 @@ class InMemoryProjectRepository:
         role_id = self._project_scoped_role_id(project_id, f"role_{resource_id}")
         existing = self.roles.get(role_id)
         if existing is not None:
-            existing["active"] = True
+            writable_item(self.roles, role_id)["active"] = True
         else:
             self.roles[role_id] = {
                 "role_id": role_id,
@@ -4240,10 +4924,10 @@ class InMemoryProjectRepository:
                 "name": f"Exact assignment: {resource.get('name') or resource_id}",
                 "active": True,
             }
-            self.role_ids_by_project[project_id].append(role_id)
+            writable_item(self.role_ids_by_project, project_id).append(role_id)
         role_ids = list(resource.get("role_ids", []) or [])
         if role_id not in role_ids:
-            resource["role_ids"] = [*role_ids, role_id]
+            writable_item(self.resources, resource_id)["role_ids"] = [*role_ids, role_id]
         return role_id
 
     def _project_scoped_role_id(self, project_id: str, base_role_id: str) -> str:
@@ -4282,17 +4966,34 @@ class InMemoryProjectRepository:
                 }
             )
 
-    def _rebuild_role_requirement_index(self) -> None:
-        self.role_requirements = {
-            requirement.requirement_id: requirement
-            for revisions in self.revisions_by_process.values()
-            for revision in revisions
-            for requirement in revision.role_requirements
-            if requirement.requirement_id is not None
-        }
+    def _reindex_role_requirements(self, project_id: str, requirement_ids: set[str]) -> None:
+        """Point ``requirement_ids`` at the project's latest matching requirements.
 
-    def _validate_process_role_definition_invariants(self) -> None:
-        for project_id in sorted(self.projects):
+        Only the given ids are touched and only the project's revisions are
+        read; ids the project no longer uses are dropped from the index.
+        """
+        if not requirement_ids:
+            return
+        requirements: dict[str, RoleRequirementCommand] = {}
+        for process_id in self.process_ids_by_project.get(project_id, []):
+            for revision in self.revisions_by_process.get(process_id, []):
+                for requirement in revision.role_requirements:
+                    if requirement.requirement_id in requirement_ids:
+                        requirements[requirement.requirement_id] = requirement
+        for requirement_id in requirement_ids:
+            requirement = requirements.get(requirement_id)
+            if requirement is None:
+                self.role_requirements.pop(requirement_id, None)
+            elif self.role_requirements.get(requirement_id) is not requirement:
+                self.role_requirements[requirement_id] = requirement
+
+    def _validate_process_role_definition_invariants(
+        self,
+        project_ids: set[str] | None = None,
+    ) -> None:
+        for project_id in sorted(self.projects if project_ids is None else project_ids):
+            if project_id not in self.projects:
+                continue
             for process_id in self.process_ids_by_project.get(project_id, []):
                 for revision in self.revisions_by_process.get(process_id, []):
                     if not revision.role_requirements:
@@ -4319,9 +5020,14 @@ class InMemoryProjectRepository:
                                 details={"revision_id": revision.revision_id},
                             )
 
-    def _validate_no_orphaned_blocker_processes(self) -> None:
+    def _validate_no_orphaned_blocker_processes(
+        self,
+        project_ids: set[str] | None = None,
+    ) -> None:
         as_of = dt.datetime.max.replace(tzinfo=dt.UTC)
-        for project_id in sorted(self.projects):
+        for project_id in sorted(self.projects if project_ids is None else project_ids):
+            if project_id not in self.projects:
+                continue
             orphaned = self._orphaned_blocker_process_ids(project_id, as_of)
             if orphaned:
                 raise ServiceValidationError(
@@ -4514,19 +5220,34 @@ class InMemoryProjectRepository:
         project_id: str,
         process_id: str,
         as_of: dt.datetime,
+        *,
+        pins: list[ProcessRolePinRecord] | None = None,
     ) -> dt.datetime | None:
-        return min(
-            (
-                pin.pinned_at
-                for pin in self.list_process_role_pins(
-                    project_id,
-                    as_of=as_of,
-                    process_id=process_id,
-                    include_done=True,
-                )
-            ),
-            default=None,
-        )
+        if pins is None:
+            pins = self.list_process_role_pins(
+                project_id,
+                as_of=as_of,
+                process_id=process_id,
+                include_done=True,
+            )
+        return min((pin.pinned_at for pin in pins), default=None)
+
+    def _process_pin_timelines(
+        self,
+        project_id: str,
+    ) -> dict[str, tuple[list[dt.datetime], list[ProcessRolePinRecord]]]:
+        """Return each process's pins in ``list_process_role_pins`` order.
+
+        Pins are edited in place by id, so these timelines are not cached on
+        the repository; callers build them once per pass over a project.
+        """
+        pins_by_process: dict[str, list[ProcessRolePinRecord]] = defaultdict(list)
+        for pin in self.list_process_role_pins(project_id):
+            pins_by_process[pin.process_id].append(pin)
+        return {
+            process_id: ([pin.pinned_at for pin in pins], pins)
+            for process_id, pins in pins_by_process.items()
+        }
 
     def _validate_process_role_pins_done_for_done(
         self,
@@ -4778,13 +5499,28 @@ class InMemoryProjectRepository:
         process_id: str,
         as_of: dt.datetime,
     ) -> ProcessRevisionRecord | None:
-        latest = None
-        for revision in self.revisions_by_process[process_id]:
-            if revision.effective_at > as_of:
-                continue
-            if latest is None or revision.effective_at >= latest.effective_at:
-                latest = revision
-        return latest
+        effective_ats, revisions = self._revision_timeline(process_id)
+        index = bisect_right(effective_ats, as_of)
+        return revisions[index - 1] if index else None
+
+    def _revision_timeline(
+        self,
+        process_id: str,
+    ) -> tuple[list[dt.datetime], list[ProcessRevisionRecord]]:
+        """Return a process's revisions stably sorted by ``effective_at``.
+
+        Revisions sharing an ``effective_at`` keep their history order, so the
+        last one recorded wins an as_of lookup.
+        """
+        revisions = self.revisions_by_process[process_id]
+        signature = _timeline_signature(revisions)
+        cached = self._revision_timelines.get(process_id)
+        if cached is not None and cached[0] is revisions and cached[1] == signature:
+            return cached[2], cached[3]
+        ordered = sorted(revisions, key=lambda revision: revision.effective_at)
+        effective_ats = [revision.effective_at for revision in ordered]
+        self._revision_timelines[process_id] = (revisions, signature, effective_ats, ordered)
+        return effective_ats, ordered
 
     def _unique_symbol(self, project_id: str, base_symbol: str) -> str:
         existing = {
@@ -4812,7 +5548,7 @@ class InMemoryProjectRepository:
     ) -> None:
         for resource_id in self.resource_ids_by_project.get(project_id, []):
             if resource_id in self.resources:
-                self.resources[resource_id]["cost_currency"] = default_currency
+                writable_item(self.resources, resource_id)["cost_currency"] = default_currency
 
     def _symbol_from_name(self, name: str) -> str:
         slug = "".join(
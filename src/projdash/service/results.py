@@ -142,6 +142,20 @@ class CommandErrorResult(BaseModel):
     warnings: list[Warning] = Field(default_factory=list)
 
 
+class SpanTiming(StrictModel):
+    """Inclusive wall time of one named query phase."""
+
+    count: int = Field(ge=0)
+    seconds: NonNegativeFloat
+
+
+class QueryTimings(StrictModel):
+    """Per-phase timing breakdown returned when a query envelope asks for it."""
+
+    total_seconds: NonNegativeFloat
+    spans: dict[str, SpanTiming] = Field(default_factory=dict)
+
+
 class QueryResult(BaseModel):
     """Structured successful query result."""
 
@@ -151,6 +165,7 @@ class QueryResult(BaseModel):
     ok: Literal[True] = True
     data: dict[str, Any] = Field(default_factory=dict)
     warnings: list[Warning] = Field(default_factory=list)
+    timings: QueryTimings | None = Field(default=None, exclude_if=lambda value: value is None)
 
 
 class QueryErrorResult(BaseModel):
@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
-import copy
 import datetime as dt
 import hashlib
 import inspect
 import json
 import threading
+import time
 from collections import defaultdict
-from collections.abc import Callable, Mapping
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from dataclasses import replace
 from decimal import ROUND_HALF_UP, Decimal
 from typing import Any
@@ -17,12 +19,15 @@ from zoneinfo import ZoneInfo
 
 import networkx as nx
 
+from projdash.engine.profiling import SpanRecorder, recording, span, timed
 from projdash.engine.resource_schedule import compute_resource_schedule
 from projdash.engine.schedule import (
+    ProcessScheduleInput,
     ProjectScheduleInput,
     ScheduleProjection,
     compute_schedule,
 )
+from projdash.service.cache import ProjectionCache, ProjectionFlight, freeze, thaw
 from projdash.service.commands import (
     AddBlocker,
     AddCalendarException,
@@ -110,6 +115,12 @@ from projdash.service.models import (
     SlackRunRecord,
     WarningSeverity,
 )
+from projdash.service.profiling import (
+    QueryProfile,
+    QueryProfileSink,
+    start_code_profile,
+    stop_code_profile,
+)
 from projdash.service.queries import (
     GetProject,
     QueryAgentContext,
@@ -137,9 +148,11 @@ from projdash.service.queries import (
     QuerySlackRuns,
     QueryUtilization,
 )
+from projdash.service.replay import CommandReplayCache
 from projdash.service.repository import (
     LEGACY_PROCESS_EVIDENCE_LINE_ITEMS,
     ProjectRepository,
+    writable_item,
 )
 from projdash.service.results import (
     BatchOperationResult,
@@ -149,6 +162,7 @@ from projdash.service.results import (
     MatchedIds,
     QueryErrorResult,
     QueryResult,
+    QueryTimings,
     Warning,
 )
 
@@ -168,6 +182,41 @@ DEFAULT_RESOURCE_EVIDENCE_LINE_ITEMS = (
     RESOURCE_COMPLETE_PLANNING_COMMUNICATION,
     RESOURCE_SLIPPAGE_RISK,
 )
+_EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.UTC)
+# Queries answered from projection caches keyed by ``now``; only these have
+# ``now`` floored to ``cache_now_granularity``.
+_NOW_QUANTIZED_QUERY_TYPES = (
+    QueryAgentContext,
+    QueryCosts,
+    QueryCriticalPath,
+    QueryPMCommunicationProtocol,
+    QueryPMMarkdownContext,
+    QueryProcessGraph,
+    QueryResourceSchedule,
+    QuerySchedule,
+    QueryUtilization,
+)
+# Repository record mappings and the per-project id index naming their ids.
+_PROJECT_RECORD_ID_INDEXES = {
+    "roles": "role_ids_by_project",
+    "resources": "resource_ids_by_project",
+    "calendars": "calendar_ids_by_project",
+}
+# Entity kinds no cached projection reads; commits touching only these keep
+# every projection cache.
+PROJECTION_INDEPENDENT_ENTITY_KINDS = frozenset(
+    {
+        "pm_communication_evidence",
+        "schedule_snapshot",
+        "slack_collection_cursor",
+        "slack_encrypted_token",
+        "slack_outbox",
+        "slack_outbox_dedupe",
+        "slack_project_config",
+        "slack_resource_mapping",
+        "slack_run",
+    }
+)
 
 
 class ProjectService:
@@ -182,32 +231,41 @@ class ProjectService:
         ),
         resource_scheduler=None,
         now_provider: Callable[[], dt.datetime] | None = None,
+        command_replay_cache: CommandReplayCache | None = None,
+        projection_cache_factory: Callable[[], ProjectionCache] | None = None,
+        cache_now_granularity: dt.timedelta | None = None,
+        query_profile_sinks: Iterable[QueryProfileSink] = (),
     ) -> None:
         self._repository = repository
         self._config = ServiceConfig(
             required_roles_transition_mode=required_roles_transition_mode,
+            cache_now_granularity=cache_now_granularity,
         )
         self._resource_scheduler = resource_scheduler
         self._now_provider = now_provider or (lambda: dt.datetime.now(dt.UTC))
         self._command_lock = threading.RLock()
-        self._command_replay_cache: dict[
-            object,
-            dict[str, CommandResult | CommandErrorResult],
-        ] = self._load_command_replay_cache()
+        self._command_replay_cache = (
+            command_replay_cache
+            if command_replay_cache is not None
+            else CommandReplayCache(repository)
+        )
+        self._projection_cache_factory = projection_cache_factory or ProjectionCache
         self._projection_cache_lock = threading.RLock()
-        self._schedule_input_cache: dict[tuple[object, ...], ProjectScheduleInput] = {}
-        self._schedule_projection_cache: dict[
-            tuple[object, ...],
-            ScheduleProjection,
-        ] = {}
-        self._dependency_graph_cache: dict[
-            tuple[object, ...],
-            dict[str, list[dict[str, object]]],
-        ] = {}
-        self._resource_schedule_cache: dict[
-            tuple[object, ...],
-            dict[str, object],
-        ] = {}
+        self._projection_flights: dict[tuple[object, ...], ProjectionFlight] = {}
+        self._projection_cache_epoch = 0
+        self._schedule_input_cache = self._projection_cache_factory()
+        # Unscoped pin-collapsed schedule inputs that commits update in place.
+        self._schedule_input_base_cache = self._projection_cache_factory()
+        self._schedule_projection_cache = self._projection_cache_factory()
+        self._dependency_graph_cache = self._projection_cache_factory()
+        self._resource_schedule_cache = self._projection_cache_factory()
+        # Last resource schedule per query shape, kept across commits for
+        # allow_stale queries. Bounded by entry count only: the schedules are
+        # the ones already sized into _resource_schedule_cache.
+        self._latest_resource_schedule_cache = ProjectionCache(max_bytes=None)
+        self._projection_refreshes: dict[tuple[object, ...], Future] = {}
+        self._projection_refresh_executor: ThreadPoolExecutor | None = None
+        self._query_profile_sinks = tuple(query_profile_sinks)
 
     def _now(self) -> dt.datetime:
         now = self._now_provider()
@@ -253,8 +311,7 @@ class ProjectService:
                     details={},
                 ),
             )
-            cached[fingerprint] = result
-            self._persist_command_replay_cache()
+            self._command_replay_cache.record(envelope.command_id, fingerprint, result)
             return result
         clone = getattr(self._repository, "clone", None)
         replace_with = getattr(self._repository, "replace_with", None)
@@ -269,8 +326,7 @@ class ProjectService:
                     details={},
                 ),
             )
-            self._command_replay_cache[envelope.command_id] = {fingerprint: result}
-            self._persist_command_replay_cache()
+            self._command_replay_cache.record(envelope.command_id, fingerprint, result)
             return result
 
         staged = clone()
@@ -281,11 +337,10 @@ class ProjectService:
             ),
             resource_scheduler=self._resource_scheduler,
             now_provider=self._now_provider,
+            command_replay_cache=self._command_replay_cache.staged(),
+            projection_cache_factory=self._projection_cache_factory,
+            cache_now_granularity=self._config.cache_now_granularity,
         )
-        staged_service._command_replay_cache = {
-            command_id: dict(records)
-            for command_id, records in self._command_replay_cache.items()
-        }
         try:
             result = staged_service._handle_command(envelope)
         except ServiceValidationError as exc:
@@ -294,6 +349,7 @@ class ProjectService:
                 error=exc.to_error(),
             )
         if result.ok:
+            changes = self._staged_projection_changes(staged)
             try:
                 replace_with(staged)
             except ServiceValidationError as exc:
@@ -311,10 +367,9 @@ class ProjectService:
                     ),
                 )
             else:
-                self._command_replay_cache = staged_service._command_replay_cache
-                self._clear_projection_cache()
-        self._command_replay_cache[envelope.command_id] = {fingerprint: result}
-        self._persist_command_replay_cache()
+                self._command_replay_cache.merge(staged_service._command_replay_cache)
+                self._invalidate_projection_cache(changes)
+        self._command_replay_cache.record(envelope.command_id, fingerprint, result)
         return result
 
     def _handle_command(
@@ -1250,19 +1305,23 @@ class ProjectService:
                 self._config.required_roles_transition_mode
             ),
             resource_scheduler=self._resource_scheduler,
+            command_replay_cache=self._command_replay_cache.staged(),
+            projection_cache_factory=self._projection_cache_factory,
+            cache_now_granularity=self._config.cache_now_granularity,
         )
-        staged_service._command_replay_cache = {
-            command_id: dict(records)
-            for command_id, records in self._command_replay_cache.items()
-        }
         results: list[CommandResult | CommandErrorResult] = []
         for command_index, command in enumerate(envelope.commands):
             result = staged_service.handle_command(command)
             if not result.ok:
                 if command_index == 0:
-                    self._command_replay_cache[command.command_id] = dict(
-                        staged_service._command_replay_cache[command.command_id]
-                    )
+                    for payload_hash, cached_result in staged_service._command_replay_cache.get(
+                        command.command_id
+                    ).items():
+                        self._command_replay_cache.record(
+                            command.command_id,
+                            payload_hash,
+                            cached_result,
+                        )
                 rolled_back = [
                     CommandErrorResult(
                         command_id=previous.command_id,
@@ -1306,6 +1365,7 @@ class ProjectService:
                 ]
                 return [*rolled_back, result, *skipped]
             results.append(result)
+        changes = self._staged_projection_changes(staged)
         try:
             replace_with(staged)
         except ServiceValidationError as exc:
@@ -1326,20 +1386,62 @@ class ProjectService:
                 CommandErrorResult(command_id=command.command_id, error=error)
                 for command in envelope.commands
             ]
-        self._command_replay_cache = staged_service._command_replay_cache
-        self._persist_command_replay_cache()
-        self._clear_projection_cache()
+        self._command_replay_cache.merge(staged_service._command_replay_cache)
+        self._invalidate_projection_cache(changes)
         return results
 
     def handle_query(self, envelope: QueryEnvelope) -> QueryResult | QueryErrorResult:
-        """Run one validated query."""
+        """Run one validated query.
+
+        When the envelope sets ``include_timings`` or the service has
+        ``query_profile_sinks``, named spans around the query phases are
+        recorded. The breakdown is returned as ``QueryResult.timings`` on
+        request and passed to every sink as a ``QueryProfile``.
+        """
+        if not envelope.include_timings and not self._query_profile_sinks:
+            return self._run_query(envelope)
+        recorder = SpanRecorder()
+        code_profile = (
+            start_code_profile()
+            if any(getattr(sink, "code_profile", False) for sink in self._query_profile_sinks)
+            else None
+        )
+        started_at = dt.datetime.now(dt.UTC)
+        started = time.perf_counter()
+        try:
+            with recording(recorder):
+                result = self._run_query(envelope)
+        finally:
+            if code_profile is not None:
+                stop_code_profile(code_profile)
+        total_seconds = time.perf_counter() - started
+        spans = recorder.as_dict()
+        if envelope.include_timings and isinstance(result, QueryResult):
+            result.timings = QueryTimings.model_validate(
+                {"total_seconds": total_seconds, "spans": spans}
+            )
+        profile = QueryProfile(
+            query_id=envelope.query_id,
+            action=envelope.query.action,
+            project_id=getattr(envelope.query, "project_id", None),
+            started_at=started_at,
+            total_seconds=total_seconds,
+            ok=result.ok,
+            spans=spans,
+            code_profile=code_profile,
+        )
+        for sink in self._query_profile_sinks:
+            sink.record(profile)
+        return result
+
+    def _run_query(self, envelope: QueryEnvelope) -> QueryResult | QueryErrorResult:
         try:
             return self._handle_query(envelope)
         except ServiceValidationError as exc:
             return QueryErrorResult(query_id=envelope.query_id, error=exc.to_error())
 
     def _handle_query(self, envelope: QueryEnvelope) -> QueryResult:
-        query = envelope.query
+        query = self._quantized_query(envelope.query)
         warnings: list[Warning] = []
         if isinstance(query, GetProject):
             project = self._repository.get_project(query.project_id)
@@ -1410,7 +1512,9 @@ class ProjectService:
             data, warnings = self._cost_data(query)
         else:
             raise TypeError(f"Unsupported query type: {type(query)!r}")
-        return QueryResult(query_id=envelope.query_id, data=data, warnings=warnings)
+        # Frozen cache rows stay inside the service; callers get plain
+        # containers that share only the immutable leaves.
+        return QueryResult(query_id=envelope.query_id, data=thaw(data), warnings=warnings)
 
     def query_blockers(
         self,
@@ -1420,28 +1524,224 @@ class ProjectService:
         """Return blockers for direct Python callers."""
         return self._repository.list_blockers(project_id, include_resolved)
 
+    def projection_cache_stats(self) -> dict[str, dict[str, int]]:
+        """Return entry, size, hit, miss and eviction counts per projection cache."""
+        with self._projection_cache_lock:
+            return {
+                name: cache.stats()
+                for name, cache in (
+                    ("schedule_input", self._schedule_input_cache),
+                    ("schedule_input_base", self._schedule_input_base_cache),
+                    ("schedule_projection", self._schedule_projection_cache),
+                    ("dependency_graph", self._dependency_graph_cache),
+                    ("resource_schedule", self._resource_schedule_cache),
+                    ("latest_resource_schedule", self._latest_resource_schedule_cache),
+                )
+            }
+
+    def wait_for_projection_refreshes(self, timeout: float | None = None) -> bool:
+        """Wait for background refreshes started by ``allow_stale`` queries.
+
+        Returns whether all of them finished within ``timeout`` seconds.
+        """
+        with self._projection_cache_lock:
+            pending = list(self._projection_refreshes.values())
+        _done, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
     def _clear_projection_cache(self) -> None:
         with self._projection_cache_lock:
+            self._projection_cache_epoch += 1
             self._schedule_input_cache.clear()
+            self._schedule_input_base_cache.clear()
             self._schedule_projection_cache.clear()
             self._dependency_graph_cache.clear()
             self._resource_schedule_cache.clear()
 
+    def _staged_projection_changes(
+        self,
+        staged: Any,
+    ) -> tuple[set[str], set[str], set[str] | None] | None:
+        """Return the project ids, entity kinds and schedule-input process ids a
+        stage changed, if it can tell.
+
+        Must run before the stage is committed, which resets its change tracking.
+        """
+        dirty_entity_keys = getattr(staged, "dirty_entity_keys", None)
+        staged_project_ids = getattr(staged, "_staged_project_ids", None)
+        if not callable(dirty_entity_keys) or not callable(staged_project_ids):
+            return None
+        dirty = dirty_entity_keys()
+        project_ids = staged_project_ids()
+        if dirty is None or project_ids is None:
+            return None
+        staged_process_ids = getattr(staged, "_staged_process_ids", None)
+        process_ids = staged_process_ids() if callable(staged_process_ids) else None
+        return project_ids, {kind for kind, _key in dirty}, process_ids
+
+    def _invalidate_projection_cache(
+        self,
+        changes: tuple[set[str], set[str], set[str] | None] | None,
+    ) -> None:
+        """Drop cached projections of the projects a committed stage changed.
+
+        Every cache key holds its project id second. Commits that only touched
+        ``PROJECTION_INDEPENDENT_ENTITY_KINDS`` keep all entries; unknown
+        changes, or changes to kinds without a project, clear everything.
+        Unscoped schedule inputs are marked dirty instead of dropped.
+        """
+        if changes is None:
+            self._clear_projection_cache()
+            return
+        project_ids, kinds, process_ids = changes
+        if kinds <= PROJECTION_INDEPENDENT_ENTITY_KINDS:
+            return
+        if not project_ids:
+            self._clear_projection_cache()
+            return
+        with self._projection_cache_lock:
+            self._projection_cache_epoch += 1
+            for cache in (
+                self._schedule_input_cache,
+                self._schedule_projection_cache,
+                self._dependency_graph_cache,
+                self._resource_schedule_cache,
+            ):
+                cache.discard_where(lambda key: key[1] in project_ids)
+            self._mark_schedule_input_bases_dirty(project_ids, process_ids)
+
+    def _mark_schedule_input_bases_dirty(
+        self,
+        project_ids: set[str],
+        process_ids: set[str] | None,
+    ) -> None:
+        """Carry unscoped schedule inputs of ``project_ids`` over a commit.
+
+        A base stays only if the project is unversioned or its version moved by
+        exactly one, i.e. this commit is the only one since the base was built;
+        its touched processes are then rebuilt on next use. Called with the
+        projection cache lock held.
+        """
+        cache = self._schedule_input_base_cache
+        versions: dict[str, object] = {}
+        dropped: set[tuple[object, ...]] = set()
+        for key in cache.keys():
+            project_id = str(key[1])
+            if project_id not in project_ids:
+                continue
+            if project_id not in versions:
+                versions[project_id] = self._repository_cache_version(project_id)
+            base = cache.peek(key)
+            version = versions[project_id]
+            carried = base["version"] is None and version is None
+            if type(base["version"]) is int and type(version) is int:
+                carried = version == base["version"] + 1
+            if process_ids is None or not carried:
+                dropped.add(key)
+                continue
+            base["version"] = version
+            base["dirty"] |= process_ids
+        if dropped:
+            cache.discard_where(lambda key: key in dropped)
+
     def _cached_value(
         self,
-        cache: dict[tuple[object, ...], Any],
+        cache: ProjectionCache,
         key: tuple[object, ...],
         factory,
         *,
-        copy_result: bool = False,
+        freeze_result: bool = False,
+        shared: bool = False,
+        on_computed: Callable[[Any], None] | None = None,
     ):
+        """Return the cached value for ``key``, computing it on a miss.
+
+        With ``freeze_result`` the value is stored and returned as read-only
+        ``FrozenDict``/``FrozenList`` containers shared by every hit; callers
+        that change it must copy first. Query results thaw it before it leaves
+        the service. ``shared`` values are also looked up in
+        and written to the repository's shared projection store, when it has
+        one, so other processes on the same database reuse them.
+
+        The factory runs without the cache lock. Concurrent callers for the
+        same key wait for the first one's result, while other keys compute in
+        parallel. A result finished after an invalidation is returned to its
+        waiters but not cached. ``on_computed`` is called with each value the
+        caller that computed it produces, under the cache lock; hits and
+        waiters skip it.
+        """
         with self._projection_cache_lock:
             cached = cache.get(key)
             if cached is not None:
-                return copy.deepcopy(cached) if copy_result else cached
-            value = factory()
-            cache[key] = copy.deepcopy(value) if copy_result else value
-            return copy.deepcopy(cache[key]) if copy_result else value
+                return cached
+            flight = self._projection_flights.get(key)
+            if flight is not None:
+                leader = False
+            else:
+                leader = True
+                flight = self._projection_flights[key] = ProjectionFlight()
+                epoch = self._projection_cache_epoch
+        if not leader:
+            return flight.result()
+        try:
+            value = self._load_shared_projection(key) if shared else None
+            stored = value is not None
+            if value is None:
+                value = factory()
+            if freeze_result:
+                value = freeze(value)
+            if shared and not stored:
+                self._store_shared_projection(key, value)
+            flight.value = value
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._projection_cache_lock:
+                del self._projection_flights[key]
+                if flight.error is None:
+                    if epoch == self._projection_cache_epoch:
+                        cache.put(key, flight.value)
+                    if on_computed is not None:
+                        on_computed(flight.value)
+            flight.done.set()
+        return value
+
+    def _quantized_query(self, query: Any) -> Any:
+        """Floor a cached projection query's ``now`` to ``cache_now_granularity``.
+
+        An ``as_of`` equal to ``now`` asks for the latest state and moves with
+        it; any other ``as_of`` past the effective ``now`` is clamped to it, so
+        the query never reads state newer than the instant it runs at. The
+        whole query runs at the effective ``now``, so results report the
+        instant they were computed for and nearby calls share cache keys.
+        """
+        granularity = self._config.cache_now_granularity
+        if granularity is None or not isinstance(query, _NOW_QUANTIZED_QUERY_TYPES):
+            return query
+        now = query.now
+        utc_now = now.astimezone(dt.UTC)
+        effective_now = (utc_now - (utc_now - _EPOCH) % granularity).astimezone(now.tzinfo)
+        if effective_now == now:
+            return query
+        update: dict[str, dt.datetime] = {"now": effective_now}
+        if query.as_of == now or query.as_of > effective_now:
+            update["as_of"] = effective_now
+        return query.model_copy(update=update)
+
+    def _load_shared_projection(self, key: tuple[object, ...]) -> Any | None:
+        loader = getattr(self._repository, "load_shared_projection", None)
+        if not callable(loader):
+            return None
+        return loader(key[1], self._shared_projection_fingerprint(key))
+
+    def _store_shared_projection(self, key: tuple[object, ...], value: Any) -> None:
+        store = getattr(self._repository, "store_shared_projection", None)
+        if callable(store):
+            store(key[1], key[2], self._shared_projection_fingerprint(key), value)
+
+    def _shared_projection_fingerprint(self, key: tuple[object, ...]) -> str:
+        return hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
 
     def _cache_datetime(self, value: dt.datetime) -> str:
         if value.tzinfo is None or value.utcoffset() is None:
@@ -1472,6 +1772,39 @@ class ProjectService:
     def _scope_cache_key(self, scope: Any) -> object:
         return self._cache_value(scope)
 
+    def _project_records(self, records_name: str, project_id: str) -> dict[str, Any]:
+        """Return ``{record_id: record}`` for one project's roles, resources or calendars.
+
+        Reads the repository's per-project id index, so a lazily loaded
+        repository loads only ``project_id`` instead of every project.
+        Repositories without the index are scanned by ``project_id``.
+        """
+        records = getattr(self._repository, records_name, {})
+        ids_by_project = getattr(
+            self._repository,
+            _PROJECT_RECORD_ID_INDEXES[records_name],
+            None,
+        )
+        if ids_by_project is None:
+            return {
+                record_id: record
+                for record_id, record in records.items()
+                if record.get("project_id") == project_id
+            }
+        return {
+            record_id: records[record_id]
+            for record_id in ids_by_project.get(project_id, [])
+            if record_id in records
+        }
+
+    def _project_revisions(self, project_id: str) -> dict[str, list[Any]]:
+        """Return ``{process_id: revisions}`` for the processes of one project."""
+        revisions_by_process = self._repository.revisions_by_process
+        return {
+            process_id: revisions_by_process.get(process_id, [])
+            for process_id in self._repository.process_ids_by_project.get(project_id, [])
+        }
+
     def _repository_cache_version(self, project_id: str) -> object:
         for attr_name in (
             "cache_version",
@@ -1513,6 +1846,8 @@ class ProjectService:
             }
         ]
         if not required:
+            if "project_id" in signature.parameters:
+                return provider(project_id=project_id)
             return provider()
         if required[0].kind is inspect.Parameter.KEYWORD_ONLY:
             return provider(project_id=project_id)
@@ -1567,11 +1902,7 @@ class ProjectService:
         as_of: dt.datetime,
         scope: Any,
     ) -> ProjectScheduleInput:
-        schedule_input = self._pin_collapsed_schedule_input(
-            project_id,
-            self._repository.get_project_schedule_input(project_id, as_of),
-            as_of,
-        )
+        schedule_input = self._project_schedule_input(project_id, as_of)
         if scope is None:
             return schedule_input
         selected_ids, _scope_data, _target_process_id = (
@@ -1598,18 +1929,108 @@ class ProjectService:
             processes=tuple(processes),
         )
 
+    def _project_schedule_input(
+        self,
+        project_id: str,
+        as_of: dt.datetime,
+    ) -> ProjectScheduleInput:
+        """Return the unscoped pin-collapsed schedule input for a project.
+
+        After a commit by this service only the processes it touched, and
+        processes depending on them, are rebuilt; the rest are reused from the
+        previous build for the same ``as_of``.
+        """
+        key = ("schedule_input_base", project_id, self._cache_datetime(as_of))
+        version = self._repository_cache_version(project_id)
+        reuse: dict[str, ProcessScheduleInput] | None = None
+        dirty: set[str] = set()
+        with self._projection_cache_lock:
+            epoch = self._projection_cache_epoch
+            base = self._schedule_input_base_cache.get(key)
+            if base is not None and base["version"] == version:
+                dirty = set(base["dirty"])
+                reuse = {
+                    process_id: process
+                    for process_id, process in base["processes"].items()
+                    if process_id not in dirty
+                }
+        with span("repository_projection"):
+            if reuse is None:
+                repository_input = self._repository.get_project_schedule_input(
+                    project_id,
+                    as_of,
+                )
+            else:
+                repository_input = self._repository.get_project_schedule_input(
+                    project_id,
+                    as_of,
+                    reuse=reuse,
+                )
+        schedule_input = self._pin_collapsed_schedule_input(
+            project_id,
+            repository_input,
+            as_of,
+            reuse=reuse,
+            dirty=dirty,
+        )
+        with self._projection_cache_lock:
+            if epoch == self._projection_cache_epoch:
+                self._schedule_input_base_cache.put(
+                    key,
+                    {
+                        "version": version,
+                        "processes": {
+                            process.process_id: process
+                            for process in schedule_input.processes
+                        },
+                        "dirty": set(),
+                    },
+                )
+        return schedule_input
+
+    @timed("pin_collapse")
     def _pin_collapsed_schedule_input(
         self,
         project_id: str,
         schedule_input: ProjectScheduleInput,
         as_of: dt.datetime,
+        *,
+        reuse: Mapping[str, ProcessScheduleInput] | None = None,
+        dirty: Iterable[str] = (),
     ) -> ProjectScheduleInput:
+        """Overlay pin completedness facts on repository schedule inputs.
+
+        Processes taken from ``reuse`` are already collapsed and are kept
+        unless they depend, directly or not, on a ``dirty`` process or on one
+        rebuilt by the repository.
+        """
+        recollapse = {
+            process.process_id
+            for process in schedule_input.processes
+            if reuse is None or reuse.get(process.process_id) is not process
+        }
+        if reuse:
+            dependents: dict[str, list[str]] = defaultdict(list)
+            for process in schedule_input.processes:
+                for dependency in process.dependencies:
+                    dependents[dependency].append(process.process_id)
+            pending = [*recollapse, *dirty]
+            while pending:
+                for dependent in dependents.get(pending.pop(), ()):
+                    if dependent not in recollapse:
+                        recollapse.add(dependent)
+                        pending.append(dependent)
+        memo: dict[tuple[str, str], dict[str, object]] = {}
         processes = []
         for process in schedule_input.processes:
+            if process.process_id not in recollapse:
+                processes.append(process)
+                continue
             facts = self._process_completedness_facts(
                 project_id,
                 process.process_id,
                 as_of,
+                memo=memo,
             )
             processes.append(
                 replace(
@@ -2444,7 +2865,7 @@ class ProjectService:
         validate = getattr(self._repository, "_validate_acyclic_after_revision", None)
         if callable(validate):
             validate(project_id, updated)
-        self._repository.revisions_by_process[process_id].append(updated)
+        writable_item(self._repository.revisions_by_process, process_id).append(updated)
         edge_id = getattr(self._repository, "_dependency_edge_id", None)
         if callable(edge_id):
             edge_id(project_id, dependency_id, process_id)
@@ -2838,7 +3259,8 @@ class ProjectService:
             self._dependency_graph_cache,
             key,
             factory,
-            copy_result=True,
+            freeze_result=True,
+            shared=True,
         )
 
     def _build_dependency_graph_parts(
@@ -3214,18 +3636,15 @@ class ProjectService:
         self._repository.get_project(query.project_id)
         roles = [
             self._json_ready(role)
-            for role in getattr(self._repository, "roles", {}).values()
-            if role["project_id"] == query.project_id
+            for role in self._project_records("roles", query.project_id).values()
         ]
         calendars = [
             self._json_ready(calendar)
-            for calendar in getattr(self._repository, "calendars", {}).values()
-            if calendar["project_id"] == query.project_id
+            for calendar in self._project_records("calendars", query.project_id).values()
         ]
         resources = [
             self._json_ready(resource)
-            for resource in getattr(self._repository, "resources", {}).values()
-            if resource["project_id"] == query.project_id
+            for resource in self._project_records("resources", query.project_id).values()
         ]
         return {
             "project_id": query.project_id,
@@ -3566,7 +3985,7 @@ class ProjectService:
     ) -> dt.datetime:
         project = self._repository.get_project(project_id)
         timestamps = [project.start_at]
-        for revisions in self._repository.revisions_by_process.values():
+        for revisions in self._project_revisions(project_id).values():
             timestamps.extend(
                 revision.effective_at
                 for revision in revisions
@@ -4425,11 +4844,8 @@ class ProjectService:
         agent_context: dict[str, object],
     ) -> dict[str, str]:
         project_id = str((agent_context.get("project") or {}).get("project_id") or "")
-        roles = getattr(self._repository, "roles", {})
         output = {}
-        for role_id, role in roles.items():
-            if role.get("project_id") != project_id:
-                continue
+        for role_id, role in self._project_records("roles", project_id).items():
             output[str(role_id)] = str(role.get("name") or role_id)
         return output
 
@@ -4438,11 +4854,8 @@ class ProjectService:
         agent_context: dict[str, object],
     ) -> dict[str, str]:
         project_id = str((agent_context.get("project") or {}).get("project_id") or "")
-        resources = getattr(self._repository, "resources", {})
         output = {}
-        for resource_id, resource in resources.items():
-            if resource.get("project_id") != project_id:
-                continue
+        for resource_id, resource in self._project_records("resources", project_id).items():
             output[str(resource_id)] = str(resource.get("name") or resource_id)
         return output
 
@@ -5159,7 +5572,7 @@ class ProjectService:
             ]
             if timestamp is not None
         ]
-        for other_process_id, revisions in self._repository.revisions_by_process.items():
+        for other_process_id, revisions in self._project_revisions(project_id).items():
             if other_process_id == process_id:
                 continue
             prior_dependency_state: bool | None = None
@@ -6353,11 +6766,8 @@ class ProjectService:
         project_id: str,
         role_ids: set[str],
     ) -> set[str]:
-        resources = getattr(self._repository, "resources", {})
         output: set[str] = set()
-        for resource in resources.values():
-            if resource.get("project_id") != project_id:
-                continue
+        for resource in self._project_records("resources", project_id).values():
             if resource.get("active", True) is False:
                 continue
             resource_roles = {str(role_id) for role_id in resource.get("role_ids", [])}
@@ -6402,6 +6812,7 @@ class ProjectService:
             scope=context_scope,
             include_resource_fields=True,
             include_allocation_slices=True,
+            allow_stale=query.allow_stale,
             planning_granularity=query.planning_granularity,
             max_iterations=query.max_iterations,
             convergence_tolerance_hours=query.convergence_tolerance_hours,
@@ -6918,8 +7329,10 @@ class ProjectService:
         role_rows: dict[str, list[dict[str, object]]] = defaultdict(list)
         role_names = {
             str(role["role_id"]): str(role.get("name", role["role_id"]))
-            for role in getattr(self._repository, "roles", {}).values()
-            if role["project_id"] == graph.get("project_id")
+            for role in self._project_records(
+                "roles",
+                str(graph.get("project_id")),
+            ).values()
         }
         for node, priority in self._agent_priority_nodes(
             graph,
@@ -6964,8 +7377,10 @@ class ProjectService:
             str(resource["resource_id"]): str(
                 resource.get("name", resource["resource_id"])
             )
-            for resource in getattr(self._repository, "resources", {}).values()
-            if resource["project_id"] == graph.get("project_id")
+            for resource in self._project_records(
+                "resources",
+                str(graph.get("project_id")),
+            ).values()
         }
         priority_by_process = {
             str(node["process_id"]): (node, priority)
@@ -7278,15 +7693,20 @@ class ProjectService:
         self,
         query,
     ) -> tuple[dict[str, object], list[Warning]]:
+        allow_stale = getattr(query, "allow_stale", False)
         schedule = self._compute_resource_schedule(
             query,
             include_allocation_slices=getattr(query, "include_allocation_slices", False),
+            allow_stale=allow_stale,
         )
         include_slices = getattr(query, "include_allocation_slices", False)
         data = dict(schedule)
         data["as_of"] = query.as_of.isoformat()
         data["now"] = query.now.isoformat()
         warnings = self._resource_warnings(data, query.max_iterations)
+        data.pop("warnings", None)
+        if allow_stale:
+            data["stale"] = schedule.get("stale")
         if not include_slices:
             data["allocation_slices"] = []
         data.pop("horizon_starts_at", None)
@@ -7298,19 +7718,29 @@ class ProjectService:
         query,
         *,
         include_allocation_slices: bool = True,
+        allow_stale: bool = False,
+        lock_repository: bool = False,
     ) -> dict[str, object]:
         key = self._resource_schedule_cache_key(query)
+        if allow_stale:
+            stale = self._stale_resource_schedule(query, key)
+            if stale is not None:
+                if not include_allocation_slices:
+                    stale["allocation_slices"] = []
+                return stale
 
         def factory() -> dict[str, object]:
-            scheduler_input = self._resource_schedule_input(
-                query,
-                include_allocation_slices=True,
-            )
+            with self._command_lock if lock_repository else nullcontext():
+                scheduler_input = self._resource_schedule_input(
+                    query,
+                    include_allocation_slices=True,
+                )
             try:
-                if self._resource_scheduler is not None:
-                    schedule = self._resource_scheduler(scheduler_input)
-                else:
-                    schedule = compute_resource_schedule(scheduler_input)
+                with span("resource_scheduler"):
+                    if self._resource_scheduler is not None:
+                        schedule = self._resource_scheduler(scheduler_input)
+                    else:
+                        schedule = compute_resource_schedule(scheduler_input)
             except ValueError as exc:
                 raise ServiceValidationError(
                     code="resource_schedule_unsatisfiable",
@@ -7322,12 +7752,19 @@ class ProjectService:
             self._resource_schedule_cache,
             key,
             factory,
-            copy_result=True,
+            freeze_result=True,
+            # An injected scheduler is private to this service.
+            shared=self._resource_scheduler is None,
+            on_computed=lambda value: self._latest_resource_schedule_cache.put(
+                self._latest_resource_schedule_key(key),
+                (key, value),
+            ),
         )
         if not include_allocation_slices:
-            schedule["allocation_slices"] = []
+            schedule = {**schedule, "allocation_slices": []}
         return schedule
 
+    @timed("repository_projection")
     def _resource_schedule_input(
         self,
         query,
@@ -7457,19 +7894,15 @@ class ProjectService:
             requirements.extend(process_requirements)
 
         roles = [
-            dict(role)
-            for role in getattr(self._repository, "roles", {}).values()
-            if role["project_id"] == query.project_id
+            dict(role) for role in self._project_records("roles", query.project_id).values()
         ]
         resources = [
             dict(resource)
-            for resource in getattr(self._repository, "resources", {}).values()
-            if resource["project_id"] == query.project_id
+            for resource in self._project_records("resources", query.project_id).values()
         ]
         calendars = [
             dict(calendar)
-            for calendar in getattr(self._repository, "calendars", {}).values()
-            if calendar["project_id"] == query.project_id
+            for calendar in self._project_records("calendars", query.project_id).values()
         ]
         blockers = [
             {
@@ -7813,6 +8246,7 @@ class ProjectService:
             )
         return f"{pin.process_id}:{pin.role_id}"
 
+    @timed("serialization")
     def _normalize_schedule_dict(self, schedule: dict[str, Any]) -> dict[str, object]:
         data = self._json_ready(dict(schedule))
         data.setdefault("allocation_slices", [])
@@ -8286,6 +8720,69 @@ class ProjectService:
             warnings,
         )
 
+    def _latest_resource_schedule_key(self, key: tuple[object, ...]) -> tuple[object, ...]:
+        # Drops the repository version, as_of and now from a schedule cache key.
+        return (*key[:2], *key[5:])
+
+    def _stale_resource_schedule(
+        self,
+        query,
+        key: tuple[object, ...],
+    ) -> dict[str, object] | None:
+        """Return the last schedule for ``query``'s shape and refresh it later.
+
+        Returns None when ``key`` is already cached or nothing was computed
+        yet, so the caller computes as usual. Otherwise the query is
+        recomputed on a background thread and the previous result comes back
+        with a ``stale`` block naming the version, ``as_of`` and ``now`` it was
+        computed for.
+        """
+        with self._projection_cache_lock:
+            if key in self._resource_schedule_cache:
+                return None
+            latest = self._latest_resource_schedule_cache.get(
+                self._latest_resource_schedule_key(key)
+            )
+            if latest is None:
+                return None
+            if key not in self._projection_refreshes:
+                if self._projection_refresh_executor is None:
+                    self._projection_refresh_executor = ThreadPoolExecutor(
+                        max_workers=1,
+                        thread_name_prefix="projdash-projection-refresh",
+                    )
+                future = self._projection_refresh_executor.submit(
+                    self._refresh_resource_schedule,
+                    query,
+                )
+                self._projection_refreshes[key] = future
+                future.add_done_callback(
+                    lambda _future: self._forget_projection_refresh(key)
+                )
+        latest_key, schedule = latest
+        return {
+            **schedule,
+            "stale": {
+                "version": latest_key[2],
+                "as_of": latest_key[3],
+                "now": latest_key[4],
+            },
+        }
+
+    def _refresh_resource_schedule(self, query) -> None:
+        """Recompute a stale resource schedule on the refresh thread.
+
+        Commands keep committing while a refresh runs, so its scheduler input
+        is read under the command lock. A commit that lands between the cache
+        lookup and that read moves the cache epoch, and the result is then not
+        cached.
+        """
+        self._compute_resource_schedule(query, lock_repository=True)
+
+    def _forget_projection_refresh(self, key: tuple[object, ...]) -> None:
+        with self._projection_cache_lock:
+            self._projection_refreshes.pop(key, None)
+
     def _resource_warnings(
         self,
         schedule: dict[str, object],
@@ -8293,8 +8790,21 @@ class ProjectService:
     ) -> list[Warning]:
         warnings = [
             self._warning_from_schedule(item, max_iterations)
-            for item in schedule.pop("warnings", []) or []
+            for item in schedule.get("warnings", []) or []
         ]
+        stale = schedule.get("stale")
+        if stale:
+            warnings.append(
+                Warning(
+                    code="stale_resource_schedule",
+                    message=(
+                        "Resource schedule was computed for an earlier state; "
+                        "a refresh is running."
+                    ),
+                    severity=WarningSeverity.INFO,
+                    details=dict(stale),
+                )
+            )
         if not schedule.get("converged", True) and not any(
             warning.code == "max_iterations_reached" for warning in warnings
         ):
@@ -8579,15 +9089,17 @@ class ProjectService:
         query: QueryCosts,
         slices: list[dict[str, Any]],
     ) -> set[str]:
-        resources = getattr(self._repository, "resources", {})
         if query.resource_ids is not None:
             return set(query.resource_ids)
         role_ids = set(query.role_ids or [])
         if not role_ids:
             role_ids = {slice_data["role_id"] for slice_data in slices}
         relevant = {slice_data["resource_id"] for slice_data in slices}
-        for resource_id, resource in resources.items():
-            if resource["project_id"] != query.project_id or not resource["active"]:
+        for resource_id, resource in self._project_records(
+            "resources",
+            query.project_id,
+        ).items():
+            if not resource["active"]:
                 continue
             if role_ids.intersection(resource["role_ids"]):
                 relevant.add(resource_id)
@@ -9353,7 +9865,7 @@ class ProjectService:
             deps = candidate_dependencies[successor_id]
             if list(revision.dependencies) == deps:
                 continue
-            staged.revisions_by_process[successor_id].append(
+            writable_item(staged.revisions_by_process, successor_id).append(
                 revision.model_copy(
                     update={
                         "revision_id": new_id(),
@@ -9370,7 +9882,7 @@ class ProjectService:
             else:
                 revision = revision_for(process_id)
                 final_revision_id = new_id()
-                staged.revisions_by_process[process_id].append(
+                writable_item(staged.revisions_by_process, process_id).append(
                     revision.model_copy(
                         update={
                             "revision_id": final_revision_id,
@@ -9402,7 +9914,11 @@ class ProjectService:
                 operation_results[op_index].matched_ids.revision_ids = [
                     final_revision_id
                 ]
-        staged.dependency_edge_ids = candidate_edge_ids
+        for key in [key for key in staged.dependency_edge_ids if key not in candidate_edge_ids]:
+            del staged.dependency_edge_ids[key]
+        for key, edge_id in candidate_edge_ids.items():
+            if staged.dependency_edge_ids.get(key) != edge_id:
+                staged.dependency_edge_ids[key] = edge_id
         self._repository.replace_with(staged)
         valid_requirement_ids = {
             requirement.requirement_id
@@ -9453,7 +9969,7 @@ class ProjectService:
             return resolver(project_id, process_symbol)
         processes = getattr(self._repository, "processes", None)
         process_ids_by_project = getattr(self._repository, "process_ids_by_project", None)
-        if isinstance(processes, dict) and process_ids_by_project is not None:
+        if isinstance(processes, Mapping) and process_ids_by_project is not None:
             matches = [
                 candidate_id
                 for candidate_id in process_ids_by_project.get(project_id, [])
@@ -9732,7 +10248,7 @@ class ProjectService:
         if resource_id is None:
             return False
         resources = getattr(repository, "resources", None)
-        if not isinstance(resources, dict):
+        if not isinstance(resources, Mapping):
             return False
         resource = resources.get(resource_id)
         return isinstance(resource, dict) and resource.get("project_id") == project_id
@@ -9747,7 +10263,7 @@ class ProjectService:
         if resource_id is None:
             return False
         resources = getattr(repository, "resources", None)
-        if not isinstance(resources, dict):
+        if not isinstance(resources, Mapping):
             return False
         existing = resources.get(resource_id)
         if not isinstance(existing, dict) or existing.get("project_id") != project_id:
@@ -9857,7 +10373,7 @@ class ProjectService:
         role_ids: list[str],
     ) -> bool:
         resources = getattr(repository, "resources", None)
-        if not isinstance(resources, dict):
+        if not isinstance(resources, Mapping):
             return False
         resource = resources.get(resource_id)
         return (
@@ -9874,7 +10390,7 @@ class ProjectService:
         calendar_id: str,
     ) -> bool:
         resources = getattr(repository, "resources", None)
-        if not isinstance(resources, dict):
+        if not isinstance(resources, Mapping):
             return False
         resource = resources.get(resource_id)
         return (
@@ -9883,19 +10399,6 @@ class ProjectService:
             and resource.get("calendar_id") == calendar_id
         )
 
-    def _load_command_replay_cache(
-        self,
-    ) -> dict[object, dict[str, CommandResult | CommandErrorResult]]:
-        loader = getattr(self._repository, "load_command_replay_cache", None)
-        if callable(loader):
-            return loader()
-        return {}
-
-    def _persist_command_replay_cache(self) -> None:
-        persister = getattr(self._repository, "replace_command_replay_cache", None)
-        if callable(persister):
-            persister(self._command_replay_cache)
-
     def _repository_call(self, method_name: str, **kwargs):
         return self._repository_call_on(self._repository, method_name, **kwargs)
 
@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import copy
 import datetime as dt
 import json
 import sqlite3
 import threading
 import uuid
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable, Iterator, MutableMapping
+from contextlib import contextmanager
 from decimal import Decimal
 from enum import Enum
 from pathlib import Path
@@ -39,16 +42,51 @@ from projdash.service.models import (
     SlackRunRecord,
     TeammateWorkPlanRecord,
 )
+from projdash.service.payload_codec import (
+    PayloadCodecError,
+    decode_payload,
+    encode_payload,
+)
 from projdash.service.repository import (
+    _MISSING,
+    _PROJECT_KEYED_STATE_FIELDS,
+    _PROJECT_TUPLE_KEYED_STATE_FIELDS,
+    _RECORD_STATE_KINDS,
     LEGACY_PROCESS_EVIDENCE_LINE_ITEMS,
+    REPOSITORY_STATE_FIELDS,
     InMemoryProjectRepository,
     RecordDict,
     RetiredProcessRecord,
+    _scope_get,
 )
 from projdash.service.results import CommandErrorResult, CommandResult
 
-SQLITE_SCHEMA_VERSION = 1
+SQLITE_SCHEMA_VERSION = 2
 GENERATION_METADATA_KEY = "generation"
+CHANGE_LOG_FLOOR_METADATA_KEY = "change_log_floor"
+COMMAND_REPLAY_RETENTION = dt.timedelta(days=30)
+TYPED_SCHEMA_VERSION = 2
+TYPED_SCHEMA_METADATA_KEY = "typed_schema_version"
+CHANGE_LOG_RETAINED_GENERATIONS = 1024
+PROJECT_LESS_ENTITY_KINDS = frozenset({"role_requirement", "retired_process"})
+DEFAULT_RESIDENT_PROJECTS = 64
+DEFAULT_READ_CONNECTIONS = 4
+DEFAULT_SHARED_PROJECTIONS = 64
+PAYLOAD_ENCODING_METADATA_KEY = "payload_encoding"
+PAYLOAD_ENCODINGS = ("json", "binary")
+# Entity kinds whose JSON payloads get their datetime text parsed on load.
+DATETIME_RESTORED_ENTITY_KINDS = frozenset(
+    {
+        "calendar",
+        "process",
+        "process_role_stake_window",
+        "resource",
+        "retired_process",
+        "revision",
+        "role",
+        "role_requirement",
+    }
+)
 PERSISTING_METHOD_PREFIXES = (
     "add_",
     "clear_",
@@ -75,9 +113,16 @@ CREATE TABLE IF NOT EXISTS repository_entity(
     kind TEXT NOT NULL,
     entity_id TEXT NOT NULL,
     project_id TEXT,
-    payload_json TEXT NOT NULL,
+    payload_format TEXT NOT NULL DEFAULT 'json',
+    payload_json TEXT,
+    payload BLOB,
+    role_requirement_count INTEGER,
     updated_at TEXT NOT NULL,
-    PRIMARY KEY(kind, entity_id)
+    PRIMARY KEY(kind, entity_id),
+    CHECK (
+        (payload_format = 'json' AND payload_json IS NOT NULL AND payload IS NULL)
+        OR (payload_format = 'binary' AND payload IS NOT NULL AND payload_json IS NULL)
+    )
 )
 """
 
@@ -85,10 +130,13 @@ REVISION_ROLE_REQUIREMENTS_INSERT_TRIGGER_SQL = """
 CREATE TRIGGER IF NOT EXISTS repository_revision_role_requirements_one_insert
 BEFORE INSERT ON repository_entity
 WHEN NEW.kind = 'revision'
- AND (
-    COALESCE(json_type(NEW.payload_json, '$.data.role_requirements'), '') != 'array'
-    OR json_array_length(json_extract(NEW.payload_json, '$.data.role_requirements')) != 1
- )
+ AND CASE NEW.payload_format
+    WHEN 'json' THEN (
+        COALESCE(json_type(NEW.payload_json, '$.data.role_requirements'), '') != 'array'
+        OR json_array_length(json_extract(NEW.payload_json, '$.data.role_requirements')) != 1
+    )
+    ELSE COALESCE(NEW.role_requirement_count, -1) != 1
+ END
 BEGIN
     SELECT RAISE(
         ABORT,
@@ -99,12 +147,17 @@ END
 
 REVISION_ROLE_REQUIREMENTS_UPDATE_TRIGGER_SQL = """
 CREATE TRIGGER IF NOT EXISTS repository_revision_role_requirements_one_update
-BEFORE UPDATE OF payload_json, kind ON repository_entity
+BEFORE UPDATE OF
+    kind, payload_format, payload_json, payload, role_requirement_count
+ON repository_entity
 WHEN NEW.kind = 'revision'
- AND (
-    COALESCE(json_type(NEW.payload_json, '$.data.role_requirements'), '') != 'array'
-    OR json_array_length(json_extract(NEW.payload_json, '$.data.role_requirements')) != 1
- )
+ AND CASE NEW.payload_format
+    WHEN 'json' THEN (
+        COALESCE(json_type(NEW.payload_json, '$.data.role_requirements'), '') != 'array'
+        OR json_array_length(json_extract(NEW.payload_json, '$.data.role_requirements')) != 1
+    )
+    ELSE COALESCE(NEW.role_requirement_count, -1) != 1
+ END
 BEGIN
     SELECT RAISE(
         ABORT,
@@ -123,6 +176,64 @@ CREATE TABLE IF NOT EXISTS command_replay(
 )
 """
 
+PROJECTION_CACHE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS repository_projection_cache(
+    fingerprint TEXT PRIMARY KEY,
+    project_id TEXT NOT NULL,
+    generation INTEGER NOT NULL,
+    payload BLOB NOT NULL,
+    stored_at TEXT NOT NULL
+)
+"""
+
+PROJECT_GENERATION_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS repository_project_generation(
+    project_id TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL
+)
+"""
+
+TYPED_ENTITY_TABLE_SQL = (
+    """
+    CREATE TABLE IF NOT EXISTS repository_schedule_snapshot(
+        snapshot_id TEXT PRIMARY KEY,
+        project_id TEXT NOT NULL,
+        committed_at TEXT NOT NULL,
+        terminal_process_symbols TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS repository_schedule_snapshot_project_idx
+    ON repository_schedule_snapshot(project_id, terminal_process_symbols, committed_at)
+    """,
+)
+
+# kind -> (typed table, primary key column, columns after the primary key)
+TYPED_ENTITY_TABLES = {
+    "schedule_snapshot": (
+        "repository_schedule_snapshot",
+        "snapshot_id",
+        ("project_id", "committed_at", "terminal_process_symbols"),
+    ),
+}
+# Typed tables of typed_schema_version 1 that no query read; dropped on upgrade.
+RETIRED_TYPED_ENTITY_TABLES = (
+    "repository_process",
+    "repository_revision",
+    "repository_process_role_pin",
+    "repository_blocker",
+)
+
+CHANGE_LOG_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS repository_change_log(
+    generation INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    entity_id TEXT NOT NULL,
+    project_id TEXT,
+    PRIMARY KEY(generation, kind, entity_id)
+)
+"""
+
 METADATA_TABLE_SQL = """
 CREATE TABLE IF NOT EXISTS repository_metadata(
     key TEXT PRIMARY KEY,
@@ -138,22 +249,59 @@ class SQLiteProjectRepository:
     ``InMemoryProjectRepository`` and commits with ``replace_with``. This adapter
     keeps that contract and stores the projection as typed SQLite rows, updating
     only changed rows on commit.
+
+    Projected reads run on a snapshot of the projection and SQL reads on
+    pooled read-only connections, one snapshot per call, so neither waits
+    behind the projection lock that commits hold. Only
+    ``_persist_entity_delta`` and the command replay writers use the single
+    writer connection.
+
+    Entity payloads are JSON text in ``payload_json`` by default.
+    ``payload_encoding="binary"`` migrates the database to compact
+    ``payload_codec`` payloads in the ``payload`` column; ``None`` keeps
+    whatever encoding the database already uses. Each row's
+    ``payload_format`` says which column holds its payload.
+
+    ``shared_projections`` keeps up to that many service projections per
+    project in ``repository_projection_cache`` so other processes opening the
+    same database can reuse them; ``0`` disables the table.
     """
 
-    def __init__(self, db_path: str | Path) -> None:
+    def __init__(
+        self,
+        db_path: str | Path,
+        *,
+        command_replay_retention: dt.timedelta | None = COMMAND_REPLAY_RETENTION,
+        max_resident_projects: int | None = DEFAULT_RESIDENT_PROJECTS,
+        read_connections: int = DEFAULT_READ_CONNECTIONS,
+        payload_encoding: str | None = None,
+        shared_projections: int = 0,
+    ) -> None:
+        if payload_encoding is not None:
+            _validate_payload_encoding(payload_encoding)
         self.db_path = str(Path(db_path).expanduser().resolve())
+        self.payload_encoding = payload_encoding
+        self.shared_projections = shared_projections
+        self.command_replay_retention = command_replay_retention
+        self.max_resident_projects = max_resident_projects
+        self._repaired_generations: dict[str, tuple[int, int]] = {}
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
         self._lock = threading.RLock()
+        self._write_lock = threading.RLock()
+        self._reader = threading.local()
         self._conn = sqlite3.connect(
             self.db_path,
             timeout=30.0,
             check_same_thread=False,
         )
         self._conn.row_factory = sqlite3.Row
+        self._read_pool = _ReadConnectionPool(self.db_path, read_connections)
         self.initialize_schema()
-        self._loaded_generation = self._database_generation()
-        self._projection = self._load_projection()
-        self._repair_projection_invariants()
+        with self._read_snapshot():
+            self._read_loaded_generations()
+            self._projection = self._load_project_index()
+        self._migrate_payload_encoding()
+        self._published_projection = copy.copy(self._projection)
 
     def __getattr__(self, name: str) -> Any:
         projection = self.__dict__.get("_projection")
@@ -163,23 +311,39 @@ class SQLiteProjectRepository:
                     name,
                     persist=name.startswith(PERSISTING_METHOD_PREFIXES),
                 )
-            with self._lock:
-                self._reload_projection_if_stale()
-                return getattr(self._projection, name)
+            return getattr(self._read_projection(), name)
         raise AttributeError(name)
 
     def initialize_schema(self) -> None:
         """Create SQLite schema and performance pragmas if needed."""
-        with self._lock:
+        with self._lock, self._write_lock:
             self._conn.execute("PRAGMA journal_mode=WAL")
             self._conn.execute("PRAGMA synchronous=NORMAL")
             self._conn.execute("PRAGMA foreign_keys=ON")
             self._conn.execute("PRAGMA busy_timeout=30000")
             self._conn.execute(METADATA_TABLE_SQL)
+            self._conn.execute(PROJECT_GENERATION_TABLE_SQL)
+            self._conn.execute(CHANGE_LOG_TABLE_SQL)
+            for statement in TYPED_ENTITY_TABLE_SQL:
+                self._conn.execute(statement)
+            self._migrate_entity_payload_columns()
             self._conn.execute(ENTITY_TABLE_SQL)
             self._conn.execute(REVISION_ROLE_REQUIREMENTS_INSERT_TRIGGER_SQL)
             self._conn.execute(REVISION_ROLE_REQUIREMENTS_UPDATE_TRIGGER_SQL)
             self._conn.execute(COMMAND_REPLAY_TABLE_SQL)
+            self._conn.execute(PROJECTION_CACHE_TABLE_SQL)
+            self._conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS repository_projection_cache_project_idx
+                ON repository_projection_cache(project_id, generation)
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS command_replay_applied_idx
+                ON command_replay(applied_at)
+                """
+            )
             self._conn.execute(
                 """
                 CREATE INDEX IF NOT EXISTS repository_entity_project_idx
@@ -202,18 +366,32 @@ class SQLiteProjectRepository:
                 """,
                 (GENERATION_METADATA_KEY,),
             )
+            self._conn.execute(
+                """
+                INSERT INTO repository_metadata(key, value)
+                SELECT ?, value
+                FROM repository_metadata
+                WHERE key = ?
+                ON CONFLICT(key) DO NOTHING
+                """,
+                (CHANGE_LOG_FLOOR_METADATA_KEY, GENERATION_METADATA_KEY),
+            )
+            self._rebuild_typed_entity_rows_if_outdated()
             self._conn.commit()
             if "_projection" in self.__dict__:
-                self._loaded_generation = self._database_generation()
-                self._projection = self._load_projection()
-                self._repair_projection_invariants()
+                with self._read_snapshot():
+                    self._read_loaded_generations()
+                    self._projection = self._load_project_index()
+                self._migrate_payload_encoding()
+                self._published_projection = copy.copy(self._projection)
 
     def clone(self) -> InMemoryProjectRepository:
         """Return a transactional in-memory snapshot of durable state."""
         with self._lock:
             self._reload_projection_if_stale()
+            self._projection_residency().evict_cold()
             clone = self._projection.clone()
-            clone._sqlite_base_generation = self._loaded_generation
+            clone._sqlite_base_generations = dict(self._loaded_project_generations)
             return clone
 
     def replace_with(self, other: Any) -> None:
@@ -221,29 +399,56 @@ class SQLiteProjectRepository:
         if not isinstance(other, InMemoryProjectRepository):
             raise TypeError("SQLiteProjectRepository stages in-memory repositories")
         with self._lock:
-            expected_generation = getattr(other, "_sqlite_base_generation", None)
+            expected_generations = getattr(other, "_sqlite_base_generations", None)
             self._reload_projection_if_stale()
-            other._validate_process_role_definition_invariants()
-            other._validate_no_orphaned_blocker_processes()
-            previous = _repository_entity_rows(self._projection)
-            incoming = _repository_entity_rows(other)
-            self._loaded_generation = self._persist_entity_delta(
+            project_ids = other._staged_project_ids()
+            other._validate_process_role_definition_invariants(project_ids)
+            other._validate_no_orphaned_blocker_processes(project_ids)
+            dirty = (
+                other.dirty_entity_keys()
+                if expected_generations is not None
+                else None
+            )
+            if expected_generations is not None:
+                expected_generations = self._expected_after_repairs(expected_generations)
+            residency = self._projection_residency()
+            if dirty is None or project_ids is None:
+                residency.ensure_all()
+            else:
+                residency.ensure(project_ids)
+            previous = _repository_entity_rows(
+                self._projection,
+                dirty,
+                encoding=self._payload_encoding,
+            )
+            incoming = _repository_entity_rows(other, dirty, encoding=self._payload_encoding)
+            self._persist_entity_delta(
                 previous,
                 incoming,
-                expected_generation=expected_generation,
+                expected_generations=expected_generations,
             )
-            self._projection = other.clone()
+            self._adopt_projection(other, rebase=dirty is not None)
 
     def cache_version(self, project_id: str | None = None) -> int:
-        """Return the current database generation for service projection caches."""
-        return self._database_generation()
+        """Return the database generation for service projection caches.
+
+        With a project id this is the project's own generation, so writes to
+        other projects keep its cached projections valid.
+        """
+        with self._read_snapshot() as conn:
+            if project_id is None:
+                return self._database_generation(conn)
+            return self._database_project_generations(conn, {project_id}).get(
+                project_id,
+                0,
+            )
 
     def load_command_replay_cache(
         self,
     ) -> dict[uuid.UUID, dict[str, CommandResult | CommandErrorResult]]:
         """Load durable command replay records for service idempotency."""
-        with self._lock:
-            rows = self._conn.execute(
+        with self._read_snapshot() as conn:
+            rows = conn.execute(
                 """
                 SELECT command_id, payload_hash, result_json
                 FROM command_replay
@@ -252,24 +457,38 @@ class SQLiteProjectRepository:
             ).fetchall()
         cache: dict[uuid.UUID, dict[str, CommandResult | CommandErrorResult]] = {}
         for row in rows:
-            payload = json.loads(row["result_json"])
             command_id = uuid.UUID(str(row["command_id"]))
-            cache.setdefault(command_id, {})[row["payload_hash"]] = (
-                CommandResult.model_validate(payload)
-                if payload.get("ok")
-                else CommandErrorResult.model_validate(payload)
+            cache.setdefault(command_id, {})[row["payload_hash"]] = _replay_result(
+                row["result_json"]
             )
         return cache
 
-    def replace_command_replay_cache(
+    def load_command_replay(
         self,
-        cache: dict[Any, dict[str, CommandResult | CommandErrorResult]],
+        command_id: uuid.UUID,
+    ) -> dict[str, CommandResult | CommandErrorResult]:
+        """Return durable replay records for one command id."""
+        with self._read_snapshot() as conn:
+            rows = conn.execute(
+                """
+                SELECT payload_hash, result_json
+                FROM command_replay
+                WHERE command_id = ?
+                """,
+                (str(command_id),),
+            ).fetchall()
+        return {row["payload_hash"]: _replay_result(row["result_json"]) for row in rows}
+
+    def record_command_replay(
+        self,
+        command_id: uuid.UUID,
+        payload_hash: str,
+        result: CommandResult | CommandErrorResult,
     ) -> None:
-        """Persist the service command replay cache."""
-        now = dt.datetime.now(dt.UTC).isoformat()
-        with self._lock, self._conn:
-            self._conn.execute("DELETE FROM command_replay")
-            self._conn.executemany(
+        """Append one command replay record and drop records past retention."""
+        now = dt.datetime.now(dt.UTC)
+        with self._write_lock, self._conn:
+            self._conn.execute(
                 """
                 INSERT INTO command_replay(
                     command_id,
@@ -278,23 +497,156 @@ class SQLiteProjectRepository:
                     applied_at
                 )
                 VALUES(?, ?, ?, ?)
+                ON CONFLICT(command_id, payload_hash) DO UPDATE SET
+                    result_json = excluded.result_json,
+                    applied_at = excluded.applied_at
                 """,
-                [
-                    (
-                        str(command_id),
-                        payload_hash,
-                        _json_dumps(result.model_dump(mode="json")),
-                        now,
-                    )
-                    for command_id, records in cache.items()
-                    for payload_hash, result in records.items()
-                ],
+                (
+                    str(command_id),
+                    payload_hash,
+                    _json_dumps(result.model_dump(mode="json")),
+                    now.isoformat(),
+                ),
             )
+            if self.command_replay_retention is not None:
+                self._conn.execute(
+                    "DELETE FROM command_replay WHERE applied_at < ?",
+                    ((now - self.command_replay_retention).isoformat(),),
+                )
+
+    def load_shared_projection(self, project_id: str, fingerprint: str) -> Any | None:
+        """Return a projection stored for the project's current generation."""
+        if self.shared_projections <= 0:
+            return None
+        with self._read_snapshot() as conn:
+            generation = self._database_project_generations(conn, {project_id}).get(
+                project_id,
+                0,
+            )
+            row = conn.execute(
+                """
+                SELECT payload
+                FROM repository_projection_cache
+                WHERE fingerprint = ? AND project_id = ? AND generation = ?
+                """,
+                (fingerprint, project_id, generation),
+            ).fetchone()
+        if row is None:
+            return None
+        return _decode_payload(row["payload"])["data"]
+
+    def store_shared_projection(
+        self,
+        project_id: str,
+        generation: object,
+        fingerprint: str,
+        value: Any,
+    ) -> bool:
+        """Store a projection computed from ``generation`` of the project.
+
+        Payloads use the database's encoding but keep key order. Values that
+        would not load back equal are not stored: the binary codec rejects
+        them while encoding, and JSON payloads only take strings, numbers,
+        booleans, ``None``, lists and string-keyed dicts. Older generations of
+        the project and its least recently stored projections past
+        ``shared_projections`` are dropped. Returns whether the value was
+        stored.
+        """
+        if self.shared_projections <= 0 or type(generation) is not int:
+            return False
+        envelope = {"data": value}
+        try:
+            if self._payload_encoding == "binary":
+                payload = encode_payload(envelope)
+            elif _json_payload_ready(value):
+                payload = json.dumps(envelope, separators=(",", ":"))
+            else:
+                return False
+        except (TypeError, ValueError):
+            return False
+        with self._write_lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO repository_projection_cache(
+                    fingerprint,
+                    project_id,
+                    generation,
+                    payload,
+                    stored_at
+                )
+                VALUES(?, ?, ?, ?, ?)
+                ON CONFLICT(fingerprint) DO UPDATE SET
+                    project_id = excluded.project_id,
+                    generation = excluded.generation,
+                    payload = excluded.payload,
+                    stored_at = excluded.stored_at
+                """,
+                (
+                    fingerprint,
+                    project_id,
+                    generation,
+                    payload,
+                    dt.datetime.now(dt.UTC).isoformat(),
+                ),
+            )
+            self._conn.execute(
+                """
+                DELETE FROM repository_projection_cache
+                WHERE project_id = ? AND generation < ?
+                """,
+                (project_id, generation),
+            )
+            self._conn.execute(
+                """
+                DELETE FROM repository_projection_cache
+                WHERE project_id = ? AND fingerprint NOT IN (
+                    SELECT fingerprint
+                    FROM repository_projection_cache
+                    WHERE project_id = ?
+                    ORDER BY stored_at DESC, rowid DESC
+                    LIMIT ?
+                )
+                """,
+                (project_id, project_id, self.shared_projections),
+            )
+        return True
+
+    def schedule_snapshots_as_of(
+        self,
+        project_id: str,
+        as_of: dt.datetime,
+        terminal_process_symbols: list[str] | None = None,
+    ) -> list[ScheduleSnapshotRecord]:
+        """Return committed snapshots with an index range scan instead of a full scan."""
+        self._read_projection().get_project(project_id)
+        with self._read_snapshot() as conn:
+            rows = conn.execute(
+                """
+                SELECT entity.payload_format, entity.payload_json, entity.payload
+                FROM repository_schedule_snapshot AS snapshot
+                JOIN repository_entity AS entity
+                  ON entity.kind = 'schedule_snapshot'
+                 AND entity.entity_id = snapshot.snapshot_id
+                WHERE snapshot.project_id = ?
+                  AND snapshot.terminal_process_symbols = ?
+                  AND snapshot.committed_at <= ?
+                ORDER BY snapshot.committed_at, snapshot.snapshot_id
+                """,
+                (
+                    project_id,
+                    _json_dumps(sorted(terminal_process_symbols or [])),
+                    _sortable_datetime(as_of),
+                ),
+            ).fetchall()
+        return [
+            ScheduleSnapshotRecord.model_validate(_stored_envelope(row)["data"])
+            for row in rows
+        ]
 
     def table_names(self) -> set[str]:
         """Return SQLite table names visible to this repository."""
-        with self._lock:
-            rows = self._conn.execute(
+        with self._read_snapshot() as conn:
+            rows = conn.execute(
                 """
                 SELECT name
                 FROM sqlite_master
@@ -305,21 +657,22 @@ class SQLiteProjectRepository:
 
     def column_names(self, table_name: str) -> set[str]:
         """Return column names for a SQLite table."""
-        with self._lock:
-            rows = self._conn.execute(f"PRAGMA table_info({table_name})").fetchall()
+        with self._read_snapshot() as conn:
+            rows = conn.execute(f"PRAGMA table_info({table_name})").fetchall()
         return {str(row["name"]) for row in rows}
 
     def entity_count(self) -> int:
         """Return persisted repository entity row count."""
-        with self._lock:
-            row = self._conn.execute(
+        with self._read_snapshot() as conn:
+            row = conn.execute(
                 "SELECT COUNT(*) AS row_count FROM repository_entity"
             ).fetchone()
         return int(row["row_count"])
 
     def close(self) -> None:
-        """Close the SQLite connection."""
-        with self._lock:
+        """Close the SQLite connections."""
+        with self._lock, self._write_lock:
+            self._read_pool.close()
             try:
                 self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
             except sqlite3.Error:
@@ -328,89 +681,426 @@ class SQLiteProjectRepository:
 
     def _projection_method(self, name: str, *, persist: bool):
         def wrapper(*args, **kwargs):
+            if not persist:
+                return getattr(self._read_projection(), name)(*args, **kwargs)
             with self._lock:
                 self._reload_projection_if_stale()
-                if not persist:
-                    return getattr(self._projection, name)(*args, **kwargs)
-
-                previous = _repository_entity_rows(self._projection)
+                self._projection_residency().evict_cold()
                 staged = self._projection.clone()
                 result = getattr(staged, name)(*args, **kwargs)
-                staged._validate_process_role_definition_invariants()
-                staged._validate_no_orphaned_blocker_processes()
-                incoming = _repository_entity_rows(staged)
-                self._loaded_generation = self._persist_entity_delta(
+                project_ids = staged._staged_project_ids()
+                staged._validate_process_role_definition_invariants(project_ids)
+                staged._validate_no_orphaned_blocker_processes(project_ids)
+                dirty = staged.dirty_entity_keys()
+                self._projection_residency().ensure(project_ids or set())
+                previous = _repository_entity_rows(
+                    self._projection,
+                    dirty,
+                    encoding=self._payload_encoding,
+                )
+                incoming = _repository_entity_rows(
+                    staged,
+                    dirty,
+                    encoding=self._payload_encoding,
+                )
+                self._persist_entity_delta(
                     previous,
                     incoming,
-                    expected_generation=self._loaded_generation,
+                    expected_generations=self._loaded_project_generations,
                 )
-                self._projection = staged
+                self._adopt_projection(staged)
                 return result
 
         return wrapper
 
-    def _reload_projection_if_stale(self) -> None:
-        current_generation = self._database_generation()
-        if current_generation == getattr(self, "_loaded_generation", None):
+    def _adopt_projection(
+        self,
+        staged: InMemoryProjectRepository,
+        *,
+        rebase: bool = False,
+    ) -> None:
+        if getattr(staged, "_staged_base", None) is self._projection:
+            self._projection.replace_with(staged)
+        elif rebase:
+            # Staged before a reload; its touched projects were unchanged, so
+            # only its own entries are applied to the fresh projection.
+            self._projection.rebase_staged(staged)
+        else:
+            # A full replacement is already on disk; hydrate it again lazily.
+            self._projection = self._load_project_index()
+        self._published_projection = copy.copy(self._projection)
+
+    def _read_projection(self) -> InMemoryProjectRepository:
+        """Return a projection snapshot for one read call.
+
+        The snapshot shares the projection's containers, which commits,
+        hydration and eviction replace rather than modify, so the read sees one
+        committed generation without holding ``_lock``. Reads never wait behind
+        a commit: while another thread holds the lock they use the snapshot
+        published by the last commit. Only hydrating a project that is not
+        resident waits for the lock.
+        """
+        if not self._lock.acquire(blocking=False):
+            return self._published_projection
+        try:
+            self._reload_projection_if_stale()
+            self._projection_residency().evict_cold()
+            self._published_projection = copy.copy(self._projection)
+            return self._published_projection
+        finally:
+            self._lock.release()
+
+    @contextmanager
+    def _read_snapshot(self) -> Iterator[sqlite3.Connection]:
+        """Yield a pooled reader; nested calls on one thread share its snapshot."""
+        conn = getattr(self._reader, "conn", None)
+        if conn is not None:
+            yield conn
             return
-        self._projection = self._load_projection()
+        with self._read_pool.snapshot() as conn:
+            self._reader.conn = conn
+            try:
+                yield conn
+            finally:
+                self._reader.conn = None
+
+    def _reload_projection_if_stale(self) -> None:
+        with self._read_snapshot() as conn:
+            current_generation = self._database_generation(conn)
+            loaded_generation = getattr(self, "_loaded_generation", None)
+            if current_generation == loaded_generation:
+                return
+            if loaded_generation is not None and self._apply_change_log(
+                loaded_generation
+            ):
+                return
+            self._read_loaded_generations()
+            self._projection = self._load_project_index()
+
+    def _apply_change_log(self, loaded_generation: int) -> bool:
+        """Evict the resident projects changed since ``loaded_generation``.
+
+        Evicted projects hydrate again from disk on next use, and their index
+        records are reread. Returns False when the change log no longer covers
+        that generation and the caller must rebuild the whole index.
+        """
+        with self._read_snapshot() as conn:
+            row = conn.execute(
+                "SELECT value FROM repository_metadata WHERE key = ?",
+                (CHANGE_LOG_FLOOR_METADATA_KEY,),
+            ).fetchone()
+            if row is None or loaded_generation < int(row["value"]):
+                return False
+            current_generation = self._database_generation(conn)
+            project_generations = self._database_project_generations(conn)
+            changes = conn.execute(
+                """
+                SELECT DISTINCT kind, entity_id, project_id
+                FROM repository_change_log
+                WHERE generation > ?
+                """,
+                (loaded_generation,),
+            ).fetchall()
+        project_ids = {
+            str(change["project_id"])
+            for change in changes
+            if change["project_id"] is not None
+        }
+        project_less = {
+            (str(change["kind"]), str(change["entity_id"]))
+            for change in changes
+            if change["project_id"] is None
+        }
+        if any(kind not in PROJECT_LESS_ENTITY_KINDS for kind, _ in project_less):
+            return False
+        residency = self._projection_residency()
+        for project_id in sorted(project_ids):
+            residency.evict(project_id)
+        with self._read_snapshot():
+            self._refresh_project_index(project_ids)
+            # Role requirement rows are derived from hydrated revisions, so only
+            # retirements of deleted processes need to be applied here.
+            for kind, entity_id in sorted(project_less):
+                if kind == "retired_process":
+                    self._apply_orphaned_retirement_row(entity_id)
         self._loaded_generation = current_generation
-        self._repair_projection_invariants()
+        self._loaded_project_generations = project_generations
+        return True
 
-    def _repair_projection_invariants(self) -> None:
-        previous = self._database_entity_rows()
-        repair_at = dt.datetime.now(dt.UTC)
-        deleted = self._projection.delete_orphaned_blocker_processes(
-            edit_at=repair_at,
-        )
-        updated = self._projection.ensure_default_process_roles_for_missing_requirements(
-            edit_at=repair_at,
-        )
-        normalized = self._projection.normalize_process_role_requirements_to_single(
-            edit_at=repair_at,
-        )
-        pin_cleanup = self._projection.delete_invalid_process_role_pins(
-            edit_at=repair_at,
-        )
-        evidence_cleanup = self._projection.delete_process_evidence_line_items(
-            line_items=LEGACY_PROCESS_EVIDENCE_LINE_ITEMS,
-        )
-        self._projection._validate_process_role_definition_invariants()
-        self._projection._validate_no_orphaned_blocker_processes()
-        incoming = _repository_entity_rows(self._projection)
-        if (
-            not deleted.get("deleted_process_ids")
-            and not deleted.get("deleted_blocker_ids")
-            and not updated.get("updated_process_ids")
-            and not normalized.get("updated_process_ids")
-            and not pin_cleanup.get("deleted_pin_ids")
-            and not evidence_cleanup.get("deleted_evidence_line_ids")
-            and previous == incoming
-        ):
+    def _refresh_project_index(self, project_ids: set[str]) -> None:
+        if not project_ids:
+            return
+        ordered_ids = sorted(project_ids)
+        with self._read_snapshot() as conn:
+            rows = conn.execute(
+                f"""
+                SELECT entity_id, payload_format, payload_json, payload
+                FROM repository_entity
+                WHERE kind = 'project'
+                  AND entity_id IN ({", ".join("?" for _ in ordered_ids)})
+                """,
+                ordered_ids,
+            ).fetchall()
+        projects = {
+            str(row["entity_id"]): ProjectRecord.model_validate(
+                _stored_envelope(row)["data"],
+            )
+            for row in rows
+        }
+        index = self._projection.projects
+        data = copy.copy(index._data)
+        for project_id in ordered_ids:
+            if project_id in projects:
+                data[project_id] = projects[project_id]
+            else:
+                data.pop(project_id, None)
+        self._projection.projects = index._replaced(data)
+
+    def _apply_orphaned_retirement_row(self, entity_id: str) -> None:
+        with self._read_snapshot() as conn:
+            row = conn.execute(
+                """
+                SELECT project_id, payload_format, payload_json, payload
+                FROM repository_entity
+                WHERE kind = 'retired_process' AND entity_id = ?
+                """,
+                (entity_id,),
+            ).fetchone()
+        mapping = self._projection.retired_processes
+        retirements = copy.copy(mapping._data)
+        if row is None:
+            retirements.pop(entity_id, None)
+        elif row["project_id"] is None:
+            retirements[entity_id] = _stored_envelope(row, restore_datetimes=True)["data"]
+        self._projection.retired_processes = mapping._replaced(retirements)
+
+    def _read_loaded_generations(self) -> None:
+        # Callers load rows in the same reader snapshot, so the generations
+        # match exactly what the projection holds.
+        with self._read_snapshot() as conn:
+            self._loaded_generation = self._database_generation(conn)
+            self._loaded_project_generations = self._database_project_generations(conn)
+            self._payload_encoding = self._database_payload_encoding(conn)
+
+    def _projection_residency(self) -> _ProjectResidency:
+        return self._projection.projects._residency
+
+    def _expected_after_repairs(
+        self,
+        expected_generations: dict[str, int],
+    ) -> dict[str, int]:
+        # Hydrating a legacy project may persist repairs after a stage was
+        # cloned. The stage read the repaired rows, so that bump is no conflict.
+        return {
+            project_id: (
+                self._repaired_generations[project_id][1]
+                if self._repaired_generations.get(project_id, (None,))[0] == generation
+                else generation
+            )
+            for project_id, generation in expected_generations.items()
+        }
+
+    def _load_project_index(self) -> InMemoryProjectRepository:
+        """Return a projection that holds only project records up front.
+
+        Every other entity is hydrated one project at a time on first use; see
+        ``_ProjectResidency``.
+        """
+        projection = InMemoryProjectRepository()
+        residency = _ProjectResidency(self, projection)
+        for field_name in REPOSITORY_STATE_FIELDS:
+            if field_name == "schedule_snapshots":
+                continue
+            container_type = _ProjectIndex if field_name == "projects" else _HydratingMapping
+            setattr(
+                projection,
+                field_name,
+                container_type(residency, field_name, getattr(projection, field_name)),
+            )
+        with self._read_snapshot() as conn:
+            projects = conn.execute(
+                """
+                SELECT entity_id, payload_format, payload_json, payload
+                FROM repository_entity
+                WHERE kind = 'project'
+                ORDER BY entity_id
+                """
+            ).fetchall()
+            retirements = conn.execute(
+                """
+                SELECT entity_id, payload_format, payload_json, payload
+                FROM repository_entity
+                WHERE kind = 'retired_process' AND project_id IS NULL
+                ORDER BY entity_id
+                """
+            ).fetchall()
+        for row in projects:
+            projection.projects._data[row["entity_id"]] = ProjectRecord.model_validate(
+                _stored_envelope(row)["data"],
+            )
+        for row in retirements:
+            projection.retired_processes._data[row["entity_id"]] = _stored_envelope(
+                row,
+                restore_datetimes=True,
+            )["data"]
+        return projection
+
+    def _hydrate_projects(
+        self,
+        projection: InMemoryProjectRepository,
+        project_ids: set[str],
+    ) -> None:
+        """Load ``project_ids`` into a lazy projection and repair legacy rows.
+
+        Rows are loaded and repaired on a stage over the whole projection, so
+        legacy normalization and id collision checks still see other projects.
+        Repairs are persisted before the stage is committed.
+        """
+        with self._read_snapshot() as conn:
+            generations = self._database_project_generations(conn, project_ids)
+            staged = projection.clone()
+            self._load_projection(project_ids, repository=staged)
+            for project_id in project_ids:
+                for process_id in staged.process_ids_by_project.get(project_id, []):
+                    for revision in staged.revisions_by_process.get(process_id, []):
+                        for requirement in revision.role_requirements:
+                            if requirement.requirement_id is not None:
+                                staged.role_requirements[requirement.requirement_id] = (
+                                    requirement
+                                )
+            # Snapshots recorded before the project hydrated are kept once.
+            snapshots: dict[str, ScheduleSnapshotRecord] = {}
+            for snapshot in staged.schedule_snapshots:
+                snapshots.setdefault(snapshot.snapshot_id, snapshot)
+            if len(snapshots) != len(staged.schedule_snapshots):
+                staged.schedule_snapshots[:] = list(snapshots.values())
+            repair_at = dt.datetime.now(dt.UTC)
+            for project_id in sorted(project_ids):
+                staged.delete_orphaned_blocker_processes(
+                    project_id=project_id,
+                    edit_at=repair_at,
+                )
+                staged.ensure_default_process_roles_for_missing_requirements(
+                    project_id=project_id,
+                    edit_at=repair_at,
+                )
+                staged.normalize_process_role_requirements_to_single(
+                    project_id=project_id,
+                    edit_at=repair_at,
+                )
+                staged.delete_invalid_process_role_pins(
+                    project_id=project_id,
+                    edit_at=repair_at,
+                )
+                staged.delete_process_evidence_line_items(
+                    line_items=LEGACY_PROCESS_EVIDENCE_LINE_ITEMS,
+                    project_id=project_id,
+                )
+            staged._validate_process_role_definition_invariants(project_ids)
+            staged._validate_no_orphaned_blocker_processes(project_ids)
+            projection.replace_with(staged)
+            hydrated = projection.projects._residency.project_view(project_ids)
+            incoming = _all_repository_entity_rows(
+                hydrated,
+                encoding=self._payload_encoding,
+            )
+            previous = self._database_entity_rows(
+                project_ids,
+                role_requirement_ids=_role_requirement_ids(hydrated),
+            )
+        if previous == incoming:
             return
-        self._loaded_generation = self._persist_entity_delta(
+        self._persist_entity_delta(
             previous,
             incoming,
-            expected_generation=self._loaded_generation,
+            expected_generations=generations,
         )
+        for project_id in project_ids:
+            self._repaired_generations[project_id] = (
+                generations.get(project_id, 0),
+                self._loaded_project_generations.get(project_id, 0),
+            )
 
-    def _database_entity_rows(self) -> dict[tuple[str, str], tuple[str | None, str]]:
-        rows = self._conn.execute(
-            """
-            SELECT kind, entity_id, project_id, payload_json
-            FROM repository_entity
-            """
-        ).fetchall()
+    def _database_entity_rows(
+        self,
+        project_ids: set[str] | None = None,
+        *,
+        role_requirement_ids: set[str] | None = None,
+    ) -> EntityRows:
+        if project_ids is None:
+            with self._read_snapshot() as conn:
+                rows = conn.execute(
+                        """
+                        SELECT kind, entity_id, project_id, payload_format, payload_json, payload
+                        FROM repository_entity
+                        """
+                    ).fetchall()
+        else:
+            ordered_ids = sorted(project_ids)
+            with self._read_snapshot() as conn:
+                rows = conn.execute(
+                    f"""
+                    SELECT kind, entity_id, project_id, payload_format, payload_json, payload
+                    FROM repository_entity
+                    WHERE project_id IN ({", ".join("?" for _ in ordered_ids)})
+                    """,
+                    ordered_ids,
+                ).fetchall()
+                # Requirement rows have no project: take the ids the stored
+                # revisions reference plus ``role_requirement_ids``.
+                requirement_ids = set(role_requirement_ids or ())
+                for row in rows:
+                    if row["kind"] != "revision":
+                        continue
+                    data = _stored_envelope(row)["data"]
+                    requirement_ids.update(
+                        requirement["requirement_id"]
+                        for requirement in data.get("role_requirements") or []
+                        if requirement.get("requirement_id") is not None
+                    )
+                ordered_requirement_ids = sorted(requirement_ids)
+                rows += conn.execute(
+                    f"""
+                    SELECT kind, entity_id, project_id, payload_format, payload_json, payload
+                    FROM repository_entity
+                    WHERE kind = 'role_requirement'
+                      AND entity_id IN ({", ".join("?" for _ in ordered_requirement_ids)})
+                    """,
+                    ordered_requirement_ids,
+                ).fetchall()
         return {
             (str(row["kind"]), str(row["entity_id"])): (
                 row["project_id"],
-                row["payload_json"],
+                _stored_payload(row),
             )
             for row in rows
         }
 
-    def _database_generation(self) -> int:
-        row = self._conn.execute(
+    def _entity_project_id(self, kinds: tuple[str, ...], entity_id: str) -> str | None:
+        with self._read_snapshot() as conn:
+            row = conn.execute(
+                f"""
+                SELECT project_id
+                FROM repository_entity
+                WHERE kind IN ({", ".join("?" for _ in kinds)}) AND entity_id = ?
+                LIMIT 1
+                """,
+                (*kinds, entity_id),
+            ).fetchone()
+        return None if row is None else row["project_id"]
+
+    def _database_payload_encoding(self, conn: sqlite3.Connection) -> str:
+        row = conn.execute(
+            "SELECT value FROM repository_metadata WHERE key = ?",
+            (PAYLOAD_ENCODING_METADATA_KEY,),
+        ).fetchone()
+        if row is None:
+            return "json"
+        _validate_payload_encoding(row["value"])
+        return str(row["value"])
+
+    def _database_generation(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute(
             """
             SELECT value
             FROM repository_metadata
@@ -420,48 +1110,220 @@ class SQLiteProjectRepository:
         ).fetchone()
         return int(row["value"]) if row is not None else 0
 
+    def _database_project_generations(
+        self,
+        conn: sqlite3.Connection,
+        project_ids: set[str] | None = None,
+    ) -> dict[str, int]:
+        if project_ids is None:
+            rows = conn.execute(
+                "SELECT project_id, generation FROM repository_project_generation"
+            ).fetchall()
+        else:
+            if not project_ids:
+                return {}
+            ordered_ids = sorted(project_ids)
+            rows = conn.execute(
+                f"""
+                SELECT project_id, generation
+                FROM repository_project_generation
+                WHERE project_id IN ({", ".join("?" for _ in ordered_ids)})
+                """,
+                ordered_ids,
+            ).fetchall()
+        return {str(row["project_id"]): int(row["generation"]) for row in rows}
+
     def _persist_entity_delta(
         self,
-        previous: dict[tuple[str, str], tuple[str | None, str]],
-        incoming: dict[tuple[str, str], tuple[str | None, str]],
+        previous: EntityRows,
+        incoming: EntityRows,
         *,
-        expected_generation: int | None = None,
-    ) -> int:
+        expected_generations: dict[str, int] | None = None,
+    ) -> None:
+        """Write changed rows and bump the generation of every touched project.
+
+        ``expected_generations`` holds the per-project generations the change
+        was staged against; only projects whose rows change are checked, so
+        writers to different projects do not conflict. Rows without a project
+        (the role requirement index, orphaned retirements) always change together
+        with rows of their owning project and are not versioned separately.
+        """
         now = dt.datetime.now(dt.UTC).isoformat()
         removed = sorted(set(previous) - set(incoming))
         changed = [
-            (kind, entity_id, project_id, payload_json)
-            for (kind, entity_id), (project_id, payload_json) in sorted(incoming.items())
-            if previous.get((kind, entity_id)) != (project_id, payload_json)
+            (kind, entity_id, project_id, payload)
+            for (kind, entity_id), (project_id, payload) in sorted(incoming.items())
+            if previous.get((kind, entity_id)) != (project_id, payload)
         ]
         if not removed and not changed:
-            return self._database_generation()
+            return
+        project_ids = {previous[key][0] for key in removed}
+        for kind, entity_id, project_id, _ in changed:
+            project_ids.add(project_id)
+            if (kind, entity_id) in previous:
+                project_ids.add(previous[(kind, entity_id)][0])
+        project_ids.discard(None)
+        with self._write_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                current_generation = self._database_generation(self._conn)
+                current_project_generations = self._database_project_generations(
+                    self._conn,
+                    project_ids,
+                )
+                if expected_generations is not None:
+                    conflicts = {
+                        project_id: {
+                            "expected_generation": expected_generations.get(project_id, 0),
+                            "actual_generation": current_project_generations.get(project_id, 0),
+                        }
+                        for project_id in sorted(project_ids)
+                        if expected_generations.get(project_id, 0)
+                        != current_project_generations.get(project_id, 0)
+                    }
+                    if conflicts:
+                        raise ServiceValidationError(
+                            code="sqlite_concurrent_update",
+                            message=(
+                                "SQLite repository changed after this transaction was staged."
+                            ),
+                            details={"project_generations": conflicts},
+                        )
+                next_generation = current_generation + 1
+                next_project_generations = {
+                    project_id: current_project_generations.get(project_id, 0) + 1
+                    for project_id in project_ids
+                }
+                self._conn.executemany(
+                    """
+                    DELETE FROM repository_entity
+                    WHERE kind = ? AND entity_id = ?
+                    """,
+                    removed,
+                )
+                self._conn.executemany(
+                    """
+                    INSERT INTO repository_entity(
+                        kind,
+                        entity_id,
+                        project_id,
+                        payload_format,
+                        payload_json,
+                        payload,
+                        role_requirement_count,
+                        updated_at
+                    )
+                    VALUES(?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(kind, entity_id) DO UPDATE SET
+                        project_id = excluded.project_id,
+                        payload_format = excluded.payload_format,
+                        payload_json = excluded.payload_json,
+                        payload = excluded.payload,
+                        role_requirement_count = excluded.role_requirement_count,
+                        updated_at = excluded.updated_at
+                    """,
+                    [
+                        (
+                            kind,
+                            entity_id,
+                            project_id,
+                            *_entity_payload_columns(kind, payload),
+                            now,
+                        )
+                        for kind, entity_id, project_id, payload in changed
+                    ],
+                )
+                self._conn.execute(
+                    """
+                    UPDATE repository_metadata
+                    SET value = ?
+                    WHERE key = ?
+                    """,
+                    (str(next_generation), GENERATION_METADATA_KEY),
+                )
+                self._conn.executemany(
+                    """
+                    INSERT INTO repository_project_generation(project_id, generation)
+                    VALUES(?, ?)
+                    ON CONFLICT(project_id) DO UPDATE SET
+                        generation = excluded.generation
+                    """,
+                    sorted(next_project_generations.items()),
+                )
+                self._sync_typed_entity_rows(removed, changed)
+                self._record_change_log(
+                    next_generation,
+                    [
+                        (kind, entity_id, previous[(kind, entity_id)][0])
+                        for kind, entity_id in removed
+                    ]
+                    + [(kind, entity_id, project_id) for kind, entity_id, project_id, _ in changed],
+                )
+            except Exception:
+                self._conn.rollback()
+                raise
+            else:
+                self._conn.commit()
+            if current_generation == self._loaded_generation:
+                self._loaded_generation = next_generation
+            self._loaded_project_generations.update(next_project_generations)
+
+    def _rebuild_typed_entity_rows_if_outdated(self) -> None:
+        row = self._conn.execute(
+            "SELECT value FROM repository_metadata WHERE key = ?",
+            (TYPED_SCHEMA_METADATA_KEY,),
+        ).fetchone()
+        if row is not None and int(row["value"]) == TYPED_SCHEMA_VERSION:
+            return
+        for table in RETIRED_TYPED_ENTITY_TABLES:
+            self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+        for table, _, _ in TYPED_ENTITY_TABLES.values():
+            self._conn.execute(f"DELETE FROM {table}")
+        rows = self._conn.execute(
+            f"""
+            SELECT kind, entity_id, project_id, payload_format, payload_json, payload
+            FROM repository_entity
+            WHERE kind IN ({", ".join("?" for _ in TYPED_ENTITY_TABLES)})
+            """,
+            list(TYPED_ENTITY_TABLES),
+        ).fetchall()
+        self._sync_typed_entity_rows(
+            [],
+            [
+                (row["kind"], row["entity_id"], row["project_id"], _stored_payload(row))
+                for row in rows
+            ],
+        )
+        self._conn.execute(
+            """
+            INSERT INTO repository_metadata(key, value)
+            VALUES(?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value
+            """,
+            (TYPED_SCHEMA_METADATA_KEY, str(TYPED_SCHEMA_VERSION)),
+        )
+
+    def _migrate_entity_payload_columns(self) -> None:
+        """Rebuild an entity table from before payloads carried a format tag.
+
+        That layout declared ``payload_json TEXT NOT NULL``, which SQLite cannot
+        relax in place, so its rows are copied into the current table as
+        ``json`` payloads. The old triggers and index are dropped with the old
+        table and recreated by ``initialize_schema``.
+        """
         self._conn.execute("BEGIN IMMEDIATE")
         try:
-            current_generation = self._database_generation()
-            if (
-                expected_generation is not None
-                and expected_generation != current_generation
-            ):
-                raise ServiceValidationError(
-                    code="sqlite_concurrent_update",
-                    message=(
-                        "SQLite repository changed after this transaction was staged."
-                    ),
-                    details={
-                        "expected_generation": expected_generation,
-                        "actual_generation": current_generation,
-                    },
-                )
-            next_generation = current_generation + 1
-            self._conn.executemany(
-                """
-                DELETE FROM repository_entity
-                WHERE kind = ? AND entity_id = ?
-                """,
-                removed,
-            )
-            self._conn.executemany(
+            # Checked under the write lock so concurrent openers rebuild once.
+            columns = {
+                row["name"]
+                for row in self._conn.execute("PRAGMA table_info(repository_entity)")
+            }
+            if not columns or "payload_format" in columns:
+                self._conn.rollback()
+                return
+            self._conn.execute("ALTER TABLE repository_entity RENAME TO repository_entity_legacy")
+            self._conn.execute(ENTITY_TABLE_SQL)
+            self._conn.execute(
                 """
                 INSERT INTO repository_entity(
                     kind,
@@ -470,45 +1332,199 @@ class SQLiteProjectRepository:
                     payload_json,
                     updated_at
                 )
-                VALUES(?, ?, ?, ?, ?)
-                ON CONFLICT(kind, entity_id) DO UPDATE SET
-                    project_id = excluded.project_id,
-                    payload_json = excluded.payload_json,
-                    updated_at = excluded.updated_at
-                """,
-                [
-                    (kind, entity_id, project_id, payload_json, now)
-                    for kind, entity_id, project_id, payload_json in changed
-                ],
-            )
-            self._conn.execute(
+                SELECT kind, entity_id, project_id, payload_json, updated_at
+                FROM repository_entity_legacy
                 """
-                UPDATE repository_metadata
-                SET value = ?
-                WHERE key = ?
-                """,
-                (str(next_generation), GENERATION_METADATA_KEY),
             )
+            self._conn.execute("DROP TABLE repository_entity_legacy")
         except Exception:
             self._conn.rollback()
             raise
         else:
             self._conn.commit()
-            return next_generation
 
-    def _load_projection(self) -> InMemoryProjectRepository:
-        repository = InMemoryProjectRepository()
+    def _migrate_payload_encoding(self) -> None:
+        """Re-encode every entity payload when ``payload_encoding`` changes.
+
+        Rows are rewritten from the fully hydrated projection, so they match
+        what later commits serialize byte for byte. All generations are bumped
+        and the change log is cleared, so other open repositories reload fully
+        and pick up the new encoding.
+        """
+        target = self.payload_encoding or self._payload_encoding
+        if target == self._payload_encoding:
+            return
         with self._lock:
-            rows = self._conn.execute(
-                """
-                SELECT kind, entity_id, payload_json
-                FROM repository_entity
-                ORDER BY kind, entity_id
-                """
-            ).fetchall()
+            self._projection_residency().ensure_all()
+            incoming = _all_repository_entity_rows(self._projection, encoding=target)
+            with self._write_lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    generation = self._database_generation(self._conn)
+                    if generation != self._loaded_generation:
+                        raise ServiceValidationError(
+                            code="sqlite_concurrent_update",
+                            message=(
+                                "SQLite repository changed while its payloads were "
+                                "being re-encoded."
+                            ),
+                            details={
+                                "expected_generation": self._loaded_generation,
+                                "actual_generation": generation,
+                            },
+                        )
+                    stored = self._conn.execute(
+                        """
+                        SELECT kind, entity_id, payload_format, payload_json, payload
+                        FROM repository_entity
+                        """
+                    ).fetchall()
+                    self._conn.executemany(
+                        """
+                        UPDATE repository_entity
+                        SET payload_format = ?,
+                            payload_json = ?,
+                            payload = ?,
+                            role_requirement_count = ?
+                        WHERE kind = ? AND entity_id = ?
+                        """,
+                        [
+                            (
+                                *_entity_payload_columns(
+                                    row["kind"],
+                                    incoming[(row["kind"], row["entity_id"])][1]
+                                    if (row["kind"], row["entity_id"]) in incoming
+                                    else _reencode_payload(_stored_envelope(row), target),
+                                ),
+                                row["kind"],
+                                row["entity_id"],
+                            )
+                            for row in stored
+                        ],
+                    )
+                    self._conn.execute(
+                        "UPDATE repository_project_generation SET generation = generation + 1"
+                    )
+                    self._conn.execute("DELETE FROM repository_change_log")
+                    self._conn.executemany(
+                        """
+                        INSERT INTO repository_metadata(key, value)
+                        VALUES(?, ?)
+                        ON CONFLICT(key) DO UPDATE SET value = excluded.value
+                        """,
+                        [
+                            (GENERATION_METADATA_KEY, str(generation + 1)),
+                            (CHANGE_LOG_FLOOR_METADATA_KEY, str(generation + 1)),
+                            (PAYLOAD_ENCODING_METADATA_KEY, target),
+                        ],
+                    )
+                except Exception:
+                    self._conn.rollback()
+                    raise
+                else:
+                    self._conn.commit()
+            self._read_loaded_generations()
+
+    def _sync_typed_entity_rows(
+        self,
+        removed: list[tuple[str, str]],
+        changed: list[tuple[str, str, str | None, str | bytes]],
+    ) -> None:
+        """Mirror entity kinds with typed, indexed tables into those tables."""
+        for kind, entity_id in removed:
+            if kind in TYPED_ENTITY_TABLES:
+                table, key_column, _ = TYPED_ENTITY_TABLES[kind]
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE {key_column} = ?",
+                    (entity_id,),
+                )
+        for kind, entity_id, project_id, payload in changed:
+            if kind not in TYPED_ENTITY_TABLES:
+                continue
+            table, key_column, columns = TYPED_ENTITY_TABLES[kind]
+            envelope = _decode_payload(payload)
+            self._conn.execute(
+                f"""
+                INSERT OR REPLACE INTO {table}({key_column}, {", ".join(columns)})
+                VALUES({", ".join("?" for _ in range(len(columns) + 1))})
+                """,
+                (entity_id, *_typed_entity_values(kind, project_id, envelope)),
+            )
+
+    def _record_change_log(
+        self,
+        generation: int,
+        entries: list[tuple[str, str, str | None]],
+    ) -> None:
+        self._conn.executemany(
+            """
+            INSERT OR REPLACE INTO repository_change_log(
+                generation,
+                kind,
+                entity_id,
+                project_id
+            )
+            VALUES(?, ?, ?, ?)
+            """,
+            [(generation, kind, entity_id, project_id) for kind, entity_id, project_id in entries],
+        )
+        floor = generation - CHANGE_LOG_RETAINED_GENERATIONS
+        if floor <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM repository_change_log WHERE generation <= ?",
+            (floor,),
+        )
+        self._conn.execute(
+            """
+            UPDATE repository_metadata
+            SET value = MAX(CAST(value AS INTEGER), ?)
+            WHERE key = ?
+            """,
+            (floor, CHANGE_LOG_FLOOR_METADATA_KEY),
+        )
+
+    def _load_projection(
+        self,
+        project_ids: set[str] | None = None,
+        *,
+        repository: InMemoryProjectRepository | None = None,
+    ) -> InMemoryProjectRepository:
+        if repository is None:
+            repository = InMemoryProjectRepository()
+        with self._read_snapshot() as conn:
+            if project_ids is None:
+                rows = conn.execute(
+                    """
+                    SELECT kind, entity_id, payload_format, payload_json, payload
+                    FROM repository_entity
+                    ORDER BY kind, entity_id
+                    """
+                ).fetchall()
+            elif not project_ids:
+                rows = []
+            else:
+                ordered_ids = sorted(project_ids)
+                rows = conn.execute(
+                    f"""
+                    SELECT kind, entity_id, payload_format, payload_json, payload
+                    FROM repository_entity
+                    WHERE project_id IN ({", ".join("?" for _ in ordered_ids)})
+                    ORDER BY kind, entity_id
+                    """,
+                    ordered_ids,
+                ).fetchall()
         grouped: dict[str, list[tuple[str, dict[str, Any]]]] = defaultdict(list)
         for row in rows:
-            grouped[row["kind"]].append((row["entity_id"], json.loads(row["payload_json"])))
+            grouped[row["kind"]].append(
+                (
+                    row["entity_id"],
+                    _stored_envelope(
+                        row,
+                        restore_datetimes=row["kind"] in DATETIME_RESTORED_ENTITY_KINDS,
+                    ),
+                )
+            )
 
         for entity_id, envelope in _ordered(grouped["project"]):
             repository.projects[entity_id] = ProjectRecord.model_validate(
@@ -516,7 +1532,7 @@ class SQLiteProjectRepository:
             )
 
         for entity_id, envelope in _ordered(grouped["role"]):
-            role = _restore_datetime_values(envelope["data"])
+            role = envelope["data"]
             repository.roles[entity_id] = role
             repository.role_ids_by_project[role["project_id"]].append(entity_id)
 
@@ -557,7 +1573,7 @@ class SQLiteProjectRepository:
         for entity_id, envelope in _ordered(grouped["process_role_stake_window"]):
             if entity_id in repository.process_role_pins:
                 continue
-            data = _restore_datetime_values(envelope["data"])
+            data = envelope["data"]
             pinned_at = data["starts_at"]
             finished_at = data.get("ends_at")
             status = "pinned_finished" if finished_at is not None else "pinned_started"
@@ -595,9 +1611,7 @@ class SQLiteProjectRepository:
             )
 
         for entity_id, envelope in _ordered(grouped["retired_process"]):
-            repository.retired_processes[entity_id] = _restore_datetime_values(
-                envelope["data"],
-            )
+            repository.retired_processes[entity_id] = envelope["data"]
 
         for _, envelope in _ordered(grouped["process_alias"]):
             data = envelope["data"]
@@ -759,10 +1773,505 @@ class SQLiteProjectRepository:
         return repository
 
 
+class _ReadConnectionPool:
+    """Read-only SQLite connections reused across reader snapshots.
+
+    Each ``snapshot`` holds one connection inside a deferred transaction, so
+    every query in it sees the same committed state. The pool never blocks:
+    a busy pool opens another connection and keeps at most ``size`` idle.
+    """
+
+    def __init__(self, db_path: str, size: int) -> None:
+        self.db_path = db_path
+        self.size = size
+        self._idle: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def snapshot(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._connect()
+        try:
+            conn.execute("BEGIN")
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._release(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=30.0,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only=ON")
+        conn.execute("PRAGMA busy_timeout=30000")
+        return conn
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            if not self._closed and len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+
+class _ProjectResidency:
+    """Hydrates the entities of a lazy projection one project at a time.
+
+    Projects are loaded on first use and evicted least recently used first once
+    more than ``max_resident_projects`` are loaded. Eviction only happens at
+    the start of repository calls and publishes new mappings, so reads already
+    running on a projection snapshot keep the evicted entries. The projection
+    always matches committed rows, so evicting a project only releases memory.
+    """
+
+    def __init__(
+        self,
+        repository: SQLiteProjectRepository,
+        projection: InMemoryProjectRepository,
+    ) -> None:
+        self._repository = repository
+        self._projection = projection
+        self.resident: OrderedDict[str, None] = OrderedDict()
+        self._loading: set[str] = set()
+
+    def touch(self, project_id: str) -> None:
+        try:
+            self.resident.move_to_end(project_id)
+        except KeyError:
+            self.ensure({project_id})
+
+    def adopt(self, project_id: str) -> None:
+        """Mark a project created in memory as resident without loading it."""
+        self.resident[project_id] = None
+
+    def forget(self, project_id: str) -> None:
+        self.resident.pop(project_id, None)
+
+    def ensure(self, project_ids: Iterable[str]) -> None:
+        project_ids = [
+            project_id for project_id in project_ids if project_id not in self.resident
+        ]
+        if not project_ids:
+            return
+        with self._repository._lock:
+            index = self._projection.projects._data
+            missing = {
+                project_id
+                for project_id in project_ids
+                if project_id not in self.resident
+                and project_id not in self._loading
+                and project_id in index
+            }
+            if not missing:
+                return
+            self._loading |= missing
+            try:
+                self._repository._hydrate_projects(self._projection, missing)
+            except Exception:
+                for project_id in missing:
+                    self.evict(project_id)
+                raise
+            finally:
+                self._loading -= missing
+            for project_id in sorted(missing):
+                self.resident[project_id] = None
+
+    def ensure_all(self) -> None:
+        self.ensure(list(self._projection.projects._data))
+
+    def evict_cold(self) -> None:
+        limit = self._repository.max_resident_projects
+        if limit is None:
+            return
+        with self._repository._lock:
+            while len(self.resident) > limit:
+                self.evict(next(iter(self.resident)))
+
+    def evict(self, project_id: str) -> None:
+        with self._repository._lock:
+            self.resident.pop(project_id, None)
+            projection = self._projection
+            for field_name, keys in self._owned_keys(project_id).items():
+                if not keys:
+                    continue
+                mapping = getattr(projection, field_name)
+                data = copy.copy(mapping._data)
+                for key in keys:
+                    data.pop(key, None)
+                setattr(projection, field_name, mapping._replaced(data))
+            projection.schedule_snapshots = [
+                snapshot
+                for snapshot in projection.schedule_snapshots
+                if snapshot.project_id != project_id
+            ]
+            projection._reset_as_of_timelines()
+
+    def project_view(self, project_ids: set[str]) -> InMemoryProjectRepository:
+        """Return a plain repository holding only the entries of ``project_ids``."""
+        view = InMemoryProjectRepository()
+        for project_id in sorted(project_ids):
+            for field_name, keys in self._owned_keys(project_id).items():
+                data = getattr(self._projection, field_name)._data
+                target = getattr(view, field_name)
+                for key in keys:
+                    if key in data:
+                        target[key] = data[key]
+            view.projects[project_id] = self._projection.projects._data[project_id]
+            view.schedule_snapshots.extend(
+                snapshot
+                for snapshot in self._projection.schedule_snapshots
+                if snapshot.project_id == project_id
+            )
+        return view
+
+    def owner(self, field_name: str, key: Any, value: Any = _MISSING) -> str | None:
+        """Return the project that owns ``key`` in ``field_name``, if known."""
+        if value is not _MISSING:
+            project_id = _scope_get(value, "project_id")
+            if isinstance(project_id, str):
+                return project_id
+        if field_name in _PROJECT_KEYED_STATE_FIELDS:
+            return key if isinstance(key, str) else None
+        if field_name in _PROJECT_TUPLE_KEYED_STATE_FIELDS:
+            return key[0] if isinstance(key, tuple) and key else None
+        if field_name == "role_requirements" or not isinstance(key, str):
+            # Requirements arrive with their revisions; unknown ids stay missing.
+            return None
+        if field_name in {"revisions_by_process", "retired_processes"}:
+            kinds: tuple[str, ...] = ("process",)
+        elif field_name == "process_role_pins":
+            kinds = ("process_role_pin", "process_role_stake_window")
+        else:
+            kinds = (_RECORD_STATE_KINDS[field_name],)
+        return self._repository._entity_project_id(kinds, key)
+
+    def _owned_keys(self, project_id: str) -> dict[str, list[Any]]:
+        projection = self._projection
+        process_ids = {
+            process_id
+            for process_id, process in projection.processes._data.items()
+            if process.project_id == project_id
+        }
+        requirement_ids = {
+            requirement.requirement_id
+            for process_id in process_ids
+            for revision in projection.revisions_by_process._data.get(process_id, [])
+            for requirement in revision.role_requirements
+        }
+        owned: dict[str, list[Any]] = {}
+        for field_name in REPOSITORY_STATE_FIELDS:
+            if field_name in {"projects", "schedule_snapshots"}:
+                continue
+            data = getattr(projection, field_name)._data
+            if field_name in _PROJECT_KEYED_STATE_FIELDS:
+                keys = [project_id] if project_id in data else []
+            elif field_name in _PROJECT_TUPLE_KEYED_STATE_FIELDS:
+                keys = [key for key in data if key[0] == project_id]
+            elif field_name in {"revisions_by_process", "retired_processes"}:
+                keys = [key for key in data if key in process_ids]
+            elif field_name == "role_requirements":
+                keys = [key for key in data if key in requirement_ids]
+            else:
+                keys = [
+                    key
+                    for key, value in data.items()
+                    if _scope_get(value, "project_id") == project_id
+                ]
+            owned[field_name] = keys
+        return owned
+
+
+class _HydratingMapping(MutableMapping):
+    """Projection mapping that hydrates the owning project on a key miss.
+
+    Hits are plain dictionary lookups. Iteration and ``len`` hydrate every
+    project first, since they observe the whole mapping; readers after one
+    project's records go through its ``*_ids_by_project`` index instead.
+    """
+
+    def __init__(
+        self,
+        residency: _ProjectResidency,
+        field_name: str,
+        data: dict[Any, Any],
+    ) -> None:
+        self._residency = residency
+        self._field_name = field_name
+        self._data = data
+        self.default_factory = getattr(data, "default_factory", None)
+
+    def __copy__(self) -> _HydratingMapping:
+        return self._replaced(copy.copy(self._data))
+
+    def _replaced(self, data: dict[Any, Any]) -> _HydratingMapping:
+        """Return a mapping of the same field and residency over ``data``."""
+        return type(self)(self._residency, self._field_name, data)
+
+    def _hydrate_owner(self, key: Any, value: Any = _MISSING) -> None:
+        project_id = self._residency.owner(self._field_name, key, value)
+        if project_id is not None:
+            self._residency.ensure({project_id})
+
+    def _current_data(self) -> dict[Any, Any]:
+        # Hydration publishes a new mapping on the projection, so reads that
+        # missed here look the key up again in the one now published.
+        return getattr(self._residency._projection, self._field_name)._data
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self._data.get(key, _MISSING)
+        if value is _MISSING:
+            self._hydrate_owner(key)
+            return self._current_data()[key]
+        return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = self._data.get(key, _MISSING)
+        if value is _MISSING:
+            self._hydrate_owner(key)
+            return self._current_data().get(key, default)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._data:
+            return True
+        self._hydrate_owner(key)
+        return key in self._current_data()
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if key not in self._data:
+            self._hydrate_owner(key, value)
+        self._data[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        if key not in self._data:
+            self._hydrate_owner(key)
+        del self._data[key]
+
+    def pop(self, key: Any, default: Any = _MISSING) -> Any:
+        if key not in self:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        return self._data.pop(key)
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        self._residency.ensure_all()
+        return iter(list(self._current_data()))
+
+    def __len__(self) -> int:
+        self._residency.ensure_all()
+        return len(self._current_data())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._data!r})"
+
+
+class _ProjectIndex(_HydratingMapping):
+    """Always-resident project records; looking a project up hydrates it.
+
+    Iterating the index (``list_projects``) never loads project entities.
+    """
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self._data[key]
+        self._residency.touch(key)
+        return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = self._data.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        self._residency.touch(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        if key not in self._data:
+            return False
+        self._residency.touch(key)
+        return True
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if key not in self._data:
+            self._residency.adopt(key)
+        self._data[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        del self._data[key]
+        self._residency.forget(key)
+
+    def pop(self, key: Any, default: Any = _MISSING) -> Any:
+        if key not in self._data:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        self._residency.forget(key)
+        return self._data.pop(key)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def values(self):
+        return self._data.values()
+
+    def items(self):
+        return self._data.items()
+
+
+ORDERED_RECORD_KINDS = {
+    "role": ("roles", "role_ids_by_project"),
+    "calendar": ("calendars", "calendar_ids_by_project"),
+    "resource": ("resources", "resource_ids_by_project"),
+    "process": ("processes", "process_ids_by_project"),
+    "process_role_pin": ("process_role_pins", "process_role_pin_ids_by_project"),
+    "blocker": ("blockers", "blocker_ids_by_project"),
+    "milestone": ("milestones", "milestone_ids_by_project"),
+    "slack_run": ("slack_runs", "slack_run_ids_by_project"),
+    "slack_outbox": ("slack_outbox", "slack_outbox_ids_by_project"),
+    "pm_communication_evidence": (
+        "pm_communication_evidence",
+        "pm_communication_evidence_ids_by_project",
+    ),
+    "process_evidence_line_item": (
+        "process_evidence_line_items",
+        "process_evidence_line_item_ids_by_project",
+    ),
+    "resource_evidence_line_item": (
+        "resource_evidence_line_items",
+        "resource_evidence_line_item_ids_by_project",
+    ),
+}
+EntityRows = dict[tuple[str, str], tuple[str | None, str | bytes]]
+
+
 def _repository_entity_rows(
     repository: InMemoryProjectRepository,
-) -> dict[tuple[str, str], tuple[str | None, str]]:
-    rows: dict[tuple[str, str], tuple[str | None, str]] = {}
+    entity_keys: set[tuple[str, Any]] | None = None,
+    *,
+    encoding: str = "json",
+) -> EntityRows:
+    """Serialize repository entities, limited to ``entity_keys`` when given.
+
+    ``entity_keys`` uses the natural keys returned by
+    ``InMemoryProjectRepository.dirty_entity_keys``. Keys whose entity no
+    longer exists produce no row, so diffing the previous and staged rows for
+    the same keys yields both upserts and deletes.
+    """
+    if entity_keys is None:
+        return _all_repository_entity_rows(repository, encoding=encoding)
+    rows: EntityRows = {}
+    snapshots_by_id: dict[str, ScheduleSnapshotRecord] | None = None
+    for kind, key in entity_keys:
+        if kind == "schedule_snapshot" and snapshots_by_id is None:
+            snapshots_by_id = {
+                snapshot.snapshot_id: snapshot
+                for snapshot in repository.schedule_snapshots
+            }
+        row = _repository_entity_row(repository, kind, key, snapshots_by_id or {})
+        if row is not None:
+            entity_id, project_id, data, order = row
+            rows[(kind, entity_id)] = (project_id, _entity_payload(data, order, encoding))
+    return rows
+
+
+def _repository_entity_row(
+    repository: InMemoryProjectRepository,
+    kind: str,
+    key: Any,
+    snapshots_by_id: dict[str, ScheduleSnapshotRecord],
+) -> tuple[str, str | None, Any, int | None] | None:
+    if kind in ORDERED_RECORD_KINDS:
+        records_name, ids_name = ORDERED_RECORD_KINDS[kind]
+        record = getattr(repository, records_name).get(key)
+        if record is None:
+            return None
+        project_id = _record_project_id(record, "project_id")
+        project_ids = getattr(repository, ids_name).get(project_id, [])
+        order = project_ids.index(key) if key in project_ids else None
+        return key, project_id, record, order
+    if kind == "revision":
+        process_id, revision_id = key
+        for index, revision in enumerate(repository.revisions_by_process.get(process_id, [])):
+            if revision.revision_id == revision_id:
+                return revision_id, revision.project_id, revision, index
+        return None
+    if kind == "project":
+        project = repository.projects.get(key)
+        return None if project is None else (key, key, project, None)
+    if kind == "role_requirement":
+        requirement = repository.role_requirements.get(key)
+        return None if requirement is None else (key, None, requirement, None)
+    if kind == "retired_process":
+        retirement = repository.retired_processes.get(key)
+        if retirement is None:
+            return None
+        process = repository.processes.get(key)
+        return key, process.project_id if process is not None else None, retirement, None
+    if kind == "process_alias":
+        project_id, alias = key
+        process_id = repository.process_aliases.get(project_id, {}).get(alias)
+        if process_id is None:
+            return None
+        source = repository.process_alias_sources.get(project_id, {}).get(alias, "agent")
+        return _process_alias_entity(project_id, alias, process_id, source)
+    if kind == "dependency_edge":
+        edge_id = repository.dependency_edge_ids.get(key)
+        return None if edge_id is None else _dependency_edge_entity(key, edge_id)
+    if kind == "schedule_snapshot":
+        snapshot = snapshots_by_id.get(key)
+        return None if snapshot is None else (key, snapshot.project_id, snapshot, None)
+    if kind in {"slack_project_config", "slack_encrypted_token"}:
+        records = (
+            repository.slack_project_configs
+            if kind == "slack_project_config"
+            else repository.slack_encrypted_tokens
+        )
+        record = records.get(key)
+        return None if record is None else (key, key, record, None)
+    if kind in {"slack_resource_mapping", "slack_collection_cursor"}:
+        records = (
+            repository.slack_resource_mappings
+            if kind == "slack_resource_mapping"
+            else repository.slack_collection_cursors
+        )
+        record = records.get(key)
+        if record is None:
+            return None
+        return _composite_entity_id(*key), record.project_id, record, None
+    if kind == "slack_outbox_dedupe":
+        outbox_id = repository.slack_outbox_dedupe.get(key)
+        return None if outbox_id is None else _slack_outbox_dedupe_entity(key, outbox_id)
+    raise ValueError(f"Unknown repository entity kind: {kind!r}")
+
+
+def _all_repository_entity_rows(
+    repository: InMemoryProjectRepository,
+    *,
+    encoding: str = "json",
+) -> EntityRows:
+    rows: EntityRows = {}
 
     def add(
         kind: str,
@@ -772,55 +2281,25 @@ def _repository_entity_rows(
         *,
         order: int | None = None,
     ) -> None:
-        envelope: dict[str, Any] = {"data": _normalize_json(data)}
-        if order is not None:
-            envelope["order"] = order
-        rows[(kind, entity_id)] = (project_id, _json_dumps(envelope))
+        rows[(kind, entity_id)] = (project_id, _entity_payload(data, order, encoding))
 
     for project_id, project in sorted(repository.projects.items()):
         add("project", project_id, project_id, project)
 
-    _add_ordered_records(
-        rows,
-        kind="role",
-        id_by_project=repository.role_ids_by_project,
-        records=repository.roles,
-        project_field="project_id",
-    )
-    _add_ordered_records(
-        rows,
-        kind="calendar",
-        id_by_project=repository.calendar_ids_by_project,
-        records=repository.calendars,
-        project_field="project_id",
-    )
-    _add_ordered_records(
-        rows,
-        kind="resource",
-        id_by_project=repository.resource_ids_by_project,
-        records=repository.resources,
-        project_field="project_id",
-    )
-    _add_ordered_records(
-        rows,
-        kind="process",
-        id_by_project=repository.process_ids_by_project,
-        records=repository.processes,
-        project_field="project_id",
-    )
+    for kind, (records_name, ids_name) in ORDERED_RECORD_KINDS.items():
+        _add_ordered_records(
+            rows,
+            kind=kind,
+            id_by_project=getattr(repository, ids_name),
+            records=getattr(repository, records_name),
+            project_field="project_id",
+            encoding=encoding,
+        )
 
     for _process_id, revisions in sorted(repository.revisions_by_process.items()):
         for index, revision in enumerate(revisions):
             add("revision", revision.revision_id, revision.project_id, revision, order=index)
 
-    _add_ordered_records(
-        rows,
-        kind="process_role_pin",
-        id_by_project=repository.process_role_pin_ids_by_project,
-        records=repository.process_role_pins,
-        project_field="project_id",
-    )
-
     for requirement_id, requirement in sorted(repository.role_requirements.items()):
         add("role_requirement", requirement_id, None, requirement)
 
@@ -833,196 +2312,275 @@ def _repository_entity_rows(
 
     for project_id, aliases in sorted(repository.process_aliases.items()):
         sources = repository.process_alias_sources.get(project_id, {})
-        for index, (alias, process_id) in enumerate(sorted(aliases.items())):
-            add(
-                "process_alias",
-                _composite_entity_id(project_id, alias),
+        for alias, process_id in sorted(aliases.items()):
+            entity_id, _, data, _ = _process_alias_entity(
                 project_id,
-                {
-                    "project_id": project_id,
-                    "alias": alias,
-                    "process_id": process_id,
-                    "source": sources.get(alias, "agent"),
-                },
-                order=index,
+                alias,
+                process_id,
+                sources.get(alias, "agent"),
             )
+            add("process_alias", entity_id, project_id, data)
 
-    for index, ((project_id, predecessor_id, successor_id), edge_id) in enumerate(
-        sorted(repository.dependency_edge_ids.items())
-    ):
-        add(
-            "dependency_edge",
-            _composite_entity_id(project_id, predecessor_id, successor_id),
-            project_id,
-            {
-                "project_id": project_id,
-                "predecessor_process_id": predecessor_id,
-                "successor_process_id": successor_id,
-                "edge_id": edge_id,
-            },
-            order=index,
-        )
-
-    _add_ordered_records(
-        rows,
-        kind="blocker",
-        id_by_project=repository.blocker_ids_by_project,
-        records=repository.blockers,
-        project_field="project_id",
-    )
+    for key, edge_id in sorted(repository.dependency_edge_ids.items()):
+        entity_id, project_id, data, _ = _dependency_edge_entity(key, edge_id)
+        add("dependency_edge", entity_id, project_id, data)
 
-    for index, snapshot in enumerate(repository.schedule_snapshots):
-        add(
-            "schedule_snapshot",
-            snapshot.snapshot_id,
-            snapshot.project_id,
-            snapshot,
-            order=index,
-        )
-
-    _add_ordered_records(
-        rows,
-        kind="milestone",
-        id_by_project=repository.milestone_ids_by_project,
-        records=repository.milestones,
-        project_field="project_id",
-    )
+    for snapshot in repository.schedule_snapshots:
+        add("schedule_snapshot", snapshot.snapshot_id, snapshot.project_id, snapshot)
 
     for project_id, config in sorted(repository.slack_project_configs.items()):
         add("slack_project_config", project_id, project_id, config)
 
-    for index, mapping in enumerate(
-        sorted(
-            repository.slack_resource_mappings.values(),
-            key=lambda item: (item.project_id, item.resource_id),
-        )
-    ):
+    for key, mapping in sorted(repository.slack_resource_mappings.items()):
         add(
             "slack_resource_mapping",
-            _composite_entity_id(mapping.project_id, mapping.resource_id),
+            _composite_entity_id(*key),
             mapping.project_id,
             mapping,
-            order=index,
         )
 
-    for index, cursor in enumerate(
-        sorted(
-            repository.slack_collection_cursors.values(),
-            key=lambda item: (item.project_id, item.conversation_id),
-        )
-    ):
+    for key, cursor in sorted(repository.slack_collection_cursors.items()):
         add(
             "slack_collection_cursor",
-            _composite_entity_id(cursor.project_id, cursor.conversation_id),
+            _composite_entity_id(*key),
             cursor.project_id,
             cursor,
-            order=index,
         )
 
     for project_id, token in sorted(repository.slack_encrypted_tokens.items()):
         add("slack_encrypted_token", project_id, project_id, token)
 
-    _add_ordered_records(
-        rows,
-        kind="slack_run",
-        id_by_project=repository.slack_run_ids_by_project,
-        records=repository.slack_runs,
-        project_field="project_id",
-    )
-    _add_ordered_records(
-        rows,
-        kind="slack_outbox",
-        id_by_project=repository.slack_outbox_ids_by_project,
-        records=repository.slack_outbox,
-        project_field="project_id",
-    )
+    for dedupe_key, outbox_id in sorted(repository.slack_outbox_dedupe.items()):
+        entity_id, project_id, data, _ = _slack_outbox_dedupe_entity(dedupe_key, outbox_id)
+        add("slack_outbox_dedupe", entity_id, project_id, data)
 
-    _add_ordered_records(
-        rows,
-        kind="pm_communication_evidence",
-        id_by_project=repository.pm_communication_evidence_ids_by_project,
-        records=repository.pm_communication_evidence,
-        project_field="project_id",
-    )
-    _add_ordered_records(
-        rows,
-        kind="process_evidence_line_item",
-        id_by_project=repository.process_evidence_line_item_ids_by_project,
-        records=repository.process_evidence_line_items,
-        project_field="project_id",
+    return rows
+
+
+def _process_alias_entity(
+    project_id: str,
+    alias: str,
+    process_id: str,
+    source: str,
+) -> tuple[str, str, dict[str, Any], None]:
+    return (
+        _composite_entity_id(project_id, alias),
+        project_id,
+        {
+            "project_id": project_id,
+            "alias": alias,
+            "process_id": process_id,
+            "source": source,
+        },
+        None,
     )
-    _add_ordered_records(
-        rows,
-        kind="resource_evidence_line_item",
-        id_by_project=repository.resource_evidence_line_item_ids_by_project,
-        records=repository.resource_evidence_line_items,
-        project_field="project_id",
+
+
+def _dependency_edge_entity(
+    key: tuple[str, str, str],
+    edge_id: str,
+) -> tuple[str, str, dict[str, Any], None]:
+    project_id, predecessor_id, successor_id = key
+    return (
+        _composite_entity_id(project_id, predecessor_id, successor_id),
+        project_id,
+        {
+            "project_id": project_id,
+            "predecessor_process_id": predecessor_id,
+            "successor_process_id": successor_id,
+            "edge_id": edge_id,
+        },
+        None,
     )
 
-    for index, (dedupe_key, outbox_id) in enumerate(
-        sorted(repository.slack_outbox_dedupe.items())
-    ):
-        if len(dedupe_key) == 3:
-            project_id, slack_user_id, content_hash = dedupe_key
-            target_type = "dm"
-            target_id = slack_user_id
-            slack_channel_id = None
-        else:
-            project_id, target_type, target_id, content_hash = dedupe_key
-            slack_user_id = target_id if target_type == "dm" else None
-            slack_channel_id = target_id if target_type == "channel" else None
-        add(
-            "slack_outbox_dedupe",
-            _composite_entity_id(project_id, target_type, target_id, content_hash),
-            project_id,
-            {
-                "project_id": project_id,
-                "target_type": target_type,
-                "target_id": target_id,
-                "slack_user_id": slack_user_id,
-                "slack_channel_id": slack_channel_id,
-                "content_hash": content_hash,
-                "outbox_id": outbox_id,
-            },
-            order=index,
-        )
 
-    return rows
+def _slack_outbox_dedupe_entity(
+    dedupe_key: tuple[str, ...],
+    outbox_id: str,
+) -> tuple[str, str, dict[str, Any], None]:
+    if len(dedupe_key) == 3:
+        project_id, slack_user_id, content_hash = dedupe_key
+        target_type = "dm"
+        target_id = slack_user_id
+        slack_channel_id = None
+    else:
+        project_id, target_type, target_id, content_hash = dedupe_key
+        slack_user_id = target_id if target_type == "dm" else None
+        slack_channel_id = target_id if target_type == "channel" else None
+    return (
+        _composite_entity_id(project_id, target_type, target_id, content_hash),
+        project_id,
+        {
+            "project_id": project_id,
+            "target_type": target_type,
+            "target_id": target_id,
+            "slack_user_id": slack_user_id,
+            "slack_channel_id": slack_channel_id,
+            "content_hash": content_hash,
+            "outbox_id": outbox_id,
+        },
+        None,
+    )
 
 
 def _add_ordered_records(
-    rows: dict[tuple[str, str], tuple[str | None, str]],
+    rows: EntityRows,
     *,
     kind: str,
     id_by_project: dict[str, list[str]],
     records: dict[str, Any],
     project_field: str,
+    encoding: str = "json",
 ) -> None:
     seen: set[str] = set()
 
-    def add(
-        entity_id: str,
-        project_id: str | None,
-        data: Any,
-        order: int | None,
-    ) -> None:
-        envelope: dict[str, Any] = {"data": _normalize_json(data)}
-        if order is not None:
-            envelope["order"] = order
-        rows[(kind, entity_id)] = (project_id, _json_dumps(envelope))
-
     for project_id, entity_ids in sorted(id_by_project.items()):
         for index, entity_id in enumerate(entity_ids):
-            if entity_id not in records:
+            if entity_id not in records or entity_id in seen:
                 continue
             seen.add(entity_id)
-            add(entity_id, project_id, records[entity_id], index)
+            rows[(kind, entity_id)] = (
+                project_id,
+                _entity_payload(records[entity_id], index, encoding),
+            )
 
     for entity_id, record in sorted(records.items()):
         if entity_id in seen:
             continue
         project_id = _record_project_id(record, project_field)
-        add(entity_id, project_id, record, None)
+        rows[(kind, entity_id)] = (project_id, _entity_payload(record, None, encoding))
+
+
+def _entity_payload(data: Any, order: int | None, encoding: str = "json") -> str | bytes:
+    """Encode an entity record for ``repository_entity``.
+
+    JSON payloads are text for ``payload_json``. Binary payloads are
+    ``payload_codec`` bytes for ``payload`` that keep datetimes and decimals
+    as native values; keys are sorted the way ``_json_dumps`` sorts them, so
+    equal records always encode to equal bytes.
+    """
+    envelope: dict[str, Any] = {
+        "data": data if encoding == "binary" else _normalize_json(data),
+    }
+    if order is not None:
+        envelope["order"] = order
+    if encoding == "binary":
+        return encode_payload(envelope, sort_keys=True, default=_native_payload_value)
+    return _json_dumps(envelope)
+
+
+def _decode_payload(payload: str | bytes) -> dict[str, Any]:
+    if isinstance(payload, bytes):
+        try:
+            return decode_payload(payload)
+        except PayloadCodecError as exc:
+            raise ServiceValidationError(
+                code="sqlite_payload_version_unsupported",
+                message="SQLite entity payload uses an unsupported binary format.",
+                details={"version": exc.args[0]},
+            ) from exc
+    return json.loads(payload)
+
+
+def _reencode_payload(envelope: dict[str, Any], encoding: str) -> str | bytes:
+    return _entity_payload(envelope["data"], envelope.get("order"), encoding)
+
+
+def _stored_payload(row: sqlite3.Row) -> str | bytes:
+    """Return the encoded payload of a ``repository_entity`` row.
+
+    ``payload_format`` names the column that holds it: ``payload_json`` for
+    JSON text and ``payload`` for binary payloads.
+    """
+    payload_format = row["payload_format"]
+    if payload_format == "json":
+        return row["payload_json"]
+    if payload_format == "binary":
+        return row["payload"]
+    raise ServiceValidationError(
+        code="sqlite_payload_encoding_unsupported",
+        message=f"Unsupported SQLite payload encoding: {payload_format!r}.",
+        details={"payload_encoding": payload_format, "supported": list(PAYLOAD_ENCODINGS)},
+    )
+
+
+def _stored_envelope(row: sqlite3.Row, *, restore_datetimes: bool = False) -> dict[str, Any]:
+    """Decode a ``repository_entity`` row.
+
+    ``restore_datetimes`` parses datetime text in JSON payloads; binary
+    payloads already hold datetimes.
+    """
+    envelope = _decode_payload(_stored_payload(row))
+    if restore_datetimes and row["payload_format"] == "json":
+        envelope["data"] = _restore_datetime_values(envelope["data"])
+    return envelope
+
+
+def _entity_payload_columns(
+    kind: str,
+    payload: str | bytes,
+) -> tuple[str, str | None, bytes | None, int | None]:
+    """Return ``payload_format``, ``payload_json``, ``payload`` and the count.
+
+    SQLite cannot read binary payloads, so binary revisions also store
+    ``role_requirement_count`` for the revision triggers to check.
+    """
+    if isinstance(payload, str):
+        return "json", payload, None, None
+    role_requirement_count = None
+    if kind == "revision":
+        role_requirements = _decode_payload(payload)["data"].get("role_requirements")
+        if isinstance(role_requirements, list):
+            role_requirement_count = len(role_requirements)
+    return "binary", None, payload, role_requirement_count
+
+
+def _validate_payload_encoding(encoding: str) -> None:
+    if encoding not in PAYLOAD_ENCODINGS:
+        raise ServiceValidationError(
+            code="sqlite_payload_encoding_unsupported",
+            message=f"Unsupported SQLite payload encoding: {encoding!r}.",
+            details={"payload_encoding": encoding, "supported": list(PAYLOAD_ENCODINGS)},
+        )
+
+
+def _typed_entity_values(
+    kind: str,
+    project_id: str | None,
+    envelope: dict[str, Any],
+) -> tuple[Any, ...]:
+    data = envelope["data"]
+    return (
+        project_id,
+        _sortable_datetime(data["committed_at"]),
+        _json_dumps(data.get("terminal_process_symbols", [])),
+    )
+
+
+def _sortable_datetime(value: str | dt.datetime | None) -> str | None:
+    """Return a fixed-width UTC string whose text order matches time order."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = dt.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return value.astimezone(dt.UTC).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _replay_result(result_json: str) -> CommandResult | CommandErrorResult:
+    payload = json.loads(result_json)
+    if payload.get("ok"):
+        return CommandResult.model_validate(payload)
+    return CommandErrorResult.model_validate(payload)
+
+
+def _role_requirement_ids(repository: InMemoryProjectRepository) -> set[str]:
+    return {
+        requirement.requirement_id
+        for revisions in repository.revisions_by_process.values()
+        for revision in revisions
+        for requirement in revision.role_requirements
+        if requirement.requirement_id is not None
+    }
 
 
 def _record_project_id(record: Any, project_field: str) -> str | None:
@@ -1044,7 +2602,7 @@ def _ordered(rows: list[tuple[str, dict[str, Any]]]) -> list[tuple[str, dict[str
 
 
 def _restore_calendar(data: dict[str, Any]) -> dict[str, Any]:
-    restored = _restore_datetime_values(data)
+    restored = dict(data)
     restored["weekly_windows"] = [
         CalendarWeeklyWindowCommand.model_validate(window).model_dump()
         for window in restored.get("weekly_windows", [])
@@ -1053,7 +2611,7 @@ def _restore_calendar(data: dict[str, Any]) -> dict[str, Any]:
 
 
 def _restore_resource(data: dict[str, Any]) -> dict[str, Any]:
-    restored = _restore_datetime_values(data)
+    restored = dict(data)
     restored["holidays"] = [
         ResourceHolidayCommand.model_validate(holiday).model_dump()
         for holiday in restored.get("holidays", [])
@@ -1066,14 +2624,14 @@ def _restore_resource(data: dict[str, Any]) -> dict[str, Any]:
 
 
 def _restore_process(data: dict[str, Any]) -> dict[str, Any]:
-    restored = _restore_datetime_values(data)
+    restored = dict(data)
     for legacy_field in ("status", "started_at", "finished_at"):
         restored.pop(legacy_field, None)
     return restored
 
 
 def _restore_revision(data: dict[str, Any]) -> dict[str, Any]:
-    restored = _restore_datetime_values(data)
+    restored = dict(data)
     restored.pop("staked_resource_ids", None)
     restored["role_requirements"] = [
         _restore_role_requirement(requirement)
@@ -1117,7 +2675,7 @@ def _restore_revision_for_repository(
 
 
 def _restore_role_requirement(data: dict[str, Any]) -> dict[str, Any]:
-    restored = _restore_datetime_values(data)
+    restored = dict(data)
     restored.pop("staked_resource_ids", None)
     return restored
 
@@ -1220,6 +2778,33 @@ def _normalize_json(value: Any) -> Any:
     return value
 
 
+def _native_payload_value(value: Any) -> Any:
+    """Convert what ``encode_payload`` has no type for, like ``_normalize_json``."""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, tuple):
+        return list(value)
+    if isinstance(value, dt.time):
+        return value.isoformat()
+    raise TypeError(f"Unsupported payload value type: {type(value).__name__}.")
+
+
+def _json_payload_ready(value: Any) -> bool:
+    """Return whether ``value`` loads back equal from a JSON payload."""
+    if value is None or isinstance(value, str | bool | int | float):
+        return True
+    if isinstance(value, list):
+        return all(_json_payload_ready(item) for item in value)
+    if isinstance(value, dict):
+        return all(
+            isinstance(key, str) and _json_payload_ready(item)
+            for key, item in value.items()
+        )
+    return False
+
+
 def _json_dumps(value: Any) -> str:
     return json.dumps(
         value,
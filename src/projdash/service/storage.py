@@ -5,19 +5,22 @@ from __future__ import annotations
 from pathlib import Path
 
 from projdash.service.repository import ProjectRepository
-from projdash.service.sqlite_repository import SQLiteProjectRepository
+from projdash.service.sqlite_repository import (
+    DEFAULT_SHARED_PROJECTIONS,
+    SQLiteProjectRepository,
+)
 
 
 def create_project_repository(db_path: str | Path) -> ProjectRepository:
     """Create a SQLite project repository for the storage path."""
     path = Path(db_path).expanduser().resolve()
-    return SQLiteProjectRepository(path)
+    return SQLiteProjectRepository(path, shared_projections=DEFAULT_SHARED_PROJECTIONS)
 
 
 def bootstrap_project_repository(db_path: str | Path) -> ProjectRepository:
     """Initialize SQLite storage and return a repository."""
     path = Path(db_path).expanduser().resolve()
-    repository = SQLiteProjectRepository(path)
+    repository = SQLiteProjectRepository(path, shared_projections=DEFAULT_SHARED_PROJECTIONS)
     initialize_schema = getattr(repository, "initialize_schema", None)
     if callable(initialize_schema):
         initialize_schema()
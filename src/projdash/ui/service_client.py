@@ -14,7 +14,10 @@ from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from projdash.service.commands import BatchCommandEnvelope, CommandEnvelope
 from projdash.service.queries import QueryEnvelope
 from projdash.service.service import ProjectService
-from projdash.service.sqlite_repository import SQLiteProjectRepository
+from projdash.service.sqlite_repository import (
+    DEFAULT_SHARED_PROJECTIONS,
+    SQLiteProjectRepository,
+)
 
 DEFAULT_TIMEZONE = "UTC"
 DISPLAY_DATETIME_FORMAT = "%a, %d %b %Y, %H:%M"
@@ -97,7 +100,10 @@ def create_project_repository(db_path: str, storage: str | None = None):
     """Create a SQLite repository for the database path."""
     path = Path(db_path).expanduser().resolve()
     _resolve_storage(storage, str(path))
-    return SQLiteProjectRepository(str(path))
+    return SQLiteProjectRepository(
+        str(path),
+        shared_projections=DEFAULT_SHARED_PROJECTIONS,
+    )
 
 
 def _clear_project_service_cache() -> None:
@@ -1029,3 +1029,139 @@ def test_multiple_timezone_resources_expand_non_identical_schedules_in_same_hori
         ),
     ]
     _assert_utc_datetimes(buckets)
+
+
+def test_calendar_expansion_cache_reuses_and_extends_expanded_horizons():
+    calendar_module = import_module("projdash.engine.calendar")
+    cache = calendar_module.CalendarExpansionCache()
+    calendar = {
+        **_base_calendar(),
+        "timezone": "Pacific/Auckland",
+        "weekly_windows": [
+            {
+                "window_id": f"day_{weekday}",
+                "weekday": weekday,
+                "start_local_time": "20:00:00",
+                "end_local_time": "23:30:00",
+                "capacity_hours": 3,
+            }
+            for weekday in range(7)
+        ],
+    }
+    resource = {
+        **_base_resource(),
+        "holidays": [
+            {
+                "holiday_id": "leave",
+                "starts_at": dt.datetime(2026, 5, 15, 9, tzinfo=UTC),
+                "ends_at": dt.datetime(2026, 5, 16, 9, tzinfo=UTC),
+            }
+        ],
+    }
+    starts_at = dt.datetime(2026, 5, 11, 0, tzinfo=UTC)
+
+    def expand(ends_at: dt.datetime) -> list[object]:
+        return list(
+            cache.expand(
+                calendar=calendar,
+                resource=resource,
+                horizon_starts_at=starts_at,
+                horizon_ends_at=ends_at,
+            )
+        )
+
+    for ends_at in (
+        dt.datetime(2026, 5, 18, 9, 45, tzinfo=UTC),
+        dt.datetime(2026, 6, 2, tzinfo=UTC),
+        dt.datetime(2026, 5, 20, 10, tzinfo=UTC),
+        dt.datetime(2026, 6, 2, tzinfo=UTC),
+    ):
+        assert expand(ends_at) == _expand_resource_calendar(
+            calendar=calendar,
+            resource=resource,
+            horizon_starts_at=starts_at,
+            horizon_ends_at=ends_at,
+        )
+    assert cache.stats() == {"entries": 1, "hits": 1, "extensions": 2, "misses": 1}
+
+    expand(dt.datetime(2026, 6, 2, tzinfo=UTC))
+    calendar["weekly_windows"][0]["capacity_hours"] = 2
+    expand(dt.datetime(2026, 6, 2, tzinfo=UTC))
+    assert cache.stats() == {"entries": 2, "hits": 2, "extensions": 2, "misses": 2}
+
+
+def test_resource_calendar_year_expansion_handles_dst_days_exceptions_and_holidays():
+    calendar = {
+        **_base_calendar(),
+        "timezone": "America/New_York",
+        "weekly_windows": [
+            {
+                "window_id": "sunday_night",
+                "weekday": 6,
+                "start_local_time": "00:30:00",
+                "end_local_time": "03:30:00",
+                "capacity_hours": 3,
+            }
+        ],
+        "exceptions": [
+            {
+                "exception_id": "shutdown",
+                "starts_at": dt.datetime(2026, 7, 5, 4, tzinfo=UTC),
+                "ends_at": dt.datetime(2026, 7, 5, 8, tzinfo=UTC),
+                "capacity_hours": 0,
+            }
+        ],
+    }
+    resource = {
+        **_base_resource(),
+        "available_from_at": dt.datetime(2026, 1, 1, tzinfo=UTC),
+        "holidays": [
+            {
+                "holiday_id": "appointment",
+                "starts_at": dt.datetime(2026, 6, 7, 5, tzinfo=UTC),
+                "ends_at": dt.datetime(2026, 6, 7, 6, tzinfo=UTC),
+            }
+        ],
+    }
+
+    buckets = _expand_resource_calendar(
+        calendar=calendar,
+        resource=resource,
+        horizon_starts_at=dt.datetime(2026, 1, 1, tzinfo=UTC),
+        horizon_ends_at=dt.datetime(2027, 1, 1, tzinfo=UTC),
+    )
+
+    def on(local_date: str) -> list[ExpectedBucket]:
+        return _bucket_expectations(
+            [bucket for bucket in buckets if _value(bucket, "local_date") == local_date]
+        )
+
+    assert on("2026-03-08") == [
+        ExpectedBucket("2026-03-08T05:30:00+00:00", "2026-03-08T06:00:00+00:00", 0.5),
+        ExpectedBucket("2026-03-08T06:00:00+00:00", "2026-03-08T07:00:00+00:00", 1.0),
+        ExpectedBucket("2026-03-08T07:00:00+00:00", "2026-03-08T07:30:00+00:00", 0.5),
+    ]
+    assert on("2026-03-15") == [
+        ExpectedBucket("2026-03-15T04:30:00+00:00", "2026-03-15T05:00:00+00:00", 0.5),
+        ExpectedBucket("2026-03-15T05:00:00+00:00", "2026-03-15T06:00:00+00:00", 1.0),
+        ExpectedBucket("2026-03-15T06:00:00+00:00", "2026-03-15T07:00:00+00:00", 1.0),
+        ExpectedBucket("2026-03-15T07:00:00+00:00", "2026-03-15T07:30:00+00:00", 0.5),
+    ]
+    assert [bucket.capacity_hours for bucket in on("2026-11-01")] == [
+        0.375,
+        0.75,
+        0.75,
+        0.75,
+        0.375,
+    ]
+    assert on("2026-06-07") == [
+        ExpectedBucket("2026-06-07T04:30:00+00:00", "2026-06-07T05:00:00+00:00", 0.5),
+        ExpectedBucket("2026-06-07T06:00:00+00:00", "2026-06-07T07:00:00+00:00", 1.0),
+        ExpectedBucket("2026-06-07T07:00:00+00:00", "2026-06-07T07:30:00+00:00", 0.5),
+    ]
+    assert on("2026-07-05") == []
+    assert len({_value(bucket, "local_date") for bucket in buckets}) == 51
+    assert sum(float(_value(bucket, "capacity_hours")) for bucket in buckets) == pytest.approx(
+        48 * 3 + 2 + 3 + 2
+    )
+    assert buckets == sorted(buckets, key=lambda bucket: _value(bucket, "starts_at"))
@@ -3,6 +3,7 @@ from collections import defaultdict
 from importlib import import_module
 from typing import NamedTuple
 
+import numpy as np
 import pytest
 
 UTC = dt.UTC
@@ -1256,6 +1257,95 @@ def test_recurring_calendar_capacity_extends_until_work_can_finish():
     assert _allocation_effort_by_resource(data) == {"res_alex": 2.0}
 
 
+def test_capacity_search_extends_ledger_like_a_full_expansion():
+    module = _resource_schedule_module()
+    calendars = [
+        _calendar(
+            "cal_tokyo",
+            timezone="Asia/Tokyo",
+            windows=[WeeklyWindow(weekday, "18:00:00", "23:30:00", 4) for weekday in range(6)],
+        )
+    ]
+    resources = [
+        _resource(
+            "res_tokyo",
+            calendar_id="cal_tokyo",
+            holidays=[
+                {
+                    "holiday_id": "straddles_old_end",
+                    "starts_at": _at(20, 12),
+                    "ends_at": _at(21, 12),
+                    "reason": "Leave",
+                }
+            ],
+        )
+    ]
+    holds = [
+        {
+            "resource_id": "res_tokyo",
+            "starts_at": _at(18, 10),
+            "ends_at": _at(18, 11),
+        }
+    ]
+    starts_at = _at(13)
+    previous_ends_at = _at(20, 11) + dt.timedelta(minutes=30)
+    ends_at = _at(31)
+
+    def expand(horizon_ends_at: dt.datetime) -> tuple[object, ...]:
+        buckets = module._expand_capacity_buckets(
+            resources=resources,
+            calendars=calendars,
+            horizon_starts_at=starts_at,
+            horizon_ends_at=horizon_ends_at,
+            planning_granularity="hour",
+        )
+        module._apply_capacity_holds_to_buckets(buckets, holds)
+        return buckets
+
+    extended = module._extend_capacity_buckets(
+        expand(previous_ends_at),
+        resources=resources,
+        calendars=calendars,
+        horizon_starts_at=starts_at,
+        previous_ends_at=previous_ends_at,
+        horizon_ends_at=ends_at,
+        planning_granularity="hour",
+        fixed_allocation_slices=[],
+        capacity_holds=holds,
+    )
+
+    assert extended == expand(ends_at)
+
+
+def test_capacity_search_result_matches_a_run_over_the_final_horizon():
+    input_data = _base_input(
+        processes=[_process("build"), _process("review", dependencies=["build"])],
+        role_requirements=[_requirement("build", 30), _requirement("review", 6)],
+        calendars=[
+            _calendar(
+                "cal_utc",
+                timezone="America/New_York",
+                windows=[WeeklyWindow(weekday, "09:00:00", "13:00:00", 3) for weekday in (1, 3)],
+            )
+        ],
+    )
+    extended = _data(_compute_resource_schedule(input_data))
+
+    direct_input = {
+        **input_data,
+        "options": {
+            **input_data["options"],
+            "horizon_ends_at": extended["horizon_ends_at"],
+            "_capacity_search_attempt": 4,
+        },
+    }
+    direct = _data(_compute_resource_schedule(direct_input))
+
+    assert extended["horizon_ends_at"] > _at(16, 17)
+    assert _value(_rows_by_id(extended)["review"], "allocation_state") == "complete"
+    assert extended == direct
+
+
 def test_capacity_after_ready_is_found_by_expanding_recurring_calendars():
     data = _data(
         _compute_resource_schedule(
@@ -1454,6 +1544,31 @@ def test_resource_schedule_allocation_slices_are_optional_and_shape_complete():
     assert _value(allocation, "iteration") == with_slices["iteration_count"]
 
 
+def test_later_allocation_iterations_replay_the_first_one(monkeypatch):
+    module = _resource_schedule_module()
+    run_allocation_iteration = module._run_allocation_iteration
+    runs: list[int] = []
+
+    def counting_run(**kwargs):
+        runs.append(kwargs["iteration"])
+        return run_allocation_iteration(**kwargs)
+
+    monkeypatch.setattr(module, "_run_allocation_iteration", counting_run)
+    data = _data(
+        _compute_resource_schedule(
+            _base_input(
+                processes=[_process("build"), _process("review", dependencies=["build"])],
+                role_requirements=[_requirement("build", 3), _requirement("review", 2)],
+            )
+        )
+    )
+
+    assert runs == [1]
+    assert data["iteration_count"] == 2
+    assert data["converged"] is True
+    assert {_value(allocation, "iteration") for allocation in data["allocation_slices"]} == {2}
+
+
 def test_allocation_slice_ids_are_stable_for_identical_query_inputs():
     input_data = _base_input(
         processes=[_process("build")],
@@ -2543,7 +2658,7 @@ def test_contiguous_policy_does_not_bridge_over_focused_working_bucket():
     module = _resource_schedule_module()
     bucket_type = module._LedgerBucket
     allocate_contiguous = module._allocate_contiguous
-    ledger = {}
+    buckets = []
     for hour, remaining in [
         (9, 1.0),
         (10, 0.0),
@@ -2564,7 +2679,7 @@ def test_contiguous_policy_does_not_bridge_over_focused_working_bucket():
             local_week="2026-W20",
             window_id="work",
         )
-        ledger[("res_alex", starts_at, ends_at)] = bucket
+        buckets.append(bucket)
 
     requirement = _requirement(
         "contiguous",
@@ -2578,7 +2693,7 @@ def test_contiguous_policy_does_not_bridge_over_focused_working_bucket():
         ready_at=_at(13),
         eligible=[_resource("res_alex")],
         resource_by_id={"res_alex": _resource("res_alex")},
-        ledger=ledger,
+        ledger=module._CapacityLedger(buckets),
         daily_allocated=defaultdict(float),
         bucket_focus={
             ("res_alex", _at(13, 10), _at(13, 11)): "other_process",
@@ -2592,6 +2707,33 @@ def test_contiguous_policy_does_not_bridge_over_focused_working_bucket():
     ]
 
 
+def test_capacity_ledger_iterations_share_buckets_and_reset_remaining_hours():
+    module = _resource_schedule_module()
+    buckets = module._expand_capacity_buckets(
+        resources=[_resource("res_alex"), _resource("res_blair", role_ids=["role_qa"])],
+        calendars=[_calendar("cal_utc")],
+        horizon_starts_at=_at(13),
+        horizon_ends_at=_at(15),
+        planning_granularity="hour",
+    )
+    ledger = module._CapacityLedger(buckets)
+    first = ledger.fresh()
+    bucket = first[("res_alex", _at(13, 9), _at(13, 10))]
+    module._consume_bucket(first, bucket, 1.0, defaultdict(float), _requirement("build", 1))
+    second = ledger.fresh()
+
+    assert first.remaining_hours(bucket) == 0.0
+    assert second.remaining_hours(bucket) == 1.0
+    assert second.buckets is first.buckets
+    assert [item.resource_id for item in ledger.block_buckets(bucket)] == ["res_alex"] * 8
+    positions = np.flatnonzero(ledger.role_mask("role_dev", frozenset({"res_alex"})))
+    ready_at = _at(13, 9) + dt.timedelta(minutes=15)
+    assert list(ledger.capacity_from(positions[:2], ready_at)) == [
+        module._bucket_capacity_between(ledger.buckets[index], ready_at, _at(13, 11))
+        for index in positions[:2]
+    ]
+
+
 def test_multi_role_resource_uses_one_capacity_ledger_across_roles():
     data = _data(
         _compute_resource_schedule(
@@ -18,6 +18,7 @@ from projdash.service.commands import (
     CreateProject,
     UpsertProcessRevision,
 )
+from projdash.service.profiling import CProfileDumpSink, RingBufferProfileSink
 from projdash.service.queries import (
     GetProject,
     QueryEnvelope,
@@ -2604,3 +2605,46 @@ def test_topology_results_expose_soft_retirement_and_alias_ids():
 
     assert result.entity_ids["retired_process_ids"] == ["process-legacy-api"]
     assert result.entity_ids["alias_process_id"] == "process-api-impl"
+
+
+def test_query_timings_are_returned_on_request_and_sent_to_profile_sinks(tmp_path):
+    ring = RingBufferProfileSink(max_profiles=2)
+    service = ProjectService(
+        InMemoryProjectRepository(),
+        query_profile_sinks=[ring, CProfileDumpSink(tmp_path, min_seconds=0)],
+    )
+    project_id = service.handle_command(
+        CommandEnvelope(command=CreateProject(name="Timed Project", start_at=_at(13)))
+    ).entity_ids["project_id"]
+    service.handle_command(
+        CommandEnvelope(
+            command=UpsertProcessRevision(
+                project_id=project_id,
+                process_symbol="build",
+                name="Build",
+                effective_at=_at(13),
+                duration_business_days=2,
+            )
+        )
+    )
+    query = QuerySchedule(project_id=project_id, as_of=_at(14), now=_at(14))
+
+    timed = service.handle_query(QueryEnvelope(query=query, include_timings=True))
+    untimed = service.handle_query(QueryEnvelope(query=query))
+
+    assert untimed.timings is None
+    assert "timings" not in untimed.model_dump(mode="json")
+    assert timed.data == untimed.data
+    timings = timed.model_dump(mode="json")["timings"]
+    assert timings["total_seconds"] >= timings["spans"]["repository_projection"]["seconds"]
+    assert timings["spans"]["repository_projection"]["count"] == 1
+    assert timings["spans"]["pin_collapse"]["count"] == 1
+    profiles = ring.profiles()
+    assert [profile.action for profile in profiles] == ["query_schedule", "query_schedule"]
+    assert profiles[0].project_id == project_id
+    assert profiles[0].spans["cpm"]["count"] == 1
+    # The second run is a projection cache hit.
+    assert profiles[1].spans == {}
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        f"query_schedule-{profile.query_id}.prof" for profile in profiles
+    )
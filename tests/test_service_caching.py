@@ -2,6 +2,7 @@ import datetime as dt
 from collections.abc import Mapping
 from typing import Any
 
+from projdash.service.cache import ProjectionCache, approximate_size
 from projdash.service.commands import CommandEnvelope
 from projdash.service.queries import QueryEnvelope
 from projdash.service.repository import InMemoryProjectRepository
@@ -203,3 +204,57 @@ def test_resource_schedule_cache_key_uses_repository_version_when_available():
     _query(service, {"action": "query_utilization", **_base_query(project_id)})
 
     assert len(calls) == 2
+
+
+def test_projection_cache_evicts_least_recently_used_within_limits():
+    cache = ProjectionCache(max_entries=2, max_bytes=None)
+    cache.put(("a",), 1)
+    cache.put(("b",), 2)
+    assert cache.get(("a",)) == 1
+    cache.put(("c",), 3)
+
+    assert ("b",) not in cache
+    assert cache.get(("b",)) is None
+    assert cache.stats() == {
+        "entries": 2,
+        "bytes": 0,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 1,
+        "invalidations": 0,
+    }
+
+    sized = ProjectionCache(max_entries=None, max_bytes=100, sizer=len)
+    sized.put(("small",), "x" * 60)
+    sized.put(("medium",), "y" * 50)
+    assert ("small",) not in sized
+    sized.put(("large",), "z" * 101)
+    assert ("large",) not in sized
+    assert sized.stats()["bytes"] == 50
+    assert approximate_size({"rows": [{"id": "a"}]}) > approximate_size({})
+
+
+def test_resource_schedule_cache_is_bounded_across_fresh_now_values():
+    calls: list[dict[str, object]] = []
+    service = ProjectService(
+        InMemoryProjectRepository(),
+        resource_scheduler=_counting_scheduler(calls),
+        projection_cache_factory=lambda: ProjectionCache(max_entries=2),
+    )
+    project_id, _process_id = _seed_project(service)
+
+    for hour in (10, 11, 12, 10):
+        _query(
+            service,
+            {
+                "action": "query_utilization",
+                **_base_query(project_id),
+                "now": _iso(13, hour),
+            },
+        )
+
+    stats = service.projection_cache_stats()["resource_schedule"]
+    assert len(calls) == 4
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 2
+    assert stats["misses"] == 4
@@ -1,6 +1,8 @@
 import copy
 import datetime as dt
+import threading
 from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 from pydantic import ValidationError
@@ -360,7 +362,9 @@ def _node_ids(graph: Mapping[str, object]) -> set[str]:
 
 
 def _repository_snapshot(repository: InMemoryProjectRepository):
-    return copy.deepcopy(repository.__dict__)
+    return copy.deepcopy(
+        {name: value for name, value in vars(repository).items() if not name.startswith("_")}
+    )
 
 
 def _assert_structured_validation_error(result, *, loc_field: str | None = None):
@@ -576,6 +580,102 @@ def test_failed_batch_commits_with_zero_repository_replacements():
     assert repository.projects == {}
 
 
+def test_staged_clone_copies_only_touched_records_until_commit():
+    repository = InMemoryProjectRepository()
+    service = ProjectService(repository)
+    project_id, design_id, build_id, _ship_id = _seed_linear_graph(service)
+    other_project_id = _create_project(service)
+    design_record = repository.processes[design_id]
+    design_revisions = repository.revisions_by_process[design_id]
+
+    staged = repository.clone()
+    build_symbol = repository.processes[build_id].symbol
+    staged.rename_process(project_id, build_id, "build_renamed", edit_at=_at(14))
+    staged.delete_project(other_project_id)
+
+    assert staged.processes[design_id] is design_record
+    assert staged.processes[build_id].symbol == "build_renamed"
+    assert repository.processes[build_id].symbol == build_symbol
+    assert other_project_id in repository.projects
+    assert other_project_id not in staged.projects
+    assert staged._staged_project_ids() == {project_id, other_project_id}
+
+    repository.replace_with(staged)
+
+    assert repository.processes[build_id].symbol == "build_renamed"
+    assert repository.process_aliases[project_id][build_symbol] == build_id
+    assert repository.processes[design_id] is design_record
+    assert repository.revisions_by_process[design_id] is design_revisions
+    assert other_project_id not in repository.projects
+    assert set(repository.projects) == {project_id}
+
+
+def test_staged_clone_in_place_record_edits_do_not_leak_into_base():
+    repository = InMemoryProjectRepository()
+    service = ProjectService(repository)
+    project_id = _create_project(service)
+    role_id = _handle(
+        service,
+        {
+            "action": "create_role",
+            "project_id": project_id,
+            "role_id": "role-staged",
+            "name": "Engineer",
+        },
+    ).entity_ids["role_id"]
+
+    staged = repository.clone()
+    assert staged.roles[role_id] is repository.roles[role_id]
+    assert staged.role_ids_by_project[project_id] is repository.role_ids_by_project[project_id]
+    assert staged.dirty_entity_keys() == set()
+
+    staged.rename_role(project_id, role_id, "Staff Engineer")
+    staged.role_ids_by_project.writable(project_id).append("role-phantom")
+
+    assert staged.roles[role_id] is not repository.roles[role_id]
+    assert repository.roles[role_id]["name"] == "Engineer"
+    assert "role-phantom" not in repository.role_ids_by_project[project_id]
+    assert staged.roles[role_id]["name"] == "Staff Engineer"
+
+
+def test_commits_publish_new_containers_while_queries_read():
+    repository = InMemoryProjectRepository()
+    service = ProjectService(repository)
+    first_project_id = _create_project(service)
+    projects = repository.projects
+    reading = iter(projects.values())
+    next(reading)
+
+    second_project_id = _create_project(service)
+
+    assert list(reading) == []
+    assert list(projects) == [first_project_id]
+    assert repository.projects is not projects
+    assert set(repository.projects) == {first_project_id, second_project_id}
+
+    stop = threading.Event()
+
+    def read_projects() -> int:
+        reads = 0
+        while not stop.is_set():
+            sorted(project.project_id for project in repository.projects.values())
+            for project_id in list(repository.process_ids_by_project):
+                repository.process_ids_by_project.get(project_id)
+            reads += 1
+        return reads
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        readers = [pool.submit(read_projects) for _ in range(3)]
+        try:
+            for _ in range(30):
+                project_id = _create_project(service)
+                _create_process(service, project_id, name="Build API")
+        finally:
+            stop.set()
+        assert all(reader.result(timeout=10) > 0 for reader in readers)
+    assert len(repository.projects) == 32
+
+
 def test_failed_first_time_upsert_process_revision_is_atomic_and_replayable():
     repository = InMemoryProjectRepository()
     service = ProjectService(repository)
@@ -3049,6 +3149,45 @@ def test_batch_generated_operation_ids_are_stable_on_exact_command_replay():
     ]
 
 
+def test_batch_replays_earlier_command_through_layered_replay_cache():
+    service = ProjectService(InMemoryProjectRepository())
+    create_command = {"action": "create_project", "name": "Layered", "start_at": _iso(4)}
+    first = _handle(
+        service,
+        create_command,
+        command_id="00000000-0000-4000-8000-000000000301",
+    )
+    overlay = service._command_replay_cache.staged()
+
+    assert len(overlay) == 0
+    assert overlay.get(first.command_id) is service._command_replay_cache.get(
+        first.command_id
+    )
+
+    results = service.handle_batch(
+        BatchCommandEnvelope.model_validate(
+            {
+                "commands": [
+                    {"command_id": str(first.command_id), "command": create_command},
+                    {
+                        "command_id": "00000000-0000-4000-8000-000000000302",
+                        "command": {
+                            "action": "create_project",
+                            "name": "Second",
+                            "start_at": _iso(4),
+                        },
+                    },
+                ],
+            }
+        )
+    )
+
+    assert [result.ok for result in results] == [True, True]
+    assert results[0] == first
+    assert len(_query(service, {"action": "query_projects"}).data["projects"]) == 2
+    assert service._command_replay_cache.get(results[1].command_id) is not None
+
+
 def test_batch_resource_operations_apply_and_report_operation_results():
     repository = InMemoryProjectRepository()
     service = ProjectService(repository)
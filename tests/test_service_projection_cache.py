@@ -1,7 +1,12 @@
 import datetime as dt
+import threading
 from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from zoneinfo import ZoneInfo
 
+import pytest
+
+from projdash.service import cache as cache_module
 from projdash.service import service as service_module
 from projdash.service.commands import (
     BatchCommandEnvelope,
@@ -54,6 +59,7 @@ def _weekday_windows() -> list[dict[str, object]]:
 
 def _seed_allocatable_project(
     service: ProjectService,
+    id_suffix: str = "",
 ) -> tuple[str, str, str, str, str]:
     project_id = service.handle_command(
         CommandEnvelope(command=CreateProject(name="Cache", start_at=_at(13)))
@@ -63,7 +69,7 @@ def _seed_allocatable_project(
         {
             "action": "create_role",
             "project_id": project_id,
-            "role_id": "role-engineer",
+            "role_id": f"role-engineer{id_suffix}",
             "name": "Engineer",
         },
     ).entity_ids["role_id"]
@@ -72,7 +78,7 @@ def _seed_allocatable_project(
         {
             "action": "upsert_resource_calendar",
             "project_id": project_id,
-            "calendar_id": "calendar-nyc",
+            "calendar_id": f"calendar-nyc{id_suffix}",
             "name": "New York Weekdays",
             "timezone": "America/New_York",
             "weekly_windows": _weekday_windows(),
@@ -83,7 +89,7 @@ def _seed_allocatable_project(
         {
             "action": "upsert_resource",
             "project_id": project_id,
-            "resource_id": "resource-ada",
+            "resource_id": f"resource-ada{id_suffix}",
             "name": "Ada",
             "role_ids": [role_id],
             "calendar_id": calendar_id,
@@ -97,13 +103,13 @@ def _seed_allocatable_project(
         {
             "action": "upsert_process_revision",
             "project_id": project_id,
-            "process_id": "process-api",
+            "process_id": f"process-api{id_suffix}",
             "name": "Build API",
             "effective_at": _iso(13),
             "duration_business_days": 1,
             "role_requirements": [
                 {
-                    "requirement_id": "req-api-eng",
+                    "requirement_id": f"req-api-eng{id_suffix}",
                     "role_id": role_id,
                     "effort_hours": 8,
                 }
@@ -413,3 +419,343 @@ def test_projection_cache_is_invalidated_after_successful_batch(monkeypatch):
 
     _query(service, query)
     assert len(schedule_calls) == 2
+
+
+def test_projection_cache_keeps_untouched_projects_and_projection_independent_kinds():
+    scheduler_calls: list[dict[str, object]] = []
+    service = ProjectService(
+        InMemoryProjectRepository(),
+        resource_scheduler=_counting_scheduler(scheduler_calls),
+    )
+    project_a, role_id, _calendar_id, resource_id, process_id = (
+        _seed_allocatable_project(service)
+    )
+    project_b, *_ = _seed_allocatable_project(service, "-b")
+
+    _query(service, _resource_schedule_query(project_a))
+    _query(service, _resource_schedule_query(project_b))
+    assert len(scheduler_calls) == 2
+
+    result = _handle(
+        service,
+        {
+            "action": "upsert_slack_project_config",
+            "project_id": project_a,
+            "enabled": True,
+            "workspace_id": "T1",
+            "updated_at": _iso(13, 12),
+        },
+    )
+    assert result.ok is True
+    _query(service, _resource_schedule_query(project_a))
+    assert len(scheduler_calls) == 2
+
+    result = _handle(
+        service,
+        {
+            "action": "upsert_process_role_pin",
+            "project_id": project_a,
+            "process_id": process_id,
+            "requirement_id": "req-api-eng",
+            "role_id": role_id,
+            "resource_id": resource_id,
+            "pinned_at": _iso(13, 12),
+            "forecast_finish_at": _iso(13, 15),
+            "updated_at": _iso(13, 12),
+        },
+    )
+    assert result.ok is True
+    _query(service, _resource_schedule_query(project_b))
+    assert len(scheduler_calls) == 2
+    _query(service, _resource_schedule_query(project_a))
+    assert len(scheduler_calls) == 3
+    assert service.projection_cache_stats()["resource_schedule"]["invalidations"] == 1
+
+
+def test_resource_projection_cache_hits_return_mutable_copies():
+    scheduler_calls: list[dict[str, object]] = []
+    service = ProjectService(
+        InMemoryProjectRepository(),
+        resource_scheduler=_counting_scheduler(scheduler_calls),
+    )
+    project_id, *_ = _seed_allocatable_project(service)
+
+    first = _query(service, _resource_schedule_query(project_id))
+    second = _query(service, _resource_schedule_query(project_id))
+
+    assert len(scheduler_calls) == 1
+    assert first == second
+    assert first["processes"][0] is not second["processes"][0]
+    assert type(first["processes"][0]) is dict
+    assert type(first["allocation_slices"]) is list
+    original_name = first["processes"][0]["name"]
+
+    first["processes"][0]["name"] = "changed"
+    first["allocation_slices"].append({})
+    third = _query(service, _resource_schedule_query(project_id))
+
+    assert len(scheduler_calls) == 1
+    assert third == second
+    assert third["processes"][0]["name"] == original_name
+
+
+def test_resource_projection_cache_hits_do_not_size_values(monkeypatch):
+    sized: list[object] = []
+
+    def counting_size(value: object) -> int:
+        sized.append(value)
+        return 1
+
+    monkeypatch.setattr(cache_module, "approximate_size", counting_size)
+    service = ProjectService(InMemoryProjectRepository())
+    project_id, *_ = _seed_allocatable_project(service)
+    query = {**_resource_schedule_query(project_id), "allow_stale": True}
+
+    _query(service, query)
+    computed = len(sized)
+    for _ in range(20):
+        _query(service, query)
+
+    assert len(sized) == computed
+
+
+def test_cache_now_granularity_shares_schedule_across_wall_clock_now():
+    scheduler_calls: list[dict[str, object]] = []
+    service = ProjectService(
+        InMemoryProjectRepository(),
+        resource_scheduler=_counting_scheduler(scheduler_calls),
+        cache_now_granularity=dt.timedelta(hours=1),
+    )
+    project_id, *_ = _seed_allocatable_project(service)
+    five_past = (_at(13, 12) + dt.timedelta(minutes=5, seconds=7)).isoformat()
+    twenty_to = (_at(13, 12) + dt.timedelta(minutes=40)).isoformat()
+
+    first = _query(
+        service,
+        _resource_schedule_query(project_id, as_of=five_past, now=five_past),
+    )
+    second = _query(
+        service,
+        _resource_schedule_query(project_id, as_of=twenty_to, now=twenty_to),
+    )
+    assert len(scheduler_calls) == 1
+    assert first["now"] == second["now"] == _iso(13, 12)
+    assert first["as_of"] == _iso(13, 12)
+
+    pinned = _query(
+        service,
+        _resource_schedule_query(project_id, as_of=_iso(13, 11), now=twenty_to),
+    )
+    assert pinned["as_of"] == _iso(13, 11)
+    assert pinned["now"] == _iso(13, 12)
+    assert len(scheduler_calls) == 2
+
+    future_as_of = (_at(13, 12) + dt.timedelta(minutes=30)).isoformat()
+    clamped = _query(
+        service,
+        _resource_schedule_query(project_id, as_of=future_as_of, now=twenty_to),
+    )
+    assert clamped["as_of"] == clamped["now"] == _iso(13, 12)
+    assert len(scheduler_calls) == 2
+
+
+def test_projection_cache_single_flights_same_key_and_computes_other_keys_in_parallel():
+    scheduler_calls: list[dict[str, object]] = []
+    counting = _counting_scheduler(scheduler_calls)
+    release = threading.Event()
+    started = threading.Event()
+
+    def scheduler(input_data: dict[str, object]) -> dict[str, object]:
+        if input_data["project_id"] == project_a:
+            started.set()
+            assert release.wait(timeout=10)
+        return counting(input_data)
+
+    service = ProjectService(InMemoryProjectRepository(), resource_scheduler=scheduler)
+    project_a, *_ = _seed_allocatable_project(service)
+    project_b, *_ = _seed_allocatable_project(service, "-b")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        first = pool.submit(_query, service, _resource_schedule_query(project_a))
+        assert started.wait(timeout=10)
+        second = pool.submit(_query, service, _resource_schedule_query(project_a))
+        other = pool.submit(_query, service, _resource_schedule_query(project_b))
+        assert other.result(timeout=10)["project_id"] == project_b
+        assert not first.done()
+        release.set()
+        assert first.result(timeout=10) == second.result(timeout=10)
+
+    assert [call["project_id"] for call in scheduler_calls] == [project_b, project_a]
+
+
+def test_allow_stale_resource_schedule_returns_last_result_and_refreshes_in_background():
+    scheduler_calls: list[dict[str, object]] = []
+    service = ProjectService(
+        InMemoryProjectRepository(),
+        resource_scheduler=_counting_scheduler(scheduler_calls),
+    )
+    project_id, role_id, _calendar_id, resource_id, process_id = (
+        _seed_allocatable_project(service)
+    )
+    query = {**_resource_schedule_query(project_id), "allow_stale": True}
+
+    first = _query(service, query)
+    assert first["stale"] is None
+    assert len(scheduler_calls) == 1
+
+    result = _handle(
+        service,
+        {
+            "action": "upsert_process_role_pin",
+            "project_id": project_id,
+            "process_id": process_id,
+            "requirement_id": "req-api-eng",
+            "role_id": role_id,
+            "resource_id": resource_id,
+            "pinned_at": _iso(13, 12),
+            "forecast_finish_at": _iso(13, 15),
+            "updated_at": _iso(13, 12),
+        },
+    )
+    assert result.ok is True
+
+    stale = service.handle_query(QueryEnvelope.model_validate({"query": query}))
+    assert stale.ok is True
+    assert stale.data["processes"] == first["processes"]
+    assert stale.data["stale"] == {
+        "version": None,
+        "as_of": _iso(13, 12),
+        "now": _iso(13, 12),
+    }
+    assert [warning.code for warning in stale.warnings] == ["stale_resource_schedule"]
+
+    assert service.wait_for_projection_refreshes(timeout=10) is True
+    assert len(scheduler_calls) == 2
+    assert _query(service, query)["stale"] is None
+    assert len(scheduler_calls) == 2
+
+
+def test_allow_stale_refresh_reads_repository_apart_from_concurrent_commits(monkeypatch):
+    repository = InMemoryProjectRepository()
+    service = ProjectService(repository)
+    project_id, role_id, _calendar_id, resource_id, process_id = (
+        _seed_allocatable_project(service)
+    )
+    query = {**_resource_schedule_query(project_id), "allow_stale": True}
+    _query(service, query)
+    _handle(
+        service,
+        {
+            "action": "upsert_process_revision",
+            "project_id": project_id,
+            "process_id": "process-docs",
+            "name": "Docs",
+            "effective_at": _iso(13),
+            "duration_business_days": 1,
+            "dependencies": [process_id],
+        },
+    )
+
+    reading = threading.Event()
+    release = threading.Event()
+    get_project = repository.get_project
+
+    def blocking_get_project(*args, **kwargs):
+        if threading.current_thread().name.startswith("projdash-projection-refresh"):
+            reading.set()
+            assert release.wait(timeout=10)
+        return get_project(*args, **kwargs)
+
+    monkeypatch.setattr(repository, "get_project", blocking_get_project)
+    assert _query(service, query)["stale"] is not None
+    assert reading.wait(timeout=10)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        commit = pool.submit(
+            _handle,
+            service,
+            {
+                "action": "upsert_process_role_pin",
+                "project_id": project_id,
+                "process_id": process_id,
+                "requirement_id": "req-api-eng",
+                "role_id": role_id,
+                "resource_id": resource_id,
+                "pinned_at": _iso(13, 12),
+                "forecast_finish_at": _iso(13, 15),
+                "updated_at": _iso(13, 12),
+            },
+        )
+        try:
+            with pytest.raises(TimeoutError):
+                commit.result(timeout=0.2)
+        finally:
+            release.set()
+        assert commit.result(timeout=10).ok is True
+    assert service.wait_for_projection_refreshes(timeout=10) is True
+
+    monkeypatch.setattr(repository, "get_project", get_project)
+    fresh = {**query, "allow_stale": False}
+    assert _query(service, fresh) == _query(ProjectService(repository), fresh)
+
+
+def test_schedule_input_rebuilds_only_touched_processes_and_dependents(monkeypatch):
+    service = ProjectService(InMemoryProjectRepository())
+    project_id, role_id, _calendar_id, resource_id, process_id = (
+        _seed_allocatable_project(service)
+    )
+    for dependent_id, dependencies in (
+        ("process-docs", [process_id]),
+        ("process-ui", []),
+    ):
+        _handle(
+            service,
+            {
+                "action": "upsert_process_revision",
+                "project_id": project_id,
+                "process_id": dependent_id,
+                "name": dependent_id,
+                "effective_at": _iso(13),
+                "duration_business_days": 1,
+                "dependencies": dependencies,
+            },
+        )
+    query = {
+        "action": "query_schedule",
+        "project_id": project_id,
+        "as_of": _iso(13, 16),
+        "now": _iso(13, 16),
+    }
+    _query(service, query)
+
+    result = _handle(
+        service,
+        {
+            "action": "upsert_process_role_pin",
+            "project_id": project_id,
+            "process_id": process_id,
+            "requirement_id": "req-api-eng",
+            "role_id": role_id,
+            "resource_id": resource_id,
+            "pinned_at": _iso(13, 12),
+            "forecast_finish_at": _iso(13, 15),
+            "updated_at": _iso(13, 12),
+        },
+    )
+    assert result.ok is True
+
+    repository = service._repository
+    reused: list[set[str]] = []
+    build = repository.get_project_schedule_input
+
+    def spy(project_id, as_of, *, reuse=None):
+        reused.append(set(reuse or ()))
+        return build(project_id, as_of, reuse=reuse)
+
+    monkeypatch.setattr(repository, "get_project_schedule_input", spy)
+    incremental = _query(service, query)
+    assert reused == [{"process-docs", "process-ui"}]
+
+    monkeypatch.setattr(repository, "get_project_schedule_input", build)
+    assert incremental == _query(ProjectService(repository), query)
+    statuses = {node["process_id"]: node["status"] for node in incremental["nodes"]}
+    assert statuses[process_id] != "planned"
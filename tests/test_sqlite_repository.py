@@ -1,13 +1,17 @@
 import datetime as dt
 import json
 import sqlite3
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 from pathlib import Path
 from typing import Any
 
 import pytest
 
-from projdash.service import bootstrap
+from projdash.service import bootstrap, sqlite_repository
+from projdash.service.cache import freeze
 from projdash.service.commands import CommandEnvelope
 from projdash.service.errors import ServiceValidationError
 from projdash.service.models import (
@@ -15,11 +19,17 @@ from projdash.service.models import (
     CostUnit,
     ProcessRevisionRecord,
     RoleRequirementCommand,
+    ScheduleSnapshotRecord,
 )
+from projdash.service.payload_codec import PayloadCodecError, decode_payload, encode_payload
 from projdash.service.queries import QueryEnvelope
+from projdash.service.repository import InMemoryProjectRepository
 from projdash.service.results import CommandResult
 from projdash.service.service import ProjectService
-from projdash.service.sqlite_repository import SQLiteProjectRepository
+from projdash.service.sqlite_repository import (
+    SQLiteProjectRepository,
+    _repository_entity_rows,
+)
 
 NOW = dt.datetime(2026, 1, 15, 9, 0, tzinfo=dt.UTC)
 
@@ -30,15 +40,13 @@ def test_sqlite_repository_persists_projection_and_command_replay(tmp_path: Path
     staged = _seed_repository(repository.clone())
     repository.replace_with(staged)
     command_id = uuid.UUID("00000000-0000-0000-0000-000000000001")
-    repository.replace_command_replay_cache(
-        {
-            command_id: {
-                "payload-hash": CommandResult(
-                    command_id=command_id,
-                    entity_ids={"project_id": "project-sqlite"},
-                )
-            }
-        }
+    repository.record_command_replay(
+        command_id,
+        "payload-hash",
+        CommandResult(
+            command_id=command_id,
+            entity_ids={"project_id": "project-sqlite"},
+        ),
     )
     repository.close()
 
@@ -60,6 +68,54 @@ def test_sqlite_repository_persists_projection_and_command_replay(tmp_path: Path
         reopened.close()
 
 
+def test_sqlite_command_replay_appends_rows_and_expires_old_records(tmp_path: Path):
+    db_path = tmp_path / "replay.sqlite"
+    repository = SQLiteProjectRepository(db_path)
+    service = ProjectService(repository)
+    service._command_replay_cache.max_commands = 1
+    try:
+        first = CommandEnvelope.model_validate(
+            {
+                "command": {
+                    "action": "create_project",
+                    "name": "Replay Project",
+                    "start_at": NOW.isoformat(),
+                }
+            }
+        )
+        first_result = service.handle_command(first)
+        first_row = repository._conn.execute(
+            "SELECT applied_at FROM command_replay WHERE command_id = ?",
+            (str(first.command_id),),
+        ).fetchone()
+        _handle_service(
+            service,
+            {"action": "create_project", "name": "Other", "start_at": NOW.isoformat()},
+        )
+
+        assert len(service._command_replay_cache) == 1
+        assert service.handle_command(first) == first_result
+        assert repository._conn.execute(
+            "SELECT applied_at FROM command_replay WHERE command_id = ?",
+            (str(first.command_id),),
+        ).fetchone()["applied_at"] == first_row["applied_at"]
+        assert len(repository.list_projects()) == 2
+
+        repository._conn.execute(
+            "UPDATE command_replay SET applied_at = ? WHERE command_id = ?",
+            ((NOW - dt.timedelta(days=365)).isoformat(), str(first.command_id)),
+        )
+        repository._conn.commit()
+        _handle_service(
+            service,
+            {"action": "create_project", "name": "Third", "start_at": NOW.isoformat()},
+        )
+
+        assert repository.load_command_replay(first.command_id) == {}
+    finally:
+        repository.close()
+
+
 def test_sqlite_repository_persists_direct_repository_mutations(tmp_path: Path):
     db_path = tmp_path / "direct.sqlite"
     repository = SQLiteProjectRepository(db_path)
@@ -806,7 +862,7 @@ def test_sqlite_repository_rejects_persisting_historical_multi_role_revision(
         assumption_note=None,
     )
     staged = repository.clone()
-    staged.revisions_by_process["process-valid"].insert(
+    staged.revisions_by_process.writable("process-valid").insert(
         0,
         ProcessRevisionRecord.model_construct(
             revision_id="revision-invalid-history",
@@ -898,6 +954,59 @@ def test_sqlite_schema_rejects_revision_rows_without_exactly_one_role(
                 )
 
 
+def test_sqlite_schema_rejects_binary_revision_rows_without_exactly_one_role(
+    tmp_path: Path,
+):
+    db_path = tmp_path / "schema-rejects-invalid-binary-revision.sqlite"
+    repository = SQLiteProjectRepository(db_path, payload_encoding="binary")
+    try:
+        repository.replace_with(_seed_repository(repository.clone()))
+        valid = repository._conn.execute(
+            """
+            SELECT payload
+            FROM repository_entity
+            WHERE kind = 'revision'
+            """
+        ).fetchone()["payload"]
+    finally:
+        repository.close()
+
+    with sqlite3.connect(db_path) as conn:
+        for role_requirement_count in (None, 0, 2):
+            with pytest.raises(sqlite3.IntegrityError, match="exactly one item"):
+                conn.execute(
+                    """
+                    INSERT INTO repository_entity(
+                        kind,
+                        entity_id,
+                        project_id,
+                        payload_format,
+                        payload,
+                        role_requirement_count,
+                        updated_at
+                    )
+                    VALUES ('revision', 'revision-invalid', 'project-sqlite', 'binary', ?, ?, ?)
+                    """,
+                    (valid, role_requirement_count, NOW.isoformat()),
+                )
+        with pytest.raises(sqlite3.IntegrityError, match="exactly one item"):
+            conn.execute(
+                """
+                UPDATE repository_entity
+                SET role_requirement_count = 2
+                WHERE kind = 'revision'
+                """
+            )
+        with pytest.raises(sqlite3.IntegrityError, match="CHECK constraint"):
+            conn.execute(
+                """
+                UPDATE repository_entity
+                SET payload_json = '{}'
+                WHERE kind = 'role'
+                """
+            )
+
+
 def test_sqlite_repository_deletes_legacy_childless_blocker_processes(
     tmp_path: Path,
 ):
@@ -1477,6 +1586,106 @@ def test_sqlite_repository_persists_delete_process_graph_cleanup(tmp_path: Path)
         reopened.close()
 
 
+def test_sqlite_commits_write_only_dirty_entity_rows(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    repository = SQLiteProjectRepository(tmp_path / "dirty.sqlite")
+    service = ProjectService(repository)
+    try:
+        project_ids = [
+            _handle_service(
+                service,
+                {
+                    "action": "create_project",
+                    "name": f"Dirty Project {index}",
+                    "start_at": NOW.isoformat(),
+                },
+            ).entity_ids["project_id"]
+            for index in range(2)
+        ]
+        for prefix, project_id in zip("ab", project_ids, strict=True):
+            for index, dependencies in enumerate([[], [f"{prefix}-0"], [f"{prefix}-0"]]):
+                _handle_service(
+                    service,
+                    {
+                        "action": "upsert_process_revision",
+                        "project_id": project_id,
+                        "process_id": f"{prefix}-{index}",
+                        "name": f"Process {index}",
+                        "effective_at": NOW.isoformat(),
+                        "duration_business_days": 1,
+                        "dependencies": dependencies,
+                    },
+                )
+        untouched_project_id, project_id = project_ids
+        before = _entity_updated_at(repository)
+        full_serializations: list[object] = []
+        full_rows = sqlite_repository._all_repository_entity_rows
+        monkeypatch.setattr(
+            sqlite_repository,
+            "_all_repository_entity_rows",
+            lambda projection, **kwargs: full_serializations.append(projection)
+            or full_rows(projection, **kwargs),
+        )
+
+        _handle_service(
+            service,
+            {
+                "action": "delete_process",
+                "project_id": project_id,
+                "process_id": "b-1",
+                "edit_at": NOW.isoformat(),
+            },
+        )
+        _handle_service(
+            service,
+            {
+                "action": "upsert_process_revision",
+                "project_id": project_id,
+                "process_id": "b-2",
+                "name": "Process 2 revised",
+                "effective_at": (NOW + dt.timedelta(days=1)).isoformat(),
+                "duration_business_days": 2,
+                "dependencies": ["b-0"],
+            },
+        )
+
+        after = _entity_updated_at(repository)
+        assert full_serializations == []
+        assert repository._database_entity_rows() == _repository_entity_rows(
+            repository._projection
+        )
+        rewritten = {
+            key
+            for key, (row_project_id, updated_at) in after.items()
+            if before.get(key) != (row_project_id, updated_at)
+        }
+        assert rewritten
+        assert all(
+            after[key][0] in {project_id, None} for key in rewritten
+        ), rewritten
+        assert {
+            key: value
+            for key, value in before.items()
+            if value[0] == untouched_project_id
+        }.items() <= after.items()
+    finally:
+        repository.close()
+
+
+def _entity_updated_at(
+    repository: SQLiteProjectRepository,
+) -> dict[tuple[str, str], tuple[str | None, str]]:
+    rows = repository._conn.execute(
+        "SELECT kind, entity_id, project_id, updated_at FROM repository_entity"
+    ).fetchall()
+    return {
+        (row["kind"], row["entity_id"]): (row["project_id"], row["updated_at"])
+        for row in rows
+    }
+
+
 def test_sqlite_rows_exclude_computed_fields_and_snapshots_are_explicit(
     tmp_path: Path,
 ):
@@ -1613,6 +1822,61 @@ def test_sqlite_rows_exclude_computed_fields_and_snapshots_are_explicit(
         reopened.close()
 
 
+def test_sqlite_typed_tables_serve_schedule_snapshot_range_scans(tmp_path: Path):
+    db_path = tmp_path / "typed.sqlite"
+    repository = SQLiteProjectRepository(db_path)
+    try:
+        for project_id in ("project-a", "project-b"):
+            repository.create_project(name=project_id, start_at=NOW, project_id=project_id)
+            for day, symbols in ((1, []), (2, ["A", "B"]), (3, []), (9, [])):
+                repository.record_schedule_snapshot(
+                    ScheduleSnapshotRecord(
+                        snapshot_id=f"{project_id}-{day}-{len(symbols)}",
+                        project_id=project_id,
+                        committed_at=(NOW + dt.timedelta(days=day)).astimezone(
+                            dt.timezone(dt.timedelta(hours=-5))
+                        ),
+                        terminal_process_symbols=symbols,
+                    )
+                )
+        repository._conn.execute(
+            "UPDATE repository_metadata SET value = '1' WHERE key = 'typed_schema_version'"
+        )
+        repository._conn.execute("DELETE FROM repository_schedule_snapshot")
+        repository._conn.execute(
+            "CREATE TABLE repository_process(process_id TEXT PRIMARY KEY)"
+        )
+        repository._conn.commit()
+    finally:
+        repository.close()
+
+    reopened = SQLiteProjectRepository(db_path)
+    try:
+        as_of = NOW + dt.timedelta(days=3)
+        for symbols in ([], ["A", "B"]):
+            expected = reopened._projection.schedule_snapshots_as_of(
+                "project-a",
+                as_of,
+                symbols,
+            )
+            assert expected
+            assert reopened.schedule_snapshots_as_of("project-a", as_of, symbols) == expected
+        plan = reopened._conn.execute(
+            """
+            EXPLAIN QUERY PLAN
+            SELECT snapshot_id FROM repository_schedule_snapshot
+            WHERE project_id = ? AND terminal_process_symbols = ? AND committed_at <= ?
+            """,
+            ("project-a", "[]", "2026"),
+        ).fetchall()
+        assert "repository_schedule_snapshot_project_idx" in " ".join(
+            str(row["detail"]) for row in plan
+        )
+        assert not set(sqlite_repository.RETIRED_TYPED_ENTITY_TABLES) & reopened.table_names()
+    finally:
+        reopened.close()
+
+
 def test_sqlite_repository_reloads_across_independent_services(tmp_path: Path):
     db_path = tmp_path / "shared.sqlite"
     repository_a = SQLiteProjectRepository(db_path)
@@ -1653,29 +1917,479 @@ def test_sqlite_repository_reloads_across_independent_services(tmp_path: Path):
         repository_b.close()
 
 
+def test_sqlite_repository_reloads_only_projects_in_change_log(tmp_path: Path):
+    db_path = tmp_path / "change-log.sqlite"
+    repository_a = SQLiteProjectRepository(db_path)
+    for project_id in ("project-a", "project-b", "project-gone"):
+        repository_a.create_project(name=project_id, start_at=NOW, project_id=project_id)
+    repository_b = SQLiteProjectRepository(db_path)
+    loads: list[set[str] | None] = []
+    load_projection = repository_b._load_projection
+
+    def record_load(project_ids=None, **kwargs):
+        loads.append(project_ids)
+        return load_projection(project_ids, **kwargs)
+
+    repository_b._load_projection = record_load
+    try:
+        untouched = repository_b.get_project("project-b")
+        repository_a.create_role("project-a", "Reviewer", role_id="role-a")
+        repository_a.delete_project("project-gone")
+
+        assert sorted(repository_b.projects) == ["project-a", "project-b"]
+        assert repository_b.get_project("project-b") is untouched
+        assert loads == [{"project-b"}]
+        assert sorted(repository_b.roles) == ["role-a"]
+        assert loads == [{"project-b"}, {"project-a"}]
+    finally:
+        repository_a.close()
+        repository_b.close()
+
+
+def test_sqlite_repository_full_reload_after_change_log_compaction(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(sqlite_repository, "CHANGE_LOG_RETAINED_GENERATIONS", 2)
+    db_path = tmp_path / "compacted.sqlite"
+    repository_a = SQLiteProjectRepository(db_path)
+    repository_b = SQLiteProjectRepository(db_path)
+    index_loads: list[object] = []
+    load_project_index = repository_b._load_project_index
+
+    def record_index_load():
+        index_loads.append(load_project_index())
+        return index_loads[-1]
+
+    repository_b._load_project_index = record_index_load
+    try:
+        for index in range(3):
+            repository_a.create_project(
+                name=f"Project {index}",
+                start_at=NOW,
+                project_id=f"project-{index}",
+            )
+
+        assert sorted(repository_b.projects) == ["project-0", "project-1", "project-2"]
+        assert index_loads == [repository_b._projection]
+    finally:
+        repository_a.close()
+        repository_b.close()
+
+
+def test_sqlite_repository_hydrates_projects_lazily_and_evicts_cold_ones(
+    tmp_path: Path,
+):
+    db_path = tmp_path / "lazy.sqlite"
+    writer = SQLiteProjectRepository(db_path)
+    for project_id in ("project-a", "project-b", "project-c"):
+        writer.create_project(name=project_id, start_at=NOW, project_id=project_id)
+        writer.create_role(project_id, "Reviewer", role_id=f"role-{project_id}")
+    writer.close()
+    repository = SQLiteProjectRepository(db_path, max_resident_projects=2)
+    residency = repository._projection_residency()
+    try:
+        assert [project.project_id for project in repository.list_projects()] == [
+            "project-a",
+            "project-b",
+            "project-c",
+        ]
+        assert list(residency.resident) == []
+        assert repository.roles["role-project-b"]["project_id"] == "project-b"
+        assert list(residency.resident) == ["project-b"]
+
+        repository.get_project("project-a")
+        repository.get_project("project-c")
+        repository.get_project("project-a")
+        assert list(residency.resident) == ["project-c", "project-a"]
+        assert "role-project-b" not in repository._projection.roles._data
+
+        with pytest.raises(ServiceValidationError, match="does not belong"):
+            repository.create_role("project-a", "Reviewer", role_id="role-project-b")
+        repository.create_role("project-b", "Approver", role_id="role-approver")
+        assert sorted(repository.role_ids_by_project["project-b"]) == [
+            "role-approver",
+            "role-project-b",
+        ]
+    finally:
+        repository.close()
+
+
+def test_sqlite_project_queries_hydrate_only_the_queried_project(
+    tmp_path: Path,
+    monkeypatch,
+):
+    db_path = tmp_path / "bounded.sqlite"
+    writer = SQLiteProjectRepository(db_path)
+    writer_service = ProjectService(writer)
+    project_ids = []
+    for index in range(8):
+        project_id = _handle_service(
+            writer_service,
+            {"action": "create_project", "name": f"Project {index}", "start_at": NOW.isoformat()},
+        ).entity_ids["project_id"]
+        for command in (
+            {"action": "create_role", "role_id": f"role-{index}", "name": "Engineer"},
+            {
+                "action": "upsert_resource_calendar",
+                "calendar_id": f"calendar-{index}",
+                "name": "Weekdays",
+                "timezone": "UTC",
+                "weekly_windows": [
+                    {
+                        "window_id": f"weekday-{weekday}",
+                        "weekday": weekday,
+                        "start_local_time": "09:00",
+                        "end_local_time": "17:00",
+                        "capacity_hours": 8,
+                    }
+                    for weekday in range(5)
+                ],
+            },
+            {
+                "action": "upsert_resource",
+                "resource_id": f"resource-{index}",
+                "name": "Ada",
+                "role_ids": [f"role-{index}"],
+                "calendar_id": f"calendar-{index}",
+                "available_from_at": NOW.isoformat(),
+                "cost_rate": "100",
+                "cost_unit": "hour",
+            },
+            {
+                "action": "upsert_process_revision",
+                "process_id": f"process-{index}",
+                "name": "Build",
+                "effective_at": NOW.isoformat(),
+                "duration_business_days": 1,
+                "role_requirements": [
+                    {
+                        "requirement_id": f"req-{index}",
+                        "role_id": f"role-{index}",
+                        "effort_hours": 8,
+                    }
+                ],
+            },
+        ):
+            _handle_service(writer_service, {**command, "project_id": project_id})
+        project_ids.append(project_id)
+    writer.close()
+
+    repository = SQLiteProjectRepository(db_path, max_resident_projects=2)
+    service = ProjectService(repository)
+    hydrated: list[str] = []
+    hydrate = repository._hydrate_projects
+
+    def counting_hydrate(projection, ids):
+        hydrated.extend(ids)
+        return hydrate(projection, ids)
+
+    monkeypatch.setattr(repository, "_hydrate_projects", counting_hydrate)
+    try:
+        for project_id in project_ids:
+            for query in (
+                {
+                    "action": "query_resource_schedule",
+                    "project_id": project_id,
+                    "as_of": NOW.isoformat(),
+                    "now": NOW.isoformat(),
+                },
+                {"action": "query_project_catalog", "project_id": project_id},
+            ):
+                hydrated.clear()
+                data = _query_service(service, query)
+                assert data["project_id"] == project_id
+                assert set(hydrated) <= {project_id}
+        assert len(repository._projection_residency().resident) <= 2
+    finally:
+        repository.close()
+
+
+def test_sqlite_repository_reads_from_pool_while_projection_is_locked(tmp_path: Path):
+    db_path = tmp_path / "pool.sqlite"
+    repository = SQLiteProjectRepository(db_path, read_connections=2)
+    command_id = uuid.UUID("00000000-0000-0000-0000-000000000009")
+    try:
+        repository.create_project(name="Pooled", start_at=NOW, project_id="project-pool")
+        repository.record_command_replay(
+            command_id,
+            "payload-hash",
+            CommandResult(command_id=command_id),
+        )
+        locked = threading.Event()
+        release = threading.Event()
+
+        def hold_projection_lock() -> None:
+            with repository._lock:
+                locked.set()
+                release.wait(timeout=5)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            holder = executor.submit(hold_projection_lock)
+            assert locked.wait(timeout=5)
+            try:
+                version = executor.submit(repository.cache_version, "project-pool")
+                replay = executor.submit(repository.load_command_replay, command_id)
+                count = executor.submit(repository.entity_count)
+                assert version.result(timeout=5) == 1
+                assert list(replay.result(timeout=5)) == ["payload-hash"]
+                assert count.result(timeout=5) == repository._conn.execute(
+                    "SELECT COUNT(*) FROM repository_entity"
+                ).fetchone()[0]
+            finally:
+                release.set()
+            holder.result(timeout=5)
+
+        with repository._read_snapshot() as conn:
+            with pytest.raises(sqlite3.OperationalError, match="readonly"):
+                conn.execute("DELETE FROM repository_entity")
+    finally:
+        repository.close()
+
+
+def test_sqlite_repository_serves_projected_reads_while_a_write_persists(
+    tmp_path: Path,
+    monkeypatch,
+):
+    repository = SQLiteProjectRepository(tmp_path / "reads.sqlite")
+    try:
+        repository.create_project(name="Before", start_at=NOW, project_id="project-read")
+        persisting = threading.Event()
+        release = threading.Event()
+        persist = repository._persist_entity_delta
+
+        def blocking_persist(*args, **kwargs):
+            persisting.set()
+            assert release.wait(timeout=5)
+            return persist(*args, **kwargs)
+
+        monkeypatch.setattr(repository, "_persist_entity_delta", blocking_persist)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            write = executor.submit(
+                repository.update_project,
+                "project-read",
+                name="After",
+            )
+            assert persisting.wait(timeout=5)
+            try:
+                read = executor.submit(repository.get_project, "project-read")
+                assert read.result(timeout=5).name == "Before"
+                assert [project.name for project in repository.list_projects()] == ["Before"]
+                assert repository.projects["project-read"].name == "Before"
+                assert repository.schedule_snapshots_as_of("project-read", NOW) == []
+                assert not write.done()
+            finally:
+                release.set()
+            assert write.result(timeout=5).name == "After"
+
+        assert repository.get_project("project-read").name == "After"
+    finally:
+        repository.close()
+
+
+def test_sqlite_repository_migrates_payload_encoding(tmp_path: Path):
+    db_path = tmp_path / "encoding.sqlite"
+    repository = SQLiteProjectRepository(db_path)
+    repository.replace_with(_seed_repository(repository.clone()))
+    json_rows = repository._database_entity_rows()
+    reader = SQLiteProjectRepository(db_path)
+    repository.close()
+
+    binary = SQLiteProjectRepository(db_path, payload_encoding="binary")
+    try:
+        assert {
+            tuple(row)
+            for row in binary._conn.execute(
+                """
+                SELECT DISTINCT payload_format, typeof(payload_json), typeof(payload)
+                FROM repository_entity
+                """
+            )
+        } == {("binary", "null", "blob")}
+        assert [
+            tuple(row)
+            for row in binary._conn.execute(
+                """
+                SELECT DISTINCT role_requirement_count
+                FROM repository_entity
+                WHERE kind = 'revision'
+                """
+            )
+        ] == [(1,)]
+        assert binary._database_entity_rows() == _repository_entity_rows(
+            binary._projection,
+            encoding="binary",
+        )
+        binary.create_role("project-sqlite", "Reviewer", role_id="role-review")
+
+        assert sorted(reader.roles) == ["role-eng", "role-review"]
+        assert reader._payload_encoding == "binary"
+        reader.create_role("project-sqlite", "Approver", role_id="role-approve")
+        assert "role-approve" in binary.roles
+    finally:
+        binary.close()
+        reader.close()
+
+    reopened = SQLiteProjectRepository(db_path)
+    try:
+        assert reopened._payload_encoding == "binary"
+    finally:
+        reopened.close()
+    restored = SQLiteProjectRepository(db_path, payload_encoding="json")
+    try:
+        restored_rows = restored._database_entity_rows()
+        assert {
+            key: row
+            for key, row in restored_rows.items()
+            if key not in {("role", "role-review"), ("role", "role-approve")}
+        } == json_rows
+    finally:
+        restored.close()
+
+    with pytest.raises(ServiceValidationError, match="Unsupported SQLite payload"):
+        SQLiteProjectRepository(db_path, payload_encoding="msgpack")
+
+
+def test_sqlite_repository_rebuilds_entity_table_without_payload_format(tmp_path: Path):
+    db_path = tmp_path / "legacy-entity-table.sqlite"
+    repository = SQLiteProjectRepository(db_path)
+    repository.replace_with(_seed_repository(repository.clone()))
+    json_rows = repository._database_entity_rows()
+    repository.close()
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("ALTER TABLE repository_entity RENAME TO repository_entity_current")
+        conn.execute(
+            """
+            CREATE TABLE repository_entity(
+                kind TEXT NOT NULL,
+                entity_id TEXT NOT NULL,
+                project_id TEXT,
+                payload_json TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                PRIMARY KEY(kind, entity_id)
+            )
+            """
+        )
+        conn.execute(
+            """
+            INSERT INTO repository_entity
+            SELECT kind, entity_id, project_id, payload_json, updated_at
+            FROM repository_entity_current
+            """
+        )
+        conn.execute("DROP TABLE repository_entity_current")
+
+    reopened = SQLiteProjectRepository(db_path)
+    try:
+        columns = {
+            row["name"]: row["type"]
+            for row in reopened._conn.execute("PRAGMA table_info(repository_entity)")
+        }
+        assert columns["payload_json"] == "TEXT"
+        assert columns["payload"] == "BLOB"
+        assert {
+            row["name"]
+            for row in reopened._conn.execute(
+                """
+                SELECT name
+                FROM sqlite_master
+                WHERE tbl_name = 'repository_entity' AND type IN ('index', 'trigger')
+                """
+            )
+        } >= {
+            "repository_entity_project_idx",
+            "repository_revision_role_requirements_one_insert",
+            "repository_revision_role_requirements_one_update",
+        }
+        assert reopened._database_entity_rows() == json_rows
+        assert reopened.roles["role-eng"]["name"] == "Engineer"
+    finally:
+        reopened.close()
+
+
+def test_payload_codec_round_trips_native_values():
+    value = {
+        "at": NOW,
+        "local_at": dt.datetime(
+            2026,
+            3,
+            8,
+            1,
+            30,
+            tzinfo=dt.timezone(dt.timedelta(hours=-5)),
+        ),
+        "naive_at": dt.datetime(1900, 1, 1, 12, 0, 0, 1),
+        "day": dt.date(2026, 1, 15),
+        "rate": Decimal("100.50"),
+        "counts": [0, -1, 127, 128, -33, 2**63 - 1, -(2**63), 1.5, None, True, False],
+        "text": ["", "x" * 31, "é" * 200, "y" * 70_000],
+        "nested": {f"key-{index}": [index] for index in range(20)},
+    }
+
+    decoded = decode_payload(encode_payload(value))
+
+    assert decoded == value
+    assert list(decoded) == list(value)
+    assert decoded["local_at"].utcoffset() == dt.timedelta(hours=-5)
+    assert decoded["naive_at"].tzinfo is None
+    assert str(decoded["rate"]) == "100.50"
+    assert list(decode_payload(encode_payload({"b": 1, "a": 2}, sort_keys=True))) == ["a", "b"]
+    with pytest.raises(TypeError):
+        encode_payload({"values": {1, 2}})
+    with pytest.raises(TypeError):
+        encode_payload({1: "key"})
+    with pytest.raises(ValueError):
+        encode_payload(2**63)
+    assert decode_payload(encode_payload({"values": {1, 2}}, default=sorted)) == {
+        "values": [1, 2]
+    }
+    with pytest.raises(PayloadCodecError):
+        decode_payload(b"\x02" + encode_payload(value)[1:])
+    with pytest.raises(ServiceValidationError, match="unsupported binary format"):
+        sqlite_repository._decode_payload(b"\x02\xc0")
+
+
 def test_sqlite_repository_rejects_stale_staged_commit(tmp_path: Path):
     db_path = tmp_path / "stale.sqlite"
     repository_a = SQLiteProjectRepository(db_path)
     repository_b = SQLiteProjectRepository(db_path)
     try:
-        stale_stage = repository_b.clone()
         repository_a.create_project(
-            name="Committed elsewhere",
-            start_at=NOW,
-            project_id="project-elsewhere",
-        )
-        stale_stage.create_project(
-            name="Stale staged project",
+            name="Shared project",
             start_at=NOW,
-            project_id="project-stale",
+            project_id="project-shared",
         )
+        stale_stage = repository_b.clone()
+        repository_a.create_role("project-shared", "Committed elsewhere", role_id="role-a")
+        stale_stage.create_role("project-shared", "Stale staged role", role_id="role-b")
 
         with pytest.raises(ServiceValidationError, match="changed after this transaction"):
             repository_b.replace_with(stale_stage)
 
-        assert [project.project_id for project in repository_b.list_projects()] == [
-            "project-elsewhere"
-        ]
+        assert sorted(repository_b.roles) == ["role-a"]
+    finally:
+        repository_a.close()
+        repository_b.close()
+
+
+def test_sqlite_repository_commits_stale_stage_for_other_project(tmp_path: Path):
+    db_path = tmp_path / "per-project.sqlite"
+    repository_a = SQLiteProjectRepository(db_path)
+    repository_b = SQLiteProjectRepository(db_path)
+    try:
+        repository_a.create_project(name="A", start_at=NOW, project_id="project-a")
+        repository_a.create_project(name="B", start_at=NOW, project_id="project-b")
+        version_b = repository_b.cache_version("project-b")
+        stage = repository_b.clone()
+        repository_a.create_role("project-a", "Committed elsewhere", role_id="role-a")
+        stage.create_role("project-b", "Staged role", role_id="role-b")
+
+        assert repository_b.cache_version("project-b") == version_b
+        repository_b.replace_with(stage)
+
+        assert repository_b.cache_version("project-b") == version_b + 1
+        assert sorted(repository_b.roles) == ["role-a", "role-b"]
+        assert sorted(repository_a.roles) == ["role-a", "role-b"]
     finally:
         repository_a.close()
         repository_b.close()
@@ -2071,3 +2785,182 @@ def _query_service(service: ProjectService, query: dict[str, Any]):
     result = service.handle_query(QueryEnvelope.model_validate({"query": query}))
     assert result.ok is True, getattr(result, "error", None)
     return result.data
+
+
+@pytest.mark.parametrize("payload_encoding", ["json", "binary"])
+def test_sqlite_shared_projections_are_reused_across_repositories(
+    tmp_path: Path,
+    monkeypatch,
+    payload_encoding: str,
+):
+    from projdash.service import service as service_module
+
+    scheduler_calls: list[str] = []
+    compute = service_module.compute_resource_schedule
+
+    def counting_compute(input_data):
+        scheduler_calls.append(input_data["project_id"])
+        return compute(input_data)
+
+    monkeypatch.setattr(service_module, "compute_resource_schedule", counting_compute)
+    db_path = tmp_path / "shared-projections.sqlite"
+    writer = SQLiteProjectRepository(
+        db_path,
+        payload_encoding=payload_encoding,
+        shared_projections=2,
+    )
+    reader = SQLiteProjectRepository(db_path, shared_projections=2)
+    try:
+        writer.replace_with(_seed_repository(writer.clone()))
+        query = {
+            "action": "query_resource_schedule",
+            "project_id": "project-sqlite",
+            "as_of": NOW.isoformat(),
+            "now": NOW.isoformat(),
+            "include_allocation_slices": True,
+        }
+
+        computed = _query_service(ProjectService(writer), query)
+        reused = _query_service(ProjectService(reader), query)
+        assert scheduler_calls == ["project-sqlite"]
+        assert reused == computed
+        assert list(reused["processes"][0]) == list(computed["processes"][0])
+
+        for hours in (1, 2):
+            later = (NOW + dt.timedelta(hours=hours)).isoformat()
+            _query_service(ProjectService(writer), {**query, "as_of": later, "now": later})
+        rows = writer._conn.execute(
+            "SELECT project_id FROM repository_projection_cache"
+        ).fetchall()
+        assert len(rows) == 2
+
+        staged = writer.clone()
+        staged.resolve_blocker("project-sqlite", "blocker-vendor", resolved_at=NOW)
+        writer.replace_with(staged)
+        _query_service(ProjectService(reader), query)
+        assert len(scheduler_calls) == 4
+    finally:
+        reader.close()
+        writer.close()
+
+
+@pytest.mark.parametrize("payload_encoding", ["json", "binary"])
+def test_sqlite_shared_projection_store_checks_types_without_decoding(
+    tmp_path: Path,
+    monkeypatch,
+    payload_encoding: str,
+):
+    repository = SQLiteProjectRepository(
+        tmp_path / "projdash.sqlite",
+        payload_encoding=payload_encoding,
+        shared_projections=4,
+    )
+
+    def no_decode(payload):
+        raise AssertionError("stores must not decode their own payload")
+
+    try:
+        generation = repository.cache_version("project-a")
+        frozen = freeze({"ids": ("b", "a"), "rows": [{"hours": 1.5, "note": None}]})
+        with monkeypatch.context() as patched:
+            patched.setattr(sqlite_repository, "_decode_payload", no_decode)
+            assert repository.store_shared_projection("project-a", generation, "plain", frozen)
+            stored_at = repository.store_shared_projection(
+                "project-a",
+                generation,
+                "dated",
+                {"at": NOW},
+            )
+            assert not repository.store_shared_projection(
+                "project-a",
+                generation,
+                "keyed",
+                {1: "one"},
+            )
+            assert not repository.store_shared_projection(
+                "project-a",
+                generation,
+                "set",
+                {"ids": {"a"}},
+            )
+
+        assert repository.load_shared_projection("project-a", "plain") == {
+            "ids": ["b", "a"],
+            "rows": [{"hours": 1.5, "note": None}],
+        }
+        assert stored_at is (payload_encoding == "binary")
+        if stored_at:
+            assert repository.load_shared_projection("project-a", "dated") == {"at": NOW}
+        assert repository.load_shared_projection("project-a", "keyed") is None
+    finally:
+        repository.close()
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_repository_as_of_timelines_follow_revision_and_snapshot_writes(tmp_path, backend):
+    repository = (
+        SQLiteProjectRepository(tmp_path / "projdash.sqlite")
+        if backend == "sqlite"
+        else InMemoryProjectRepository()
+    )
+    service = ProjectService(repository)
+    project_id = _handle_service(
+        service,
+        {"action": "create_project", "name": "Timeline Project", "start_at": NOW.isoformat()},
+    ).entity_ids["project_id"]
+    process_id = _handle_service(
+        service,
+        {
+            "action": "upsert_process_revision",
+            "project_id": project_id,
+            "process_symbol": "build",
+            "name": "Build",
+            "effective_at": NOW.isoformat(),
+            "duration_business_days": 1,
+        },
+    ).entity_ids["process_id"]
+    first = repository._latest_revision_as_of(process_id, NOW + dt.timedelta(days=1))
+    assert first is not None
+    assert repository._latest_revision_as_of(process_id, NOW - dt.timedelta(hours=1)) is None
+
+    for name in ("Build twice", "Build again"):
+        _handle_service(
+            service,
+            {
+                "action": "upsert_process_revision",
+                "project_id": project_id,
+                "process_id": process_id,
+                "name": name,
+                "effective_at": (NOW + dt.timedelta(days=2)).isoformat(),
+                "duration_business_days": 1,
+            },
+        )
+
+    assert repository._latest_revision_as_of(process_id, NOW + dt.timedelta(days=1)) == first
+    latest = repository._latest_revision_as_of(process_id, NOW + dt.timedelta(days=2))
+    assert latest.name == "Build again"
+
+    def snapshot(snapshot_id: str, days: int) -> ScheduleSnapshotRecord:
+        return ScheduleSnapshotRecord(
+            snapshot_id=snapshot_id,
+            project_id=project_id,
+            committed_at=NOW + dt.timedelta(days=days),
+        )
+
+    def snapshot_ids(source, days: int) -> list[str]:
+        as_of = NOW + dt.timedelta(days=days)
+        return [row.snapshot_id for row in source.schedule_snapshots_as_of(project_id, as_of)]
+
+    repository.record_schedule_snapshot(snapshot("late", 7))
+    repository.record_schedule_snapshot(snapshot("early", 1))
+    assert snapshot_ids(repository, 7) == ["early", "late"]
+
+    staged = repository.clone()
+    staged.record_schedule_snapshot(snapshot("middle", 3))
+    assert snapshot_ids(staged, 5) == ["early", "middle"]
+    assert snapshot_ids(repository, 5) == ["early"]
+
+    repository.replace_with(staged)
+    assert snapshot_ids(repository, 5) == ["early", "middle"]
+    later = NOW + dt.timedelta(days=5)
+    assert repository.schedule_snapshots_as_of(project_id, later, ["build"]) == []
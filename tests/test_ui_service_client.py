@@ -11,7 +11,7 @@ def test_create_project_service_reuses_single_service_per_database_path(
     class FakeRepository:
         constructed = 0
 
-        def __init__(self, db_path: str) -> None:
+        def __init__(self, db_path: str, **options: object) -> None:
             type(self).constructed += 1
             self.db_path = db_path
             time.sleep(0.02)
@@ -43,7 +43,7 @@ def test_create_project_service_uses_sqlite_repository_for_sqlite_paths(
     tmp_path,
 ):
     class FakeRepository:
-        def __init__(self, db_path: str) -> None:
+        def __init__(self, db_path: str, **options: object) -> None:
             self.db_path = db_path
 
         def load_command_replay_cache(self):